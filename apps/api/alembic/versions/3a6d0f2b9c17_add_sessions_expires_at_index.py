@@ -0,0 +1,37 @@
+"""add sessions expires_at index
+
+Revision ID: 3a6d0f2b9c17
+Revises: e7a2c5b8f913
+Create Date: 2026-10-18 06:12:44.518230
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3a6d0f2b9c17"
+down_revision: Union[str, Sequence[str], None] = "e7a2c5b8f913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sessions_expires_at",
+            "sessions",
+            ["expires_at"],
+            postgresql_where=sa.text("expires_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sessions_expires_at", table_name="sessions")
@@ -0,0 +1,50 @@
+"""add file blob
+
+Revision ID: 47d5e3f3858f
+Revises: befe5f32dce6
+Create Date: 2026-10-18 02:24:22.753057
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "47d5e3f3858f"
+down_revision: Union[str, Sequence[str], None] = "befe5f32dce6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "file_blob",
+        sa.Column("digest", sa.Text(), nullable=False),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("digest"),
+    )
+    op.add_column("files", sa.Column("digest", sa.Text(), nullable=True))
+    op.create_index(op.f("ix_files_digest"), "files", ["digest"], unique=False)
+    op.create_foreign_key(
+        "files_digest_fkey", "files", "file_blob", ["digest"], ["digest"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("files_digest_fkey", "files", type_="foreignkey")
+    op.drop_index(op.f("ix_files_digest"), table_name="files")
+    op.drop_column("files", "digest")
+    op.drop_table("file_blob")
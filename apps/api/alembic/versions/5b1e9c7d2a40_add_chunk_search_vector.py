@@ -0,0 +1,49 @@
+"""add chunk search vector
+
+Revision ID: 5b1e9c7d2a40
+Revises: c0a99a1a6b33
+Create Date: 2026-10-18 03:12:41.508217
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e9c7d2a40"
+down_revision: Union[str, Sequence[str], None] = "c0a99a1a6b33"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "chunk",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', chunk_text)", persisted=True),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chunk_search_vector",
+            "chunk",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_chunk_search_vector", table_name="chunk")
+    op.drop_column("chunk", "search_vector")
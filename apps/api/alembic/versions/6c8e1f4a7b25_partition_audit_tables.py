@@ -0,0 +1,126 @@
+"""partition audit tables by month
+
+Revision ID: 6c8e1f4a7b25
+Revises: 3a6d0f2b9c17
+Create Date: 2026-10-18 07:05:12.640913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6c8e1f4a7b25"
+down_revision: Union[str, Sequence[str], None] = "3a6d0f2b9c17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (partition column, scope column, foreign keys)
+AUDIT_TABLES = {
+    "document_audit": (
+        "timestamp",
+        "document_id",
+        [
+            ("document_id", "document", "CASCADE"),
+            ("user_id", "user", "SET NULL"),
+        ],
+    ),
+    "collection_audit": (
+        "performed_at",
+        "collection_id",
+        [
+            ("collection_id", "collection", "CASCADE"),
+            ("performed_by", "user", "SET NULL"),
+        ],
+    ),
+    "collection_permission_audit": (
+        "performed_at",
+        "collection_permission_id",
+        [
+            ("collection_permission_id", "collection_permission", "CASCADE"),
+            ("performed_by", "user", "SET NULL"),
+        ],
+    ),
+}
+
+# Index names used by the models for the per-entity history lookups
+HISTORY_INDEXES = {
+    "document_audit": "ix_document_audit_document_timestamp",
+    "collection_audit": "ix_collection_audit_collection_performed_at",
+    "collection_permission_audit": (
+        "ix_collection_permission_audit_permission_performed_at"
+    ),
+}
+
+# Partitions created ahead of the current month; `audit-partitions` keeps
+# this window filled afterwards
+MONTHS_AHEAD = 3
+
+
+def _add_constraints(table: str, primary_key: str) -> None:
+    _, _, foreign_keys = AUDIT_TABLES[table]
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})")
+    for column, target, on_delete in foreign_keys:
+        op.execute(
+            f'ALTER TABLE {table} ADD FOREIGN KEY ("{column}") '
+            f'REFERENCES "{target}" (id) ON DELETE {on_delete}'
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (column, scope, _) in AUDIT_TABLES.items():
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {table}_legacy INCLUDING DEFAULTS) "
+            f'PARTITION BY RANGE ("{column}")'
+        )
+        # One partition per month from the oldest row to MONTHS_AHEAD ahead;
+        # the default partition catches rows outside that window
+        op.execute(
+            f"""
+            DO $$
+            DECLARE
+                month date;
+            BEGIN
+                SELECT date_trunc('month', coalesce(min("{column}"), now()))::date
+                INTO month FROM {table}_legacy;
+                WHILE month <= date_trunc(
+                    'month', now() + interval '{MONTHS_AHEAD} months'
+                ) LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF {table} '
+                        'FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_p' || to_char(month, 'YYYYMM'),
+                        month,
+                        (month + interval '1 month')::date
+                    );
+                    month := (month + interval '1 month')::date;
+                END LOOP;
+            END $$;
+            """
+        )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_legacy")
+        op.execute(f"DROP TABLE {table}_legacy")
+
+        _add_constraints(table, f'id, "{column}"')
+        op.execute(
+            f'CREATE INDEX {HISTORY_INDEXES[table]} ON {table} ({scope}, "{column}", id)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in AUDIT_TABLES:
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {table}_partitioned INCLUDING DEFAULTS)"
+        )
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_partitioned")
+        # Drops every partition with it
+        op.execute(f"DROP TABLE {table}_partitioned")
+
+        _add_constraints(table, "id")
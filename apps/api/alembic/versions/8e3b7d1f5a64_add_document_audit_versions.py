@@ -0,0 +1,134 @@
+"""add document audit versions
+
+Revision ID: 8e3b7d1f5a64
+Revises: 6c8e1f4a7b25
+Create Date: 2026-10-18 08:21:37.104582
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.serialization import json_dumps
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e3b7d1f5a64"
+down_revision: Union[str, Sequence[str], None] = "6c8e1f4a7b25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns left out of audited document states; see audit_state
+UNAUDITED_COLUMNS = {"audit_version", "is_vectorized", "is_graph_extracted"}
+SEED_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "document",
+        sa.Column("audit_version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column("document_audit", sa.Column("version", sa.Integer(), nullable=True))
+    op.add_column("document_audit", sa.Column("patch", sa.JSON(), nullable=True))
+    op.add_column("document_audit", sa.Column("snapshot", sa.JSON(), nullable=True))
+
+    # Legacy audits keep only the submitted fields (a CREATE has no id,
+    # knowledge graph, ...), so they cannot serve as snapshots; just number them
+    op.execute(
+        """
+        UPDATE document_audit
+        SET version = numbered.version
+        FROM (
+            SELECT id, "timestamp", row_number() OVER (
+                PARTITION BY document_id ORDER BY "timestamp", id
+            ) AS version
+            FROM document_audit
+        ) AS numbered
+        WHERE document_audit.id = numbered.id
+          AND document_audit."timestamp" = numbered."timestamp"
+        """
+    )
+    op.execute(
+        """
+        UPDATE document
+        SET audit_version = latest.version
+        FROM (
+            SELECT document_id, max(version) AS version
+            FROM document_audit
+            GROUP BY document_id
+        ) AS latest
+        WHERE document.id = latest.document_id
+        """
+    )
+    seed_snapshots()
+
+
+def seed_snapshots() -> None:
+    """Store each document's current row as the snapshot of its latest audit.
+
+    Later patches are diffs of full states, so they need a full state to
+    apply to. Documents without audits get a snapshot with their first one.
+    """
+    connection = op.get_bind()
+    after = None
+    while True:
+        rows = (
+            connection.execute(
+                sa.text(
+                    """
+                    SELECT document.*,
+                        audit.id AS seed_audit_id,
+                        audit."timestamp" AS seed_audit_timestamp
+                    FROM document
+                    JOIN document_audit AS audit
+                        ON audit.document_id = document.id
+                        AND audit.version = document.audit_version
+                    WHERE CAST(:after AS uuid) IS NULL
+                        OR document.id > CAST(:after AS uuid)
+                    ORDER BY document.id
+                    LIMIT :limit
+                    """
+                ),
+                {"after": after, "limit": SEED_BATCH_SIZE},
+            )
+            .mappings()
+            .all()
+        )
+        if not rows:
+            return
+
+        connection.execute(
+            sa.text(
+                """
+                UPDATE document_audit SET snapshot = CAST(:snapshot AS json)
+                WHERE id = :id AND "timestamp" = :timestamp
+                """
+            ),
+            [
+                {
+                    "id": row["seed_audit_id"],
+                    "timestamp": row["seed_audit_timestamp"],
+                    "snapshot": json_dumps(
+                        {
+                            key: value
+                            for key, value in row.items()
+                            if key not in UNAUDITED_COLUMNS
+                            and not key.startswith("seed_audit_")
+                        }
+                    ),
+                }
+                for row in rows
+            ],
+        )
+        after = str(rows[-1]["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("document_audit", "snapshot")
+    op.drop_column("document_audit", "patch")
+    op.drop_column("document_audit", "version")
+    op.drop_column("document", "audit_version")
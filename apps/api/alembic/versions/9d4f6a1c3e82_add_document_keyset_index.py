@@ -0,0 +1,36 @@
+"""add document keyset index
+
+Revision ID: 9d4f6a1c3e82
+Revises: 5b1e9c7d2a40
+Create Date: 2026-10-18 03:48:19.274305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4f6a1c3e82"
+down_revision: Union[str, Sequence[str], None] = "5b1e9c7d2a40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_document_collection_title_id",
+            "document",
+            ["collection_id", sa.text("coalesce(title, '')"), "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_document_collection_title_id", table_name="document")
@@ -0,0 +1,41 @@
+"""widen files size
+
+Revision ID: a8d2e6f4c1b3
+Revises: f3c7a1d9e2b8
+Create Date: 2026-10-18 13:21:45.207816
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d2e6f4c1b3"
+down_revision: Union[str, Sequence[str], None] = "f3c7a1d9e2b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "files",
+        "size",
+        existing_type=sa.Integer(),
+        type_=sa.BigInteger(),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "files",
+        "size",
+        existing_type=sa.BigInteger(),
+        type_=sa.Integer(),
+        existing_nullable=False,
+    )
@@ -0,0 +1,93 @@
+"""add knowledge graph tables
+
+Revision ID: b2f4c8e6a913
+Revises: 8e3b7d1f5a64
+Create Date: 2026-10-18 09:02:51.337410
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2f4c8e6a913"
+down_revision: Union[str, Sequence[str], None] = "8e3b7d1f5a64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "kg_node",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("document_id", sa.UUID(), nullable=False),
+        sa.Column("node_id", sa.Text(), nullable=False),
+        sa.Column("label", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["document.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("document_id", "node_id", name="uq_kg_node_document_node"),
+    )
+    op.create_index("ix_kg_node_label_lower", "kg_node", [sa.text("lower(label)")])
+    if get_settings().KG_LABEL_TRIGRAM_INDEX:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            "ix_kg_node_label_trgm",
+            "kg_node",
+            ["label"],
+            postgresql_using="gin",
+            postgresql_ops={"label": "gin_trgm_ops"},
+        )
+
+    op.create_table(
+        "kg_edge",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("document_id", sa.UUID(), nullable=False),
+        sa.Column("edge_id", sa.Text(), nullable=False),
+        sa.Column("source_node_id", sa.Text(), nullable=False),
+        sa.Column("target_node_id", sa.Text(), nullable=False),
+        sa.Column("label", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["document_id"], ["document.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("document_id", "edge_id", name="uq_kg_edge_document_edge"),
+    )
+    op.create_index(
+        "ix_kg_edge_document_source", "kg_edge", ["document_id", "source_node_id"]
+    )
+    op.create_index(
+        "ix_kg_edge_document_target", "kg_edge", ["document_id", "target_node_id"]
+    )
+
+    # Copy existing graphs; ids were not checked for uniqueness before, so
+    # the first node or edge with an id wins
+    op.execute(
+        """
+        INSERT INTO kg_node (id, document_id, node_id, label)
+        SELECT gen_random_uuid(), document.id, node->>'id', node->'data'->>'label'
+        FROM document, json_array_elements(document.knowledge_graph->'nodes') AS node
+        WHERE document.knowledge_graph IS NOT NULL
+        ON CONFLICT DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO kg_edge
+            (id, document_id, edge_id, source_node_id, target_node_id, label)
+        SELECT gen_random_uuid(), document.id, edge->>'id', edge->>'source',
+            edge->>'target', edge->'data'->>'label'
+        FROM document, json_array_elements(document.knowledge_graph->'edges') AS edge
+        WHERE document.knowledge_graph IS NOT NULL
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("kg_edge")
+    op.drop_table("kg_node")
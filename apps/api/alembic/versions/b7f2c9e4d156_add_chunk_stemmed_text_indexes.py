@@ -0,0 +1,40 @@
+"""add chunk stemmed text indexes
+
+Revision ID: b7f2c9e4d156
+Revises: e1b5d7c3a824
+Create Date: 2026-10-18 16:20:14.283906
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.v1.models.document import stemmed_chunk_text_indexes
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7f2c9e4d156"
+down_revision: Union[str, Sequence[str], None] = "e1b5d7c3a824"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for index in stemmed_chunk_text_indexes():
+            op.create_index(
+                index.name,
+                "chunk",
+                list(index.expressions),
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index in stemmed_chunk_text_indexes():
+        op.drop_index(index.name, table_name="chunk", if_exists=True)
@@ -0,0 +1,62 @@
+"""add chunk ann index
+
+Revision ID: c0a99a1a6b33
+Revises: 47d5e3f3858f
+Create Date: 2026-10-18 02:27:08.126463
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.config import get_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c0a99a1a6b33"
+down_revision: Union[str, Sequence[str], None] = "47d5e3f3858f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings = get_settings()
+
+    # Build concurrently so existing chunk/document tables stay writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_document_collection_id",
+            "document",
+            ["collection_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_chunk_document_id",
+            "chunk",
+            ["document_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_chunk_embedding_hnsw",
+            "chunk",
+            ["embedding"],
+            postgresql_using="hnsw",
+            postgresql_with={
+                "m": settings.HNSW_M,
+                "ef_construction": settings.HNSW_EF_CONSTRUCTION,
+            },
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_chunk_embedding_hnsw", table_name="chunk")
+    op.drop_index("ix_chunk_document_id", table_name="chunk")
+    op.drop_index("ix_document_collection_id", table_name="document")
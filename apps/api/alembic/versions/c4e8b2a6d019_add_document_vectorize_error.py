@@ -0,0 +1,37 @@
+"""add document vectorize error
+
+Revision ID: c4e8b2a6d019
+Revises: a8d2e6f4c1b3
+Create Date: 2026-10-18 15:07:12.583920
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8b2a6d019"
+down_revision: Union[str, Sequence[str], None] = "a8d2e6f4c1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("document", sa.Column("vectorize_error", sa.Text(), nullable=True))
+    op.create_index(
+        "ix_document_pending_vectorize",
+        "document",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("NOT is_vectorized AND vectorize_error IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_document_pending_vectorize", table_name="document")
+    op.drop_column("document", "vectorize_error")
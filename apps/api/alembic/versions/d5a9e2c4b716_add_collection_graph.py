@@ -0,0 +1,97 @@
+"""add collection graph
+
+Revision ID: d5a9e2c4b716
+Revises: b2f4c8e6a913
+Create Date: 2026-10-18 09:48:16.902184
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a9e2c4b716"
+down_revision: Union[str, Sequence[str], None] = "b2f4c8e6a913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "kg_node",
+        sa.Column(
+            "label_key",
+            sa.Text(),
+            sa.Computed(
+                r"lower(btrim(regexp_replace(label, '[ \t\n\r\f\v]+', ' ', 'g')))",
+                persisted=True,
+            ),
+            nullable=False,
+        ),
+    )
+
+    op.create_table(
+        "collection_graph_node",
+        sa.Column("collection_id", sa.UUID(), nullable=False),
+        sa.Column("key", sa.Text(), nullable=False),
+        sa.Column("label", sa.Text(), nullable=False),
+        sa.Column("document_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["collection_id"], ["collection.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("collection_id", "key"),
+    )
+    op.create_table(
+        "collection_graph_edge",
+        sa.Column("collection_id", sa.UUID(), nullable=False),
+        sa.Column("source_key", sa.Text(), nullable=False),
+        sa.Column("target_key", sa.Text(), nullable=False),
+        sa.Column("label", sa.Text(), nullable=False),
+        sa.Column("document_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["collection_id"], ["collection.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("collection_id", "source_key", "target_key", "label"),
+    )
+
+    # Build every collection's graph from the documents already in it
+    op.execute(
+        """
+        INSERT INTO collection_graph_node (collection_id, key, label, document_count)
+        SELECT document.collection_id, node.label_key, min(node.label),
+            count(DISTINCT node.document_id)
+        FROM kg_node AS node
+        JOIN document ON document.id = node.document_id
+        WHERE document.collection_id IS NOT NULL
+        GROUP BY document.collection_id, node.label_key
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO collection_graph_edge
+            (collection_id, source_key, target_key, label, document_count)
+        SELECT document.collection_id, source.label_key, target.label_key,
+            edge.label, count(DISTINCT edge.document_id)
+        FROM kg_edge AS edge
+        JOIN document ON document.id = edge.document_id
+        JOIN kg_node AS source
+            ON source.document_id = edge.document_id
+            AND source.node_id = edge.source_node_id
+        JOIN kg_node AS target
+            ON target.document_id = edge.document_id
+            AND target.node_id = edge.target_node_id
+        WHERE document.collection_id IS NOT NULL
+        GROUP BY document.collection_id, source.label_key, target.label_key, edge.label
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("collection_graph_edge")
+    op.drop_table("collection_graph_node")
+    op.drop_column("kg_node", "label_key")
@@ -0,0 +1,34 @@
+"""add collection permission version
+
+Revision ID: e1b5d7c3a824
+Revises: c4e8b2a6d019
+Create Date: 2026-10-18 15:48:30.662117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e1b5d7c3a824"
+down_revision: Union[str, Sequence[str], None] = "c4e8b2a6d019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "collection",
+        sa.Column(
+            "permission_version", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("collection", "permission_version")
@@ -0,0 +1,102 @@
+"""add collection document count
+
+Revision ID: e7a2c5b8f913
+Revises: 9d4f6a1c3e82
+Create Date: 2026-10-18 04:21:53.610942
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a2c5b8f913"
+down_revision: Union[str, Sequence[str], None] = "9d4f6a1c3e82"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers see every affected row through transition tables,
+# so a bulk insert of N documents updates each collection once, and deletes
+# cascading from files or collections are counted as well.
+SYNC_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_collection_document_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE collection AS c SET document_count = c.document_count + d.n
+        FROM (
+            SELECT collection_id, count(*) AS n FROM new_rows
+            WHERE collection_id IS NOT NULL GROUP BY collection_id
+        ) AS d
+        WHERE c.id = d.collection_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE collection AS c SET document_count = c.document_count - d.n
+        FROM (
+            SELECT collection_id, count(*) AS n FROM old_rows
+            WHERE collection_id IS NOT NULL GROUP BY collection_id
+        ) AS d
+        WHERE c.id = d.collection_id;
+    ELSE
+        UPDATE collection AS c SET document_count = c.document_count + d.n
+        FROM (
+            SELECT collection_id, sum(n) AS n FROM (
+                SELECT o.collection_id, -1 AS n
+                FROM old_rows AS o JOIN new_rows AS w ON w.id = o.id
+                WHERE o.collection_id IS DISTINCT FROM w.collection_id
+                UNION ALL
+                SELECT w.collection_id, 1 AS n
+                FROM old_rows AS o JOIN new_rows AS w ON w.id = o.id
+                WHERE o.collection_id IS DISTINCT FROM w.collection_id
+            ) AS moves
+            WHERE collection_id IS NOT NULL GROUP BY collection_id
+        ) AS d
+        WHERE c.id = d.collection_id AND d.n <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "collection",
+        sa.Column("document_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(SYNC_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER document_count_insert AFTER INSERT ON document "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION sync_collection_document_count()"
+    )
+    op.execute(
+        "CREATE TRIGGER document_count_delete AFTER DELETE ON document "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION sync_collection_document_count()"
+    )
+    op.execute(
+        "CREATE TRIGGER document_count_update AFTER UPDATE ON document "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION sync_collection_document_count()"
+    )
+    # The triggers hold a lock on document until commit, so the backfill
+    # cannot miss concurrent writes
+    op.execute(
+        "UPDATE collection AS c SET document_count = d.n "
+        "FROM (SELECT collection_id, count(*) AS n FROM document "
+        "WHERE collection_id IS NOT NULL GROUP BY collection_id) AS d "
+        "WHERE c.id = d.collection_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS document_count_update ON document")
+    op.execute("DROP TRIGGER IF EXISTS document_count_delete ON document")
+    op.execute("DROP TRIGGER IF EXISTS document_count_insert ON document")
+    op.execute("DROP FUNCTION IF EXISTS sync_collection_document_count()")
+    op.drop_column("collection", "document_count")
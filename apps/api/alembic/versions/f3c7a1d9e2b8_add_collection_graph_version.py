@@ -0,0 +1,32 @@
+"""add collection graph version
+
+Revision ID: f3c7a1d9e2b8
+Revises: d5a9e2c4b716
+Create Date: 2026-10-18 11:02:37.418529
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c7a1d9e2b8"
+down_revision: Union[str, Sequence[str], None] = "d5a9e2c4b716"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "collection",
+        sa.Column("graph_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("collection", "graph_version")
@@ -1,15 +1,91 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from .config import get_settings
+from .utils.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
+from .utils.replica import ReplicaSet, RoutingSession
+from .utils.serialization import json_dumps
 
 settings = get_settings()
 
-engine = create_engine(settings.DATABASE_URL)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def engine_options() -> dict:
+    """Pool and connection options shared by the sync and async engines."""
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "json_serializer": json_dumps,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+engine = create_engine(
+    settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **engine_options()
+)
+instrument_engine(engine, "db")
+
+replica_engines = []
+for index, url in enumerate(settings.DB_REPLICA_URLS):
+    replica_engine = create_engine(
+        url, poolclass=InstrumentedQueuePool, **engine_options()
+    )
+    instrument_engine(replica_engine, f"db_replica_{index}")
+    replica_engines.append(replica_engine)
+
+# Lag is measured once per replica host and shared by both session families
+replica_set = ReplicaSet(
+    replica_engines,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+)
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    replicas=replica_engines,
+    replica_set=replica_set,
+)
+
+# psycopg 3 serves both engines; the async one picks its async driver
+async_engine = create_async_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    **engine_options(),
+)
+instrument_engine(async_engine.sync_engine, "db_async")
+
+async_replica_engines = []
+for index, url in enumerate(settings.DB_REPLICA_URLS):
+    async_replica_engine = create_async_engine(
+        url, poolclass=InstrumentedAsyncAdaptedQueuePool, **engine_options()
+    )
+    instrument_engine(async_replica_engine.sync_engine, f"db_async_replica_{index}")
+    async_replica_engines.append(async_replica_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    replicas=async_replica_engines,
+    replica_set=replica_set,
+)
 
 
 def get_db() -> Generator:
@@ -18,3 +94,8 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
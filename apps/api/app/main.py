@@ -1,12 +1,50 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.v1 import app_v1_route
+from app.config import get_settings
+from app.utils.pool import log_slow_pool_wait, start_request_timer
+from app.utils.replica import pin_primary
+import time
 from scalar_fastapi import get_scalar_api_reference, Theme
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    tasks = []
+    if settings.SESSION_SWEEP_INTERVAL_SECONDS > 0:
+        from app.v1.user.sweeper import run_session_sweeper
+
+        tasks.append(
+            asyncio.create_task(
+                run_session_sweeper(settings.SESSION_SWEEP_INTERVAL_SECONDS)
+            )
+        )
+    if settings.AUDIT_MAINTENANCE_INTERVAL_SECONDS > 0:
+        from app.db import engine
+        from app.v1.audit.partitions import run_partition_maintenance
+
+        tasks.append(
+            asyncio.create_task(
+                run_partition_maintenance(
+                    engine, settings.AUDIT_MAINTENANCE_INTERVAL_SECONDS
+                )
+            )
+        )
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 app = FastAPI(
     title="The Codex API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -24,6 +62,52 @@ app.add_middleware(
 app.include_router(app_v1_route)
 
 
+@app.middleware("http")
+async def track_pool_wait(request: Request, call_next):
+    timer = start_request_timer()
+    response = await call_next(request)
+    log_slow_pool_wait(
+        timer,
+        get_settings().DB_POOL_WAIT_WARNING_MS,
+        f"{request.method} {request.url.path}",
+    )
+    return response
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+PRIMARY_UNTIL_COOKIE = "db_primary_until"
+
+
+@app.middleware("http")
+async def route_reads_after_writes(request: Request, call_next):
+    """Keep a client's reads on the primary while replicas catch up on its writes."""
+    settings = get_settings()
+    if not settings.DB_REPLICA_URLS:
+        return await call_next(request)
+
+    is_write = request.method not in SAFE_METHODS
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+
+    if is_write or primary_until > time.time():
+        with pin_primary():
+            response = await call_next(request)
+    else:
+        response = await call_next(request)
+
+    if is_write and response.status_code < 400:
+        response.set_cookie(
+            key=PRIMARY_UNTIL_COOKIE,
+            value=str(time.time() + settings.DB_REPLICA_STICKY_SECONDS),
+            max_age=settings.DB_REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
 @app.get("/documents", include_in_schema=False)
 async def scalar_html():
     return get_scalar_api_reference(
@@ -39,7 +123,11 @@ def main():
     import uvicorn
 
     parser = argparse.ArgumentParser(description="Agentic RAG API and Flows")
-    parser.add_argument("command", choices=["serve"], help="Command to run.")
+    parser.add_argument(
+        "command",
+        choices=["serve", "worker", "ann-index", "sweep-sessions", "audit-partitions"],
+        help="Command to run.",
+    )
     parser.add_argument(
         "--host", type=str, default="127.0.0.1", help="Host for the API server."
     )
@@ -52,6 +140,57 @@ def main():
         action="store_true",
         help="Enable auto-reloading for development.",
     )
+    parser.add_argument(
+        "--stage",
+        type=str,
+        default="chunks",
+        help="Pipeline stage for the worker to run: chunks or graph.",
+    )
+    parser.add_argument(
+        "--processes", type=int, default=None, help="Worker process count."
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Documents the worker claims per round, or sessions the sweeper deletes per batch.",
+    )
+    parser.add_argument(
+        "--once",
+        default=False,
+        action="store_true",
+        help="Exit the worker once no pending documents are left.",
+    )
+    parser.add_argument(
+        "--index-type",
+        type=str,
+        default="hnsw",
+        choices=["hnsw", "ivfflat"],
+        help="ANN index type to build.",
+    )
+    parser.add_argument("--m", type=int, default=None, help="HNSW m.")
+    parser.add_argument(
+        "--ef-construction", type=int, default=None, help="HNSW ef_construction."
+    )
+    parser.add_argument("--lists", type=int, default=None, help="IVFFlat lists.")
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=None,
+        help="Future monthly audit partitions to create.",
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=None,
+        help="Archive audit partitions older than this; 0 keeps all.",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=str,
+        default=None,
+        help="Where archived audit partitions are written; empty only detaches.",
+    )
 
     args = parser.parse_args()
 
@@ -60,6 +199,61 @@ def main():
 
         uvicorn.run("app.main:app", host=args.host, port=args.port, reload=args.reload)
 
+    elif args.command == "worker":
+        import logging
+
+        from app.v1.pipeline.worker import run_worker
+
+        logging.basicConfig(level=logging.INFO)
+        print(f"Starting '{args.stage}' worker")
+
+        run_worker(
+            stage=args.stage,
+            processes=args.processes,
+            batch_size=args.batch_size,
+            once=args.once,
+        )
+
+    elif args.command == "ann-index":
+        import logging
+
+        from app.db import engine
+        from app.v1.search.ann import rebuild_ann_index
+
+        logging.basicConfig(level=logging.INFO)
+
+        rebuild_ann_index(
+            engine,
+            index_type=args.index_type,
+            m=args.m,
+            ef_construction=args.ef_construction,
+            lists=args.lists,
+        )
+
+    elif args.command == "sweep-sessions":
+        import logging
+
+        from app.v1.user.sweeper import sweep_expired_sessions
+
+        logging.basicConfig(level=logging.INFO)
+
+        sweep_expired_sessions(batch_size=args.batch_size)
+
+    elif args.command == "audit-partitions":
+        import logging
+
+        from app.db import engine
+        from app.v1.audit.partitions import maintain_audit_partitions
+
+        logging.basicConfig(level=logging.INFO)
+
+        maintain_audit_partitions(
+            engine,
+            months_ahead=args.months_ahead,
+            retention_months=args.retention_months,
+            archive_dir=args.archive_dir,
+        )
+
 
 if __name__ == "__main__":
     main()
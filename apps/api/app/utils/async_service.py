@@ -0,0 +1,49 @@
+import inspect
+from typing import Any, Callable, Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+S = TypeVar("S")
+
+
+class AsyncService(Generic[S]):
+    """Expose a synchronous service's methods as coroutines on an AsyncSession.
+
+    Calls go through `AsyncSession.run_sync`, so the ORM code is shared with
+    the sync service while every database round-trip runs on the async driver
+    and yields to the event loop. Only the round-trips yield: loading rows and
+    building response models still run on the event loop thread. Methods that
+    do blocking I/O or heavy CPU work (object storage, password hashing, query
+    embedding) must be overridden to move that work to the threadpool.
+
+    Services for one request should share its AsyncSession, and a route
+    should not mix them with sync-session services: each session holds its
+    own connection from its own pool.
+    """
+
+    service_class: Callable[[Session], S]
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.sync = self.create_service(db.sync_session)
+
+    def create_service(self, db: Session) -> S:
+        return self.service_class(db)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run `fn(service, *args, **kwargs)` with database access allowed."""
+        return await self.db.run_sync(lambda _: fn(self.sync, *args, **kwargs))
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name == "sync":
+            raise AttributeError(name)
+        method = getattr(self.sync, name)
+        if not callable(method) or inspect.iscoroutinefunction(method):
+            raise AttributeError(name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self.db.run_sync(lambda _: method(*args, **kwargs))
+
+        call.__name__ = name
+        return call
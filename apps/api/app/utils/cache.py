@@ -0,0 +1,82 @@
+"""In-process TTL + LRU cache."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+from .metrics import MetricsRegistry, metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe mapping whose entries expire after `ttl_seconds`.
+
+    Once `max_size` entries are stored, the least recently used one is
+    evicted. Hits and misses are counted under `name`, and a `hit_ratio`
+    and `size` gauge are refreshed on every metrics snapshot. The cache is
+    per process, so invalidation only reaches the worker that performs it;
+    the TTL bounds how long other workers can serve a stale entry.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        metrics.register_collector(self._collect)
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the live value for `key`, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                hit, value = False, None
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                hit, value = True, entry[1]
+
+        metrics.increment(f"{self.name}.hits" if hit else f"{self.name}.misses")
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[K, V], bool]) -> None:
+        """Drop every entry for which `predicate(key, value)` is true."""
+        with self._lock:
+            for key in [k for k, (_, v) in self._entries.items() if predicate(k, v)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _collect(self, registry: MetricsRegistry) -> None:
+        with self._lock:
+            lookups = self._hits + self._misses
+            registry.set_gauge(f"{self.name}.size", len(self._entries))
+            registry.set_gauge(
+                f"{self.name}.hit_ratio", self._hits / lookups if lookups else 0
+            )
@@ -0,0 +1,77 @@
+"""Bounded executor for CPU-heavy password hashing."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from .metrics import MetricsRegistry, metrics
+
+T = TypeVar("T")
+
+
+class HashingPoolSaturated(Exception):
+    """Raised when a hashing job is refused because the queue is full."""
+
+
+class HashingPool:
+    """Run password hashing on dedicated threads with admission control.
+
+    bcrypt releases the GIL while it works, so `workers` threads hash in
+    parallel without blocking the event loop or taking threads from the
+    shared threadpool. At most `max_queue` jobs wait behind the running
+    ones; further jobs fail fast with `HashingPoolSaturated` instead of
+    queueing for seconds.
+    """
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        metrics.register_collector(self._collect)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                metrics.increment(f"{self.name}.rejected")
+                raise HashingPoolSaturated()
+            self._in_flight += 1
+
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            started = time.perf_counter()
+            metrics.observe(f"{self.name}.queue_wait_seconds", started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                metrics.observe(
+                    f"{self.name}.run_seconds", time.perf_counter() - started
+                )
+
+        try:
+            future = self._executor.submit(job)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the job finishes or is cancelled before it starts,
+        # not when the caller stops waiting: a request cancelled mid-hash
+        # keeps its slot until the thread is free again
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _collect(self, registry: MetricsRegistry) -> None:
+        with self._lock:
+            in_flight = self._in_flight
+        registry.set_gauge(f"{self.name}.in_flight", in_flight)
+        registry.set_gauge(f"{self.name}.queue_depth", max(0, in_flight - self.workers))
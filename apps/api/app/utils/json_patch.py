@@ -0,0 +1,119 @@
+"""Minimal RFC 6902 JSON Patch: diff two JSON values and apply the result.
+
+Only the `add`, `remove` and `replace` operations are produced or accepted.
+"""
+
+import copy
+from typing import Any, List
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> List[dict]:
+    """Operations that turn `old` into `new`.
+
+    Objects are diffed key by key and lists element by element after
+    trimming their common head and tail, so a change deep inside a large
+    value yields a patch proportional to the change, not to the value.
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key in old:
+                ops.extend(make_patch(old[key], value, child))
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        shortest = min(len(old), len(new))
+        head = 0
+        while head < shortest and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < shortest - head and old[-1 - tail] == new[-1 - tail]:
+            tail += 1
+        old_middle = old[head : len(old) - tail]
+        new_middle = new[head : len(new) - tail]
+
+        ops = []
+        for index in range(min(len(old_middle), len(new_middle))):
+            ops.extend(
+                make_patch(
+                    old_middle[index], new_middle[index], f"{path}/{head + index}"
+                )
+            )
+        # Remove from the back so earlier indexes stay valid
+        for index in range(len(old_middle) - 1, len(new_middle) - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{head + index}"})
+        for index in range(len(old_middle), len(new_middle)):
+            ops.append(
+                {
+                    "op": "add",
+                    "path": f"{path}/{head + index}",
+                    "value": new_middle[index],
+                }
+            )
+        return ops
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, ops: List[dict]) -> Any:
+    """Return a copy of `document` with `ops` applied.
+
+    Raises:
+        ValueError: If an operation is unsupported or its path does not exist.
+    """
+    document = copy.deepcopy(document)
+    for op in ops:
+        kind, path = op.get("op"), op.get("path")
+        if kind not in ("add", "remove", "replace") or not isinstance(path, str):
+            raise ValueError(f"Unsupported patch operation: {op}")
+        if path == "":
+            if kind == "remove":
+                raise ValueError("Cannot remove the document root")
+            document = copy.deepcopy(op["value"])
+            continue
+
+        *parents, last = [_unescape(token) for token in path.split("/")[1:]]
+        try:
+            target = document
+            for token in parents:
+                target = target[int(token) if isinstance(target, list) else token]
+
+            if isinstance(target, list):
+                index = len(target) if last == "-" else int(last)
+                if kind == "add":
+                    if index > len(target):
+                        raise IndexError(index)
+                    target.insert(index, copy.deepcopy(op["value"]))
+                elif kind == "remove":
+                    del target[index]
+                else:
+                    target[index] = copy.deepcopy(op["value"])
+            elif isinstance(target, dict):
+                if kind != "add" and last not in target:
+                    raise KeyError(last)
+                if kind == "remove":
+                    del target[last]
+                else:
+                    target[last] = copy.deepcopy(op["value"])
+            else:
+                raise TypeError(type(target).__name__)
+        except (IndexError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Patch path does not exist: {path}") from e
+    return document
@@ -0,0 +1,74 @@
+"""In-process metrics registry."""
+
+import threading
+from collections.abc import Callable
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and summaries.
+
+    Values live in process memory, so every uvicorn worker reports its own
+    numbers through the health router.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._summaries: dict[str, dict[str, float]] = {}
+        self._collectors: list[Callable[["MetricsRegistry"], None]] = []
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add `value` to a monotonically increasing counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one observation into a count/sum/min/max summary."""
+        with self._lock:
+            summary = self._summaries.get(name)
+            if summary is None:
+                self._summaries[name] = {
+                    "count": 1,
+                    "sum": value,
+                    "min": value,
+                    "max": value,
+                }
+                return
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+
+    def register_collector(self, collector: Callable[["MetricsRegistry"], None]):
+        """Register a callback that refreshes gauges right before a snapshot."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serialisable copy of every metric."""
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            collector(self)
+
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {
+                    name: {
+                        **summary,
+                        "avg": summary["sum"] / summary["count"],
+                    }
+                    for name, summary in self._summaries.items()
+                },
+            }
+
+
+metrics = MetricsRegistry()
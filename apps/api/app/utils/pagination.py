@@ -0,0 +1,74 @@
+import base64
+import binascii
+import json
+from typing import Any, List
+
+from sqlalchemy import Select, Table, text
+from sqlalchemy.orm import Session
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    payload = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """Decode a cursor produced by `encode_cursor` with `size` key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return values
+
+
+def estimate_count(db: Session, statement: Select) -> int:
+    """Planner row estimate for `statement`, without executing it.
+
+    Cheap at any table size, but only as accurate as the table statistics.
+    An unfiltered select from a single table reads pg_class.reltuples instead.
+    """
+    froms = statement.get_final_froms()
+    if (
+        statement.whereclause is None
+        and len(froms) == 1
+        and isinstance(froms[0], Table)
+    ):
+        return estimate_table_rows(db, froms[0].name)
+
+    sql = str(
+        statement.compile(
+            dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    # Escape colons so text() does not read casts or literals as bind params
+    explain = text("EXPLAIN (FORMAT JSON) " + sql.replace(":", r"\:"))
+    plan = db.execute(explain).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_table_rows(db: Session, table_name: str) -> int:
+    """Row estimate for a whole table from pg_class.reltuples.
+
+    reltuples is -1 for a table that has never been analyzed; that is
+    reported as 0.
+    """
+    reltuples = db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name},
+    ).scalar()
+    return max(0, int(reltuples or 0))
@@ -0,0 +1,120 @@
+"""Connection pool instrumentation."""
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .metrics import MetricsRegistry, metrics
+
+
+class PoolWaitTimer:
+    """Time spent waiting for pooled connections during one request."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.checkouts = 0
+
+
+# The timer object is shared by reference, so waits recorded in threadpool
+# workers or child tasks (which run in copies of the context) still count.
+_request_pool_wait: ContextVar[Optional[PoolWaitTimer]] = ContextVar(
+    "request_pool_wait", default=None
+)
+
+
+def start_request_timer() -> PoolWaitTimer:
+    """Start accumulating pool wait time for the current request."""
+    timer = PoolWaitTimer()
+    _request_pool_wait.set(timer)
+    return timer
+
+
+class _InstrumentedPoolMixin(QueuePool):
+    """Measure how long each checkout waits for a free connection."""
+
+    metrics_name = "db"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            metrics.observe(f"{self.metrics_name}.pool.checkout_wait_seconds", waited)
+            timer = _request_pool_wait.get()
+            if timer is not None:
+                timer.seconds += waited
+                timer.checkouts += 1
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        if isinstance(pool, _InstrumentedPoolMixin):
+            pool.metrics_name = self.metrics_name
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Export pool usage and connection age metrics under `name`.
+
+    Listeners survive `engine.dispose()`, and the gauges always read the
+    engine's current pool.
+    """
+    pool = engine.pool
+    if isinstance(pool, _InstrumentedPoolMixin):
+        pool.metrics_name = name
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+        metrics.increment(f"{name}.pool.connections_opened")
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            metrics.observe(
+                f"{name}.pool.connection_age_seconds", time.monotonic() - connected_at
+            )
+
+    @event.listens_for(pool, "close")
+    def on_close(dbapi_connection, connection_record):
+        metrics.increment(f"{name}.pool.connections_closed")
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment(f"{name}.pool.connections_invalidated")
+
+    def collect(registry: MetricsRegistry) -> None:
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            return
+        registry.set_gauge(f"{name}.pool.size", pool.size())
+        registry.set_gauge(f"{name}.pool.checked_out", pool.checkedout())
+        registry.set_gauge(f"{name}.pool.checked_in", pool.checkedin())
+        registry.set_gauge(f"{name}.pool.overflow", max(0, pool.overflow()))
+
+    metrics.register_collector(collect)
+
+
+def log_slow_pool_wait(timer: PoolWaitTimer, threshold_ms: float, label: str) -> None:
+    """Warn when a request spent longer than `threshold_ms` waiting on the pool."""
+    waited_ms = timer.seconds * 1000
+    metrics.observe("db.pool.request_wait_seconds", timer.seconds)
+    if threshold_ms > 0 and waited_ms > threshold_ms:
+        metrics.increment("db.pool.slow_waits")
+        logging.warning(
+            f"{label} waited {waited_ms:.0f} ms for database connections "
+            f"over {timer.checkouts} checkouts"
+        )
@@ -0,0 +1,195 @@
+"""Read-replica routing."""
+
+import functools
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, Sequence, TypeVar, cast
+
+from sqlalchemy import Engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from .metrics import metrics
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Seconds the replica is behind the primary. A replica that has replayed
+# everything it received reports 0 even when the primary has been idle.
+REPLICATION_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+_REPLICA_READS = "replica_reads"
+_REPLICA_INDEX = "replica_index"
+_HAS_WRITES = "has_writes"
+
+_pin_primary: ContextVar[bool] = ContextVar("pin_primary", default=False)
+
+
+class ReplicaSet:
+    """Round-robin over replicas whose measured lag is within `max_lag_seconds`.
+
+    Lag is measured by a daemon thread every `check_interval` seconds, so
+    routing never waits on a health check. Until the first check completes,
+    and whenever no replica qualifies, `pick` returns None and callers use
+    the primary.
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        max_lag_seconds: float,
+        check_interval: float,
+    ):
+        self.engines = list(engines)
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._lag: list[Optional[float]] = [None] * len(self.engines)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._monitor_pid: Optional[int] = None
+
+    def is_available(self, index: int) -> bool:
+        lag = self._lag[index]
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def pick(self) -> Optional[int]:
+        """Return the index of the next usable replica, or None."""
+        if not self.engines:
+            return None
+        self._ensure_monitor()
+
+        start = next(self._counter)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self.is_available(index):
+                return index
+        metrics.increment("db.replica.fallbacks")
+        return None
+
+    def check(self) -> None:
+        """Measure the lag of every replica; unreachable ones are marked down."""
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as connection:
+                    lag = float(connection.execute(REPLICATION_LAG_SQL).scalar() or 0)
+            except Exception as e:
+                if self._lag[index] is not None:
+                    logging.warning(f"Replica {index} is unreachable: {e}")
+                lag = None
+            self._lag[index] = lag
+            metrics.set_gauge(
+                f"db.replica.{index}.lag_seconds", -1 if lag is None else lag
+            )
+
+    def _ensure_monitor(self) -> None:
+        # Worker processes fork after import, so each process starts its own
+        if self._monitor_pid == os.getpid():
+            return
+        with self._lock:
+            if self._monitor_pid == os.getpid():
+                return
+            self._monitor_pid = os.getpid()
+            threading.Thread(
+                target=self._monitor, name="replica-lag-monitor", daemon=True
+            ).start()
+
+    def _monitor(self) -> None:
+        while True:
+            self.check()
+            time.sleep(self.check_interval)
+
+
+class RoutingSession(Session):
+    """Session that sends reads inside `read_from_replica` to a replica.
+
+    Everything else goes to the primary bind: flushes, DML statements, reads
+    outside a marked method, and every read once the session has written, so
+    a request always sees its own changes. The replica chosen for a session
+    is kept for its lifetime to give its reads one consistent snapshot
+    source.
+
+    `replicas` holds the engines this session may route to, index-aligned
+    with `replica_set`, which decides which of them are usable.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        replicas: Sequence[Engine] = (),
+        replica_set: Optional[ReplicaSet] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.replica_set = replica_set
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica_set is not None and self._use_replica(clause):
+            index = self.info.get(_REPLICA_INDEX)
+            if index is None or not self.replica_set.is_available(index):
+                index = self.replica_set.pick()
+                self.info[_REPLICA_INDEX] = index
+            if index is not None:
+                metrics.increment("db.replica.reads")
+                return self.replicas[index]
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def _use_replica(self, clause) -> bool:
+        return bool(
+            self.replicas
+            and self.info.get(_REPLICA_READS)
+            and not self.info.get(_HAS_WRITES)
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+            and not _pin_primary.get()
+        )
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _record_write(session, flush_context):
+    session.info[_HAS_WRITES] = True
+
+
+@contextmanager
+def read_from_replica(session: Session):
+    """Allow reads in this block to be served by a replica."""
+    session.info[_REPLICA_READS] = session.info.get(_REPLICA_READS, 0) + 1
+    try:
+        yield
+    finally:
+        session.info[_REPLICA_READS] -= 1
+
+
+def replica_read(method: F) -> F:
+    """Mark a service method as read-only so it may run on a replica."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with read_from_replica(self.db):
+            return method(self, *args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+@contextmanager
+def pin_primary():
+    """Route every read in this context to the primary."""
+    token = _pin_primary.set(True)
+    try:
+        yield
+    finally:
+        _pin_primary.reset(token)
@@ -0,0 +1,26 @@
+"""JSON serialization for values stored in JSON columns."""
+
+import json
+import uuid
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def json_dumps(value: Any) -> str:
+    """`json.dumps` that also accepts UUIDs, datetimes and enums.
+
+    Conversion happens inside the C encoder as values are met, so payloads
+    need no pre-pass; anything else unknown is stored as its string form.
+    """
+    return json.dumps(value, default=_default)
@@ -4,6 +4,8 @@ from .user.router import router as user_router
 from .collection.router import router as collection_router
 from .storage.router import router as storage_router
 from .document.router import router as document_router
+from .search.router import router as search_router
+from .graph.router import router as graph_router
 
 
 api_v1_router = APIRouter(prefix="/api/v1")
@@ -13,5 +15,7 @@ api_v1_router.include_router(user_router)
 api_v1_router.include_router(collection_router)
 api_v1_router.include_router(storage_router)
 api_v1_router.include_router(document_router)
+api_v1_router.include_router(search_router)
+api_v1_router.include_router(graph_router)
 
 app_v1_route = api_v1_router
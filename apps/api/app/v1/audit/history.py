@@ -0,0 +1,49 @@
+"""Keyset pagination over audit history, newest first."""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+from ...utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+DEFAULT_AUDIT_PAGE_SIZE = 100
+MAX_AUDIT_PAGE_SIZE = 500
+
+
+def audit_page(
+    query: Query,
+    time_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int = DEFAULT_AUDIT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Tuple[List, Optional[str]]:
+    """Return one page of `query` ordered by (time, id) descending.
+
+    Paging by the partition key keeps each page on the few most recent
+    monthly partitions instead of sorting the whole history.
+
+    Raises:
+        InvalidCursorError: If `cursor` is malformed.
+    """
+    limit = max(1, min(limit, MAX_AUDIT_PAGE_SIZE))
+
+    if cursor:
+        before_time, before_id = decode_cursor(cursor, 2)
+        try:
+            before = (datetime.fromisoformat(before_time), UUID(before_id))
+        except ValueError as e:
+            raise InvalidCursorError("Invalid pagination cursor") from e
+        query = query.filter(tuple_(time_column, id_column) < before)
+
+    rows = query.order_by(time_column.desc(), id_column.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, time_column.key).isoformat(), getattr(last, id_column.key)
+        )
+    return rows, next_cursor
@@ -0,0 +1,282 @@
+"""Monthly partition maintenance and retention for the audit tables."""
+
+import asyncio
+import gzip
+import logging
+import os
+import re
+from datetime import date
+from typing import Optional, cast
+
+import psycopg
+from psycopg import sql
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Engine, func, select, text
+
+from ...config import get_settings
+from ...utils.metrics import metrics
+
+# Partitioned audit tables and their partition columns; see migration 6c8e1f4a7b25
+AUDIT_TABLES = {
+    "document_audit": "timestamp",
+    "collection_audit": "performed_at",
+    "collection_permission_audit": "performed_at",
+}
+
+# Session advisory lock held while maintenance runs, so API processes
+# running it on a timer do not race each other or the CLI
+MAINTENANCE_LOCK_KEY = "audit-partitions"
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def list_partitions(engine: Engine, table: str) -> dict[date, str]:
+    """Monthly partitions attached to `table`, by the month they cover."""
+    with engine.connect() as connection:
+        names = connection.execute(
+            text(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = :table
+                """
+            ),
+            {"table": table},
+        ).scalars()
+
+        partitions = {}
+        for name in names:
+            match = _PARTITION_SUFFIX.search(name)
+            if match:
+                partitions[date(int(match[1]), int(match[2]), 1)] = name
+        return partitions
+
+
+def create_partition(engine: Engine, table: str, month: date) -> int:
+    """Create `table`'s partition for `month` and return the rows moved into it.
+
+    Rows for a month without a partition land in the default partition, and
+    PostgreSQL refuses to create a partition overlapping them. Such rows are
+    moved: the default is detached, the partition created, the rows moved
+    and the default re-attached, in one transaction that locks the parent.
+    """
+    name = partition_name(table, month)
+    default = f"{table}_default"
+    bounds = f"FROM ('{month}') TO ('{_add_months(month, 1)}')"
+    in_month = (
+        f"\"{AUDIT_TABLES[table]}\" >= '{month}' "
+        f"AND \"{AUDIT_TABLES[table]}\" < '{_add_months(month, 1)}'"
+    )
+    with engine.begin() as connection:
+        stranded = connection.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_month})")
+        ).scalar()
+        if not stranded:
+            connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} "
+                    f"PARTITION OF {table} FOR VALUES {bounds}"
+                )
+            )
+            return 0
+
+        connection.execute(text("SET LOCAL lock_timeout = '5s'"))
+        connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+        connection.execute(
+            text(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {bounds}")
+        )
+        moved = connection.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            )
+        ).rowcount
+        connection.execute(
+            text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+        )
+    return moved
+
+
+def ensure_partitions(
+    engine: Engine, months_ahead: int, today: Optional[date] = None
+) -> int:
+    """Create the partitions for this month and `months_ahead` after it.
+
+    A table that fails is logged and skipped, so the others are still
+    maintained.
+    """
+    this_month = (today or date.today()).replace(day=1)
+    created = 0
+    for table in AUDIT_TABLES:
+        try:
+            existing = list_partitions(engine, table)
+            for offset in range(months_ahead + 1):
+                month = _add_months(this_month, offset)
+                if month in existing:
+                    continue
+                moved = create_partition(engine, table, month)
+                created += 1
+                logging.info(
+                    f"Created partition {partition_name(table, month)}"
+                    + (
+                        f", moving {moved} rows from the default partition"
+                        if moved
+                        else ""
+                    )
+                )
+        except Exception:
+            metrics.increment("audit.partitions.failures")
+            logging.exception(f"Could not create partitions for {table}")
+    return created
+
+
+def archive_partitions(
+    engine: Engine,
+    retention_months: int,
+    archive_dir: Optional[str],
+    today: Optional[date] = None,
+) -> int:
+    """Detach, export and drop partitions older than `retention_months`.
+
+    Each partition is copied to `archive_dir/<partition>.csv.gz`, then
+    detached and dropped. Without an `archive_dir` old partitions are only detached
+    and left as standalone tables for the operator to deal with.
+
+    The default partition rules out DETACH ... CONCURRENTLY, so the detach
+    briefly locks the parent; `lock_timeout` keeps it from queueing behind
+    long-running audit reads and stalling writers in turn. A partition that
+    fails is logged and left for the next run.
+    """
+    cutoff = _add_months((today or date.today()).replace(day=1), -retention_months)
+    archived = 0
+    for table in AUDIT_TABLES:
+        try:
+            partitions = sorted(list_partitions(engine, table).items())
+        except Exception:
+            metrics.increment("audit.partitions.failures")
+            logging.exception(f"Could not list partitions of {table}")
+            continue
+
+        for month, name in partitions:
+            if month >= cutoff:
+                continue
+
+            try:
+                # Export while still attached, so a failed export is retried
+                path = (
+                    export_partition(engine, name, archive_dir) if archive_dir else None
+                )
+                with engine.begin() as connection:
+                    connection.execute(text("SET LOCAL lock_timeout = '5s'"))
+                    connection.execute(
+                        text(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                    )
+                    if path:
+                        connection.execute(text(f"DROP TABLE {name}"))
+            except Exception:
+                metrics.increment("audit.partitions.failures")
+                logging.exception(f"Could not archive partition {name}")
+                continue
+            metrics.increment("audit.partitions.archived")
+            logging.info(
+                f"Archived partition {name} to {path}"
+                if path
+                else f"Detached partition {name}"
+            )
+            archived += 1
+    return archived
+
+
+def export_partition(engine: Engine, name: str, archive_dir: str) -> str:
+    """Stream a table to a gzip-compressed CSV with COPY and return its path."""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    partial = f"{path}.partial"
+
+    connection = engine.raw_connection()
+    try:
+        driver_connection = cast(psycopg.Connection, connection.driver_connection)
+        with driver_connection.cursor() as cursor, gzip.open(partial, "wb") as out:
+            query = sql.SQL("COPY {} TO STDOUT (FORMAT csv, HEADER)").format(
+                sql.Identifier(name)
+            )
+            with cursor.copy(query) as copy:
+                for block in copy:
+                    out.write(block)
+        connection.commit()
+    finally:
+        connection.close()
+
+    # Only a complete export gets the final name
+    os.replace(partial, path)
+    return path
+
+
+def maintain_audit_partitions(
+    engine: Engine,
+    months_ahead: Optional[int] = None,
+    retention_months: Optional[int] = None,
+    archive_dir: Optional[str] = None,
+) -> None:
+    """Create upcoming partitions, then archive expired ones.
+
+    Does nothing while another process holds the maintenance lock.
+    """
+    settings = get_settings()
+    lock_key = func.hashtext(MAINTENANCE_LOCK_KEY)
+    with engine.connect() as lock_connection:
+        locked = lock_connection.execute(
+            select(func.pg_try_advisory_lock(lock_key))
+        ).scalar()
+        lock_connection.commit()
+        if not locked:
+            logging.info("Audit partitions: maintenance is running elsewhere")
+            return
+
+        try:
+            created = ensure_partitions(
+                engine,
+                months_ahead
+                if months_ahead is not None
+                else settings.AUDIT_MONTHS_AHEAD,
+            )
+            retention_months = (
+                retention_months
+                if retention_months is not None
+                else settings.AUDIT_RETENTION_MONTHS
+            )
+            archived = 0
+            if retention_months > 0:
+                archived = archive_partitions(
+                    engine,
+                    retention_months,
+                    archive_dir
+                    if archive_dir is not None
+                    else settings.AUDIT_ARCHIVE_DIR,
+                )
+        finally:
+            lock_connection.execute(select(func.pg_advisory_unlock(lock_key)))
+            lock_connection.commit()
+    logging.info(f"Audit partitions: created {created}, archived {archived} partitions")
+
+
+async def run_partition_maintenance(engine: Engine, interval_seconds: float) -> None:
+    """Maintain audit partitions every `interval_seconds` until cancelled."""
+    while True:
+        try:
+            await run_in_threadpool(maintain_audit_partitions, engine)
+        except Exception:
+            metrics.increment("audit.partitions.failures")
+            logging.exception("Audit partition maintenance failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,270 @@
+"""Batched audit writer with an on-disk spool.
+
+Audit rows are attached to the ORM session that produced them and handed to
+the writer when that session commits; rolled-back work is never audited.
+The writer appends each event to a spool segment before queueing it, and a
+background thread inserts queued events in multi-row batches once
+`batch_size` events are waiting or every `flush_interval` seconds. A
+segment is deleted only after its events are committed, and segments left
+behind by a crashed process are replayed. Inserts skip keys that already
+exist, so a replay after a crash between commit and delete is harmless.
+
+Every live segment is held under an exclusive flock by its process, which
+is how a replaying process tells orphaned segments from ones still in use.
+"""
+
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import DateTime, Enum, MetaData, Table, Uuid, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ...config import get_settings
+from ...db import SessionLocal
+from ...utils.metrics import metrics
+from ...utils.serialization import json_dumps
+from ..models.base import metadata
+
+_PENDING = "pending_audit_events"
+
+
+def _decode_row(table: Table, values: dict) -> dict:
+    """Turn JSON-decoded column values back into what the columns bind."""
+    row = {}
+    for key, value in values.items():
+        column_type = table.c[key].type
+        if value is not None:
+            if isinstance(column_type, Uuid):
+                value = uuid.UUID(value)
+            elif isinstance(column_type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column_type, Enum) and column_type.enum_class:
+                value = column_type.enum_class(value)
+        row[key] = value
+    return row
+
+
+class _Segment:
+    """A spool file owned, and flock-ed, by this process."""
+
+    def __init__(self, path: str, file):
+        self.path = path
+        self.file = file
+
+    @classmethod
+    def create(cls, spool_dir: str) -> "_Segment":
+        # Lock under a temporary name so replayers never see it unlocked
+        stem = os.path.join(spool_dir, f"{os.getpid()}-{uuid.uuid4().hex}")
+        file = open(f"{stem}.tmp", "a", encoding="utf-8")
+        fcntl.flock(file, fcntl.LOCK_EX)
+        os.rename(f"{stem}.tmp", f"{stem}.jsonl")
+        return cls(f"{stem}.jsonl", file)
+
+    @classmethod
+    def claim(cls, path: str) -> Optional["_Segment"]:
+        """Take over a segment whose owner is gone, or return None."""
+        try:
+            file = open(path, "a+", encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            return None
+        if not os.path.exists(path):
+            # Deleted by its owner between listing and locking
+            file.close()
+            return None
+        return cls(path, file)
+
+    def append(self, lines: Iterable[str]) -> None:
+        self.file.write("".join(f"{line}\n" for line in lines))
+        self.file.flush()
+
+    def read(self) -> list[str]:
+        self.file.seek(0)
+        return [line for line in self.file.read().splitlines() if line]
+
+    def discard(self) -> None:
+        os.unlink(self.path)
+        self.file.close()
+
+
+class AuditWriter:
+    """Queue audit rows at commit and insert them in batches off the request path."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        metadata: MetaData,
+        spool_dir: str,
+        batch_size: int,
+        flush_interval: float,
+        enabled: bool = True,
+    ):
+        self.session_factory = session_factory
+        self.metadata = metadata
+        self.spool_dir = spool_dir
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._segment: Optional[_Segment] = None
+        self._events: list[str] = []
+        # Rotated segments and their events, oldest first, awaiting insert
+        self._pending: list[tuple[_Segment, list[str]]] = []
+
+    def add(self, session: Session, table: Table, rows: list[dict]) -> bool:
+        """Queue `rows` for `table` once `session` commits.
+
+        Returns False when the writer is disabled; the caller then writes
+        the rows itself.
+        """
+        if not self.enabled:
+            return False
+        session.info.setdefault(_PENDING, []).extend(
+            json_dumps({"table": table.name, "values": row}) for row in rows
+        )
+        return True
+
+    def enqueue(self, lines: list[str]) -> None:
+        self._ensure_started()
+        with self._cond:
+            # Set by _ensure_started and only ever replaced afterwards
+            assert self._segment is not None
+            self._segment.append(lines)
+            self._events.extend(lines)
+            metrics.increment("audit.writer.queued", len(lines))
+            if len(self._events) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """Insert everything queued so far; failed batches stay for a retry."""
+        with self._flush_lock:
+            with self._cond:
+                # Events are only queued once a segment exists
+                if self._events and self._segment is not None:
+                    self._pending.append((self._segment, self._events))
+                    self._segment = _Segment.create(self.spool_dir)
+                    self._events = []
+
+            while self._pending:
+                segment, lines = self._pending[0]
+                try:
+                    self._write(lines)
+                except Exception:
+                    metrics.increment("audit.writer.flush_failures")
+                    logging.exception(
+                        f"Audit flush of {len(lines)} events failed; will retry"
+                    )
+                    return
+                self._pending.pop(0)
+                segment.discard()
+                metrics.increment("audit.writer.written", len(lines))
+
+    def _write(self, lines: list[str]) -> None:
+        rows_by_table: dict[str, list[dict]] = defaultdict(list)
+        for line in lines:
+            audit_event = json.loads(line)
+            table = self.metadata.tables[audit_event["table"]]
+            rows_by_table[table.name].append(_decode_row(table, audit_event["values"]))
+
+        with self.session_factory() as db:
+            for name, rows in rows_by_table.items():
+                table = self.metadata.tables[name]
+                for start in range(0, len(rows), self.batch_size):
+                    self._insert(db, table, rows[start : start + self.batch_size])
+            db.commit()
+        metrics.observe("audit.writer.batch_size", len(lines))
+
+    def _insert(self, db: Session, table: Table, rows: list[dict]) -> None:
+        statement = pg_insert(table).on_conflict_do_nothing(
+            index_elements=[column.name for column in table.primary_key]
+        )
+        try:
+            with db.begin_nested():
+                db.execute(statement, rows)
+            return
+        except IntegrityError:
+            pass
+
+        # Some audited rows were deleted before their audits arrived, e.g. a
+        # DELETE audit whose document is gone; keep the rest of the batch
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(statement, row)
+            except IntegrityError:
+                metrics.increment("audit.writer.dropped")
+
+    def _ensure_started(self) -> None:
+        # Forked workers inherit state from the parent; each starts afresh
+        if self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._pid == os.getpid():
+                return
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._events = []
+            self._pending = self._claim_orphans()
+            self._segment = _Segment.create(self.spool_dir)
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="audit-writer", daemon=True).start()
+            atexit.register(self.flush)
+
+    def _claim_orphans(self) -> list[tuple[_Segment, list[str]]]:
+        orphans = []
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, "*.jsonl"))):
+            segment = _Segment.claim(path)
+            if segment is None:
+                continue
+            lines = segment.read()
+            logging.info(f"Replaying {len(lines)} spooled audit events from {path}")
+            orphans.append((segment, lines))
+        return orphans
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._events) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+            self.flush()
+
+
+audit_writer = AuditWriter(
+    SessionLocal,
+    metadata,
+    spool_dir=get_settings().AUDIT_SPOOL_DIR,
+    batch_size=get_settings().AUDIT_BATCH_SIZE,
+    flush_interval=get_settings().AUDIT_FLUSH_INTERVAL_SECONDS,
+    enabled=get_settings().AUDIT_WRITER_ENABLED,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session: Session) -> None:
+    lines = session.info.pop(_PENDING, None)
+    if lines:
+        audit_writer.enqueue(lines)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING, None)
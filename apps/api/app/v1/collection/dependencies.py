@@ -1,7 +1,8 @@
 from fastapi import Depends, HTTPException, status
 from typing import Callable
-from .service import CollectionService
-from ...db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from .service import AsyncCollectionService, CollectionService
+from ...db import get_async_db, get_db
 from ..user.dependencies import get_current_user
 from ..models.user import User
 from ..models.enum import CollectionPermissionEnum
@@ -11,13 +12,21 @@ def get_collection_service(db=Depends(get_db)) -> CollectionService:
     return CollectionService(db)
 
 
+def get_async_collection_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncCollectionService:
+    return AsyncCollectionService(db)
+
+
 def has_permission(required_permission: CollectionPermissionEnum) -> Callable:
-    def permission_checker(
+    async def permission_checker(
         collection_id: str,
         current_user: User = Depends(get_current_user),
-        collection_service: CollectionService = Depends(get_collection_service),
+        collection_service: AsyncCollectionService = Depends(
+            get_async_collection_service
+        ),
     ) -> None:
-        if not collection_service.has_permission(
+        if not await collection_service.has_permission(
             str(current_user.id), collection_id, required_permission
         ):
             raise HTTPException(
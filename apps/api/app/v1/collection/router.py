@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Body
+from typing import List, Optional
 
 from .schemas import (
     CollectionCreateRequest,
@@ -10,14 +10,16 @@ from .schemas import (
     CollectionAiPreferenceRequest,
     CollectionAiPreferenceResponse,
 )
-from .service import CollectionService
+from .service import AsyncCollectionService
 from .dependencies import (
-    get_collection_service,
+    get_async_collection_service,
     has_permission,
 )
 from ..user.dependencies import get_current_user
 from ..models.user import User
 from ..models.enum import CollectionPermissionEnum
+from ..audit.history import DEFAULT_AUDIT_PAGE_SIZE, MAX_AUDIT_PAGE_SIZE
+from ...utils.pagination import InvalidCursorError
 
 
 router = APIRouter(prefix="/collections", tags=["collections"])
@@ -28,14 +30,14 @@ router = APIRouter(prefix="/collections", tags=["collections"])
     response_model=CollectionResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_collection(
+async def create_collection(
     collection_data: CollectionCreateRequest,
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> CollectionResponse:
     """Create a new collection."""
 
-    collection = collection_service.create_collection(
+    collection = await collection_service.create_collection(
         collection_data=collection_data,
         user_id=str(current_user.id),
     )
@@ -48,13 +50,13 @@ def create_collection(
     response_model=List[CollectionResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_collections(
+async def get_collections(
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> List[CollectionResponse]:
     """Get all collections the user has access to."""
 
-    collections = collection_service.get_user_collections(str(current_user.id))
+    collections = await collection_service.get_user_collections(str(current_user.id))
 
     return collections
 
@@ -64,17 +66,19 @@ def get_collections(
     response_model=List[CollectionResponse],
     status_code=status.HTTP_200_OK,
 )
-def search_collections(
+async def search_collections(
     word: str = "",
     page: int = 1,
     per_page: int = 5,
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> List[CollectionResponse]:
     """Search collections by title with optional fuzzy matching and pagination."""
 
-    return collection_service.permission.search_collections(
-        user_id=str(current_user.id), word=word, page=page, per_page=per_page
+    return await collection_service.run(
+        lambda service: service.permission.search_collections(
+            user_id=str(current_user.id), word=word, page=page, per_page=per_page
+        )
     )
 
 
@@ -83,15 +87,15 @@ def search_collections(
     response_model=CollectionResponse,
     status_code=status.HTTP_200_OK,
 )
-def get_collection(
+async def get_collection(
     collection_id: str,
     _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> CollectionResponse:
     """Get a collection by ID."""
 
-    collection = collection_service.get_collection(collection_id)
+    collection = await collection_service.get_collection(collection_id)
 
     if not collection:
         raise HTTPException(
@@ -106,15 +110,30 @@ def get_collection(
     response_model=List[CollectionAuditResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_collection_audits(
+async def get_collection_audits(
     collection_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_AUDIT_PAGE_SIZE, ge=1, le=MAX_AUDIT_PAGE_SIZE),
+    cursor: Optional[str] = None,
     _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> List[CollectionAuditResponse]:
-    """Get audits for a collection by ID."""
+    """Get audits for a collection by ID, newest first.
+
+    When more records exist, the `X-Next-Cursor` response header holds the
+    `cursor` for the next page.
+    """
+
+    try:
+        audits, next_cursor = await collection_service.get_collection_audits(
+            collection_id, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    audits = collection_service.get_collection_audits(collection_id)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [CollectionAuditResponse.model_validate(a) for a in audits]
 
 
@@ -123,16 +142,16 @@ def get_collection_audits(
     response_model=CollectionResponse,
     status_code=status.HTTP_200_OK,
 )
-def update_collection(
+async def update_collection(
     collection_id: str,
     collection_data: CollectionCreateRequest = Body(...),
     _: None = Depends(has_permission(CollectionPermissionEnum.EDIT)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> CollectionResponse:
     """Update a collection by ID."""
 
-    updated = collection_service.update_collection(
+    updated = await collection_service.update_collection(
         collection_id, collection_data, user_id=str(current_user.id)
     )
     if not updated:
@@ -146,15 +165,15 @@ def update_collection(
     "/{collection_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_collection(
+async def delete_collection(
     collection_id: str,
     _: None = Depends(has_permission(CollectionPermissionEnum.OWNER)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ):
     """Delete a collection by ID."""
 
-    deleted = collection_service.delete_collection(collection_id)
+    deleted = await collection_service.delete_collection(collection_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Collection not found"
@@ -167,15 +186,15 @@ def delete_collection(
     response_model=CollectionAiPreferenceResponse,
     status_code=status.HTTP_200_OK,
 )
-def get_collection_ai_preferences(
+async def get_collection_ai_preferences(
     collection_id: str,
     _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> CollectionAiPreferenceResponse:
     """Get collection AI preferences."""
 
-    preference = collection_service.get_collection_ai_preference(collection_id)
+    preference = await collection_service.get_collection_ai_preference(collection_id)
 
     if not preference:
         raise HTTPException(
@@ -199,16 +218,16 @@ def get_collection_ai_preferences(
     response_model=CollectionAiPreferenceResponse,
     status_code=status.HTTP_200_OK,
 )
-def update_collection_ai_preferences(
+async def update_collection_ai_preferences(
     collection_id: str,
     preference_data: CollectionAiPreferenceRequest,
     _: None = Depends(has_permission(CollectionPermissionEnum.EDIT)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> CollectionAiPreferenceResponse:
     """Update collection AI preferences. Creates if doesn't exist."""
 
-    updated_preference = collection_service.upsert_collection_ai_preference(
+    updated_preference = await collection_service.upsert_collection_ai_preference(
         collection_id=collection_id,
         preference_data=preference_data,
     )
@@ -228,15 +247,15 @@ def update_collection_ai_preferences(
     "/{collection_id}/ai-preferences",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_collection_ai_preferences(
+async def delete_collection_ai_preferences(
     collection_id: str,
     _: None = Depends(has_permission(CollectionPermissionEnum.EDIT)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ):
     """Delete collection AI preferences."""
 
-    collection_service.delete_collection_ai_preference(collection_id)
+    await collection_service.delete_collection_ai_preference(collection_id)
     return None
 
 
@@ -245,15 +264,15 @@ def delete_collection_ai_preferences(
     response_model=List[CollectionPermissionResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_collection_permissions(
+async def get_collection_permissions(
     collection_id: str,
     _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> List[CollectionPermissionResponse]:
     """Get all permissions for a collection."""
 
-    return collection_service.get_collection_permissions(collection_id)
+    return await collection_service.get_collection_permissions(collection_id)
 
 
 @router.post(
@@ -261,16 +280,16 @@ def get_collection_permissions(
     response_model=CollectionPermissionResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def grant_collection_permission(
+async def grant_collection_permission(
     collection_id: str,
     permission_data: CollectionPermissionRequest,
     _: None = Depends(has_permission(CollectionPermissionEnum.OWNER)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> CollectionPermissionResponse:
     """Grant permission to a user for a collection."""
 
-    return collection_service.grant_permission(
+    return await collection_service.grant_permission(
         collection_id=collection_id,
         user_id=permission_data.user_id,
         permission_level=permission_data.permission_level,
@@ -283,17 +302,17 @@ def grant_collection_permission(
     response_model=CollectionPermissionResponse,
     status_code=status.HTTP_200_OK,
 )
-def update_collection_permission(
+async def update_collection_permission(
     collection_id: str,
     user_id: str,
     permission_data: CollectionPermissionRequest,
     _: None = Depends(has_permission(CollectionPermissionEnum.OWNER)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ) -> CollectionPermissionResponse:
     """Update permission for a user on a collection."""
 
-    updated_permission = collection_service.update_permission(
+    updated_permission = await collection_service.update_permission(
         collection_id=collection_id,
         user_id=user_id,
         permission_level=permission_data.permission_level,
@@ -313,16 +332,16 @@ def update_collection_permission(
     "/{collection_id}/permissions/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def revoke_collection_permission(
+async def revoke_collection_permission(
     collection_id: str,
     user_id: str,
     _: None = Depends(has_permission(CollectionPermissionEnum.OWNER)),
     current_user: User = Depends(get_current_user),
-    collection_service: CollectionService = Depends(get_collection_service),
+    collection_service: AsyncCollectionService = Depends(get_async_collection_service),
 ):
     """Revoke permission for a user on a collection."""
 
-    revoked = collection_service.revoke_permission(
+    revoked = await collection_service.revoke_permission(
         collection_id=collection_id,
         user_id=user_id,
         revoked_by=str(current_user.id),
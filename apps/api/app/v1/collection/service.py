@@ -14,13 +14,89 @@ from ..models.collection import (
     CollectionAiPreference,
 )
 from ..models.user import User
-from ..models.document import Document
 from ..models.enum import CollectionActionEnum, CollectionPermissionEnum
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import NamedTuple, Optional, List, Tuple
 from fastapi import HTTPException
 
+from ...config import get_settings
+from ...utils.async_service import AsyncService
+from ...utils.cache import TTLCache
+from ...utils.replica import replica_read
+from ..audit.history import DEFAULT_AUDIT_PAGE_SIZE, audit_page
+from ..audit.writer import audit_writer
+
+# Permission hierarchy: OWNER > EDIT > READ
+PERMISSION_LEVELS = {
+    CollectionPermissionEnum.READ: 1,
+    CollectionPermissionEnum.EDIT: 2,
+    CollectionPermissionEnum.OWNER: 3,
+}
+
+
+def permission_satisfies(
+    granted: Optional[CollectionPermissionEnum],
+    required: CollectionPermissionEnum,
+) -> bool:
+    """Whether a granted level (None for no access) covers the required one."""
+    return (
+        granted is not None
+        and PERMISSION_LEVELS[granted] >= PERMISSION_LEVELS[required]
+    )
+
+
+def _canonical_id(value) -> Optional[str]:
+    """Canonical text form of a UUID, or None if `value` is not one."""
+    try:
+        return str(value if isinstance(value, UUID) else UUID(str(value)))
+    except ValueError:
+        return None
+
+
+class CachedPermission(NamedTuple):
+    version: int
+    level: Optional[CollectionPermissionEnum]
+
+
+class PermissionCache:
+    """Cache of (user_id, collection_id) -> granted level, None for no access.
+
+    Entries are stamped with the collection's `permission_version`, which
+    every grant, update and revoke bumps in the same transaction as the
+    change. Readers look the version up first and ignore entries stamped
+    with another one, so a change takes effect on every worker as soon as
+    it commits; the TTL only bounds the memory held by idle entries.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._entries: TTLCache[tuple[str, str], CachedPermission] = TTLCache(
+            "auth.permission_cache", max_size=max_size, ttl_seconds=ttl_seconds
+        )
+
+    def get(
+        self, user_id: str, collection_id: str, version: int
+    ) -> Optional[CachedPermission]:
+        cached = self._entries.get((user_id, collection_id))
+        if cached is None or cached.version != version:
+            return None
+        return cached
+
+    def set(
+        self,
+        user_id: str,
+        collection_id: str,
+        version: int,
+        level: Optional[CollectionPermissionEnum],
+    ) -> None:
+        self._entries.set((user_id, collection_id), CachedPermission(version, level))
+
+
+permission_cache = PermissionCache(
+    max_size=get_settings().PERMISSION_CACHE_MAX_SIZE,
+    ttl_seconds=get_settings().PERMISSION_CACHE_TTL_SECONDS,
+)
+
 
 class CollectionService:
     """Collection Service"""
@@ -157,16 +233,23 @@ class CollectionService:
             raise e
 
     def get_collection_document_count(self, collection_id: str) -> int:
-        """Get the number of documents in a collection."""
-        return (
-            self.db.query(Document)
-            .filter(Document.collection_id == collection_id)
-            .count()
+        """Get the number of documents in a collection from its maintained counter."""
+        count = (
+            self.db.query(Collection.document_count)
+            .filter(Collection.id == collection_id)
+            .scalar()
         )
+        return count or 0
 
-    def get_collection_audits(self, collection_id: str):
-        """Get audits for a collection by ID."""
-        return self.audit.get_audits_for_collection(collection_id)
+    @replica_read
+    def get_collection_audits(
+        self,
+        collection_id: str,
+        limit: int = DEFAULT_AUDIT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[CollectionAudit], Optional[str]]:
+        """Get a page of audits for a collection by ID, newest first."""
+        return self.audit.get_audits_for_collection(collection_id, limit, cursor)
 
     def get_collection(self, collection_id: str) -> Optional[CollectionResponse]:
         """Get a collection by ID."""
@@ -201,8 +284,8 @@ class CollectionService:
         )
         latest_update = latest_audit[0] if latest_audit else None
 
-        # Get document count for this collection
-        document_count = self.get_collection_document_count(collection_id)
+        # Document count is maintained on the collection row
+        document_count = collection.document_count
 
         # Create response with additional fields
         collection_dict = {
@@ -405,27 +488,41 @@ class CollectionAuditService:
         action: CollectionActionEnum,
         user_id: Optional[str] = None,
     ) -> CollectionAudit:
-        """Create a new audit record for a collection action."""
+        """Create a new audit record for a collection action.
 
-        audit = CollectionAudit(
-            id=str(uuid4()),
-            collection_id=collection_id,
-            action=action,
-            performed_by=user_id,
-            performed_at=datetime.now(timezone.utc),
-        )
-        self.db.add(audit)
+        With the audit writer enabled the row is queued until the session
+        commits and the returned audit is not added to the session.
+        """
+
+        values = {
+            "id": str(uuid4()),
+            "collection_id": str(collection_id),
+            "action": action,
+            "performed_by": str(user_id) if user_id else None,
+            "performed_at": datetime.now(timezone.utc),
+        }
+        audit = CollectionAudit(**values)
+        if not audit_writer.add(self.db, CollectionAudit.__table__, [values]):
+            self.db.add(audit)
         # Don't commit here - let the calling service handle the transaction
         return audit
 
-    def get_audits_for_collection(self, collection_id: str) -> List[CollectionAudit]:
-        """Retrieve all audit records for a given collection."""
+    def get_audits_for_collection(
+        self,
+        collection_id: str,
+        limit: int = DEFAULT_AUDIT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[CollectionAudit], Optional[str]]:
+        """Retrieve a page of audit records for a collection and the next cursor."""
 
-        return (
-            self.db.query(CollectionAudit)
-            .filter(CollectionAudit.collection_id == collection_id)
-            .order_by(CollectionAudit.performed_at.desc())
-            .all()
+        return audit_page(
+            self.db.query(CollectionAudit).filter(
+                CollectionAudit.collection_id == collection_id
+            ),
+            CollectionAudit.performed_at,
+            CollectionAudit.id,
+            limit=limit,
+            cursor=cursor,
         )
 
 
@@ -441,29 +538,45 @@ class CollectionPermissionService:
         collection_id: str,
         required_permission: CollectionPermissionEnum,
     ) -> bool:
-        """Check if user has required permission for collection."""
-        permission = (
-            self.db.query(CollectionPermission)
-            .filter(
-                CollectionPermission.user_id == user_id,
-                CollectionPermission.collection_id == collection_id,
-            )
-            .first()
-        )
+        """Check if user has required permission for collection.
 
-        if not permission:
+        The granted level comes from `permission_cache` when its entry
+        matches the collection's current `permission_version`, so a hit
+        costs one primary-key read. Missing collections, malformed ids and
+        users without access are denied.
+        """
+        key = _canonical_id(collection_id)
+        if key is None:
+            return False
+        version = (
+            self.db.query(Collection.permission_version)
+            .filter(Collection.id == key)
+            .scalar()
+        )
+        if version is None:
             return False
 
-        # Define permission hierarchy: OWNER > EDIT > READ
-        permission_levels = {
-            CollectionPermissionEnum.READ: 1,
-            CollectionPermissionEnum.EDIT: 2,
-            CollectionPermissionEnum.OWNER: 3,
-        }
-
-        return (
-            permission_levels[permission.permission_level]
-            >= permission_levels[required_permission]
+        user_key = str(user_id)
+        cached = permission_cache.get(user_key, key, version)
+        if cached is not None:
+            level = cached.level
+        else:
+            level = (
+                self.db.query(CollectionPermission.permission_level)
+                .filter(
+                    CollectionPermission.user_id == user_id,
+                    CollectionPermission.collection_id == key,
+                )
+                .scalar()
+            )
+            permission_cache.set(user_key, key, version, level)
+        return permission_satisfies(level, required_permission)
+
+    def _bump_permission_version(self, collection_id: str) -> None:
+        # Invalidates every cached decision for the collection once committed
+        self.db.query(Collection).filter(Collection.id == collection_id).update(
+            {Collection.permission_version: Collection.permission_version + 1},
+            synchronize_session=False,
         )
 
     def grant_permission(
@@ -510,6 +623,7 @@ class CollectionPermissionService:
                 new_permission=permission_level,
             )
 
+            self._bump_permission_version(collection_id)
             self.db.commit()
             self.db.refresh(permission)
 
@@ -553,6 +667,7 @@ class CollectionPermissionService:
                 new_permission=permission_level,
             )
 
+            self._bump_permission_version(collection_id)
             self.db.commit()
             self.db.refresh(permission)
 
@@ -609,6 +724,7 @@ class CollectionPermissionService:
             )
 
             self.db.delete(permission)
+            self._bump_permission_version(collection_id)
             self.db.commit()
 
             return True
@@ -629,6 +745,7 @@ class CollectionPermissionService:
 
         return [CollectionPermissionResponse.model_validate(p) for p in permissions]
 
+    @replica_read
     def get_user_collections(self, user_id: str) -> List[CollectionResponse]:
         """Get all collections a user has access to."""
         collections = (
@@ -641,6 +758,7 @@ class CollectionPermissionService:
         # Delegate enrichment to a helper that batches contributor/latest lookups
         return self._enrich_collections(collections)
 
+    @replica_read
     def search_collections(
         self, user_id: str, word: str = "", page: int = 1, per_page: int = 5
     ) -> List[CollectionResponse]:
@@ -703,8 +821,9 @@ class CollectionPermissionService:
     ) -> List[CollectionResponse]:
         """Private helper to attach contributors, latest_update, and document_count to collections.
 
-        This batches the DB queries for contributors, latest audit timestamps, and document counts to
-        avoid N+1 queries and centralizes the transformation logic.
+        This batches the DB queries for contributors and latest audit timestamps to avoid N+1
+        queries and centralizes the transformation logic. Document counts come from the
+        maintained counter on each collection row.
         """
         if not collections:
             return []
@@ -740,20 +859,11 @@ class CollectionPermissionService:
         )
         latest_map = {coll_id: performed_at for coll_id, performed_at in latest_rows}
 
-        # Get document counts
-        document_count_rows = (
-            self.db.query(Document.collection_id, func.count(Document.id))
-            .filter(Document.collection_id.in_(collection_ids))
-            .group_by(Document.collection_id)
-            .all()
-        )
-        document_count_map = {coll_id: count for coll_id, count in document_count_rows}
-
         result: List[CollectionResponse] = []
         for collection in collections:
             contributor_list = contributors_map.get(collection.id, [])
             latest_update = latest_map.get(collection.id)
-            document_count = document_count_map.get(collection.id, 0)
+            document_count = collection.document_count
 
             collection_dict = {
                 "id": collection.id,
@@ -789,3 +899,9 @@ class CollectionPermissionService:
 
         self.db.add(audit)
         return audit
+
+
+class AsyncCollectionService(AsyncService[CollectionService]):
+    """CollectionService on an AsyncSession."""
+
+    service_class = CollectionService
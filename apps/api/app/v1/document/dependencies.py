@@ -1,8 +1,27 @@
 from fastapi import Depends
-from .service import DocumentService
-from ...db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from .service import AsyncDocumentService, DocumentService
+from .ingestion import BulkIngestionEngine
+from ..storage.dependencies import get_async_storage_service
+from ..storage.service import AsyncStorageService
+from ...db import get_async_db, get_db
 
 
 def get_document_service(db=Depends(get_db)) -> DocumentService:
     """Get document service instance."""
     return DocumentService(db)
+
+
+def get_async_document_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncDocumentService:
+    """Get async document service instance."""
+    return AsyncDocumentService(db)
+
+
+def get_bulk_ingestion_engine(
+    storage_service: AsyncStorageService = Depends(get_async_storage_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
+) -> BulkIngestionEngine:
+    """Get bulk ingestion engine instance."""
+    return BulkIngestionEngine(storage_service, document_service)
@@ -0,0 +1,165 @@
+"""Concurrent bulk ingestion of uploaded files into documents."""
+
+import asyncio
+import logging
+from typing import List, Optional, Tuple, Union
+from uuid import UUID
+
+from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import SQLAlchemyError
+
+from ...config import get_settings
+from ...utils.metrics import metrics
+from ..models import FileResouceEnum
+from ..storage.service import AsyncStorageService
+from ..storage.streaming import StoredObject, iter_upload_file
+from .schemas import BulkUploadResponse, BulkUploadResult, DocumentResponse
+from .service import AsyncDocumentService
+
+
+class BulkIngestionEngine:
+    """Upload many files concurrently and register them as documents at once.
+
+    Files are streamed to MinIO through a bounded worker pool. The database
+    work (owner/collection validation, then File, Document and audit rows) is
+    done once for the whole batch instead of once per file. Both services
+    must share the request's AsyncSession, so the batch is one transaction
+    on one connection.
+    """
+
+    def __init__(
+        self,
+        storage_service: AsyncStorageService,
+        document_service: AsyncDocumentService,
+        concurrency: Optional[int] = None,
+    ):
+        self.storage = storage_service
+        self.documents = document_service
+        self.concurrency = max(1, concurrency or get_settings().BULK_UPLOAD_CONCURRENCY)
+
+    async def _upload(
+        self, semaphore: asyncio.Semaphore, file: UploadFile
+    ) -> Union[StoredObject, str]:
+        if not file.filename:
+            return "No filename provided"
+
+        async with semaphore:
+            try:
+                return await self.storage.sync.stream_to_storage(
+                    iter_upload_file(file), content_type=file.content_type
+                )
+            except HTTPException as e:
+                return str(e.detail)
+            except Exception as e:
+                return str(e)
+
+    def _record_documents(
+        self,
+        user_id: UUID,
+        collection_id: Optional[UUID],
+        uploads: List[Tuple[str, StoredObject]],
+    ) -> Tuple[List[DocumentResponse], List[StoredObject]]:
+        """Write blob references, files and documents in one transaction.
+
+        Returns the documents and the uploaded objects that turned out to be
+        duplicates of existing blobs.
+        """
+        stored_objects = [stored for _, stored in uploads]
+        storage = self.storage.sync
+        try:
+            blob_urls = storage.acquire_blobs(stored_objects)
+        except SQLAlchemyError as e:
+            storage.db.rollback()
+            raise ValueError(f"Database error: {str(e)}") from e
+
+        documents = self.documents.sync.bulk_create_documents(
+            user_id,
+            collection_id,
+            [
+                storage.build_file_values(
+                    stored,
+                    filename=filename,
+                    user_id=user_id,
+                    resource=FileResouceEnum.DOCUMENT,
+                    blob_urls=blob_urls,
+                )
+                for filename, stored in uploads
+            ],
+        )
+        return documents, storage.redundant_objects(stored_objects, blob_urls)
+
+    async def ingest(
+        self,
+        files: List[UploadFile],
+        user_id: UUID,
+        collection_id: Optional[UUID] = None,
+    ) -> BulkUploadResponse:
+        """Ingest `files` and report the outcome of each one.
+
+        Raises:
+            ValueError: If the user or collection does not exist.
+        """
+        await self.documents.validate_owner_and_collection(user_id, collection_id)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(
+            *(self._upload(semaphore, file) for file in files)
+        )
+
+        filenames = [file.filename or "unknown" for file in files]
+        results: List[Optional[BulkUploadResult]] = [None] * len(files)
+        stored_indexes = []
+        stored_objects = []
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, StoredObject):
+                stored_indexes.append(index)
+                stored_objects.append(outcome)
+            else:
+                results[index] = BulkUploadResult(
+                    index=index,
+                    filename=filenames[index],
+                    success=False,
+                    error=outcome,
+                )
+
+        uploads = [
+            (filenames[index], stored)
+            for index, stored in zip(stored_indexes, stored_objects)
+        ]
+        try:
+            documents, redundant = await self.documents.run(
+                lambda _: self._record_documents(user_id, collection_id, uploads)
+            )
+        except ValueError as e:
+            logging.error(f"Bulk ingestion failed to record documents: {e}")
+            await run_in_threadpool(
+                self.storage.sync.remove_stored_objects, stored_objects
+            )
+            documents = []
+            for index in stored_indexes:
+                results[index] = BulkUploadResult(
+                    index=index,
+                    filename=filenames[index],
+                    success=False,
+                    error=str(e),
+                )
+        else:
+            await run_in_threadpool(self.storage.sync.remove_stored_objects, redundant)
+            for index, document in zip(stored_indexes, documents):
+                results[index] = BulkUploadResult(
+                    index=index,
+                    filename=filenames[index],
+                    success=True,
+                    document=document,
+                )
+
+        succeeded = len(documents)
+        metrics.increment("documents.bulk_upload.succeeded", succeeded)
+        metrics.increment("documents.bulk_upload.failed", len(files) - succeeded)
+
+        return BulkUploadResponse(
+            results=[result for result in results if result is not None],
+            succeeded=succeeded,
+            failed=len(files) - succeeded,
+        )
@@ -6,17 +6,20 @@ from fastapi import (
     UploadFile,
     File,
     Form,
+    Query,
+    Response,
 )
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 
 from .schemas import (
-    DocumentCreateRequest,
     DocumentUpdateRequest,
     DocumentResponse,
     PaginatedDocumentResponse,
+    BulkUploadResponse,
     DocumentAudit,
+    DocumentAuditStateResponse,
     TagCreateRequest,
     TagUpdateRequest,
     TagResponse,
@@ -24,13 +27,14 @@ from .schemas import (
     DocumentTagUpdateRequest,
     DocumentTagResponse,
 )
-from .service import DocumentService
-from .dependencies import get_document_service
+from .service import AsyncDocumentService
+from .dependencies import get_async_document_service, get_bulk_ingestion_engine
+from .ingestion import BulkIngestionEngine
 from ..user.dependencies import get_current_user
 from ..models.user import User
-from ..storage.service import StorageService
-from ..storage.dependencies import get_storage_service
-from ..models import FileResouceEnum
+from ..models.enum import CountStrategyEnum, DocumentIncludeEnum
+from ...utils.pagination import InvalidCursorError
+from ..audit.history import DEFAULT_AUDIT_PAGE_SIZE, MAX_AUDIT_PAGE_SIZE
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -44,60 +48,51 @@ async def bulk_upload_documents(
     files: List[UploadFile] = File(...),
     collection_id: UUID = Form(default=None),
     current_user: User = Depends(get_current_user),
-    storage_service: StorageService = Depends(get_storage_service),
-    document_service: DocumentService = Depends(get_document_service),
+    ingestion_engine: BulkIngestionEngine = Depends(get_bulk_ingestion_engine),
 ):
     """Bulk upload multiple files to the same collection."""
-    if not files:
+    report = await _ingest(files, collection_id, current_user, ingestion_engine)
+
+    if not report.succeeded:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="No files provided"
+            status_code=status.HTTP_400_BAD_REQUEST, detail="All file uploads failed"
         )
 
-    created_documents = []
-    failed_uploads = []
-
-    for i, file in enumerate(files):
-        try:
-            if not file.filename:
-                failed_uploads.append(
-                    {"index": i, "filename": "unknown", "error": "No filename provided"}
-                )
-                continue
-
-            # Upload file to storage
-            file_response = await storage_service.upload_file_to_storage(
-                file=file,
-                user_id=current_user.id,
-                resource=FileResouceEnum.DOCUMENT,
-            )
-
-            document_data = DocumentCreateRequest(
-                user_id=current_user.id,
-                collection_id=collection_id,
-                file_id=file_response.id,
-                title=None,
-                description=None,
-                summary=None,
-            )
-
-            document = document_service.create_document(document_data)
-            created_documents.append(document)
-
-        except Exception as e:
-            failed_uploads.append(
-                {
-                    "index": i,
-                    "filename": file.filename or "unknown",
-                    "error": str(e),
-                }
-            )
-
-    if not created_documents:
+    return [result.document for result in report.results if result.success]
+
+
+@router.post(
+    "/uploads/bulk",
+    response_model=BulkUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_upload_documents_report(
+    files: List[UploadFile] = File(...),
+    collection_id: UUID = Form(default=None),
+    current_user: User = Depends(get_current_user),
+    ingestion_engine: BulkIngestionEngine = Depends(get_bulk_ingestion_engine),
+):
+    """Bulk upload multiple files and report success or failure per file."""
+    return await _ingest(files, collection_id, current_user, ingestion_engine)
+
+
+async def _ingest(
+    files: List[UploadFile],
+    collection_id: Optional[UUID],
+    current_user: User,
+    ingestion_engine: BulkIngestionEngine,
+) -> BulkUploadResponse:
+    if not files:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="All file uploads failed"
+            status_code=status.HTTP_400_BAD_REQUEST, detail="No files provided"
         )
 
-    return created_documents
+    try:
+        return await ingestion_engine.ingest(
+            files, user_id=current_user.id, collection_id=collection_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
 @router.get(
@@ -109,14 +104,24 @@ async def get_documents_table(
     collection_id: str,
     page: int = 1,
     per_page: int = 10,
+    cursor: Optional[str] = None,
+    count: CountStrategyEnum = CountStrategyEnum.COUNTER,
+    include: List[DocumentIncludeEnum] = Query([]),
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Get all documents in a collection with pagination for table display."""
     try:
-        return document_service.get_documents_by_collection_paginated(
-            collection_id=collection_id, page=page, per_page=per_page
+        return await document_service.get_documents_by_collection_paginated(
+            collection_id=collection_id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            count_strategy=count,
+            include=include,
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -129,11 +134,11 @@ async def get_documents_table(
 async def get_document(
     document_id: str,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Get a document by ID."""
     try:
-        return document_service.get_document(document_id=document_id)
+        return await document_service.get_document(document_id=document_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -147,11 +152,11 @@ async def update_document(
     document_id: str,
     document_update: DocumentUpdateRequest,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Update a document by ID."""
     try:
-        return document_service.update_document(
+        return await document_service.update_document(
             document_id=document_id,
             document_update=document_update,
             user_id=str(current_user.id),
@@ -167,16 +172,57 @@ async def update_document(
 )
 async def get_document_audit(
     document_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_AUDIT_PAGE_SIZE, ge=1, le=MAX_AUDIT_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
+):
+    """Get a document's audit records, newest first.
+
+    When more records exist, the `X-Next-Cursor` response header holds the
+    `cursor` for the next page.
+    """
+    try:
+        audits, next_cursor = await document_service.get_document_audits(
+            document_id=document_id, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return audits
+
+
+@router.get(
+    "/{document_id}/audit/{audit_id}/state",
+    response_model=DocumentAuditStateResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_document_audit_state(
+    document_id: str,
+    audit_id: UUID,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
-    """Get all audit records for a document by ID."""
+    """Get a document's state as recorded by one of its audits."""
     try:
-        document_service.get_document(document_id=document_id)
-        return document_service.audit.get_audits_for_document(document_id=document_id)
+        audit, state = await document_service.get_document_state_at(
+            document_id=document_id, audit_id=str(audit_id)
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
+    return DocumentAuditStateResponse(
+        audit_id=audit.id,
+        version=audit.version,
+        timestamp=audit.timestamp,
+        state=state,
+    )
+
 
 @router.delete(
     "/{document_id}",
@@ -185,12 +231,12 @@ async def get_document_audit(
 async def delete_document(
     document_id: str,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Delete a document by ID. Only the owner can delete their document."""
     try:
         # Optionally, you could check if the document belongs to the user here
-        document_service.delete_document(
+        await document_service.delete_document(
             document_id=document_id, user_id=str(current_user.id)
         )
     except ValueError as e:
@@ -206,11 +252,11 @@ async def delete_document(
 async def create_tag(
     tag_create: TagCreateRequest,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Create a new tag."""
     try:
-        return document_service.create_tag(tag_create)
+        return await document_service.create_tag(tag_create)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -223,11 +269,11 @@ async def create_tag(
 async def get_tags_by_collection(
     collection_id: str,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Get all tags for a specific collection."""
     try:
-        return document_service.get_tags_by_collection(collection_id)
+        return await document_service.get_tags_by_collection(collection_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -240,11 +286,11 @@ async def get_tags_by_collection(
 async def get_tag(
     tag_id: str,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Get a tag by ID."""
     try:
-        return document_service.get_tag(tag_id)
+        return await document_service.get_tag(tag_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -258,11 +304,11 @@ async def update_tag(
     tag_id: str,
     tag_update: TagUpdateRequest,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Update a tag."""
     try:
-        return document_service.update_tag(tag_id, tag_update)
+        return await document_service.update_tag(tag_id, tag_update)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -274,11 +320,11 @@ async def update_tag(
 async def delete_tag(
     tag_id: str,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Delete a tag."""
     try:
-        document_service.delete_tag(tag_id)
+        await document_service.delete_tag(tag_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -292,11 +338,11 @@ async def delete_tag(
 async def add_tag_to_document(
     document_tag_create: DocumentTagCreateRequest,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Add a tag to a document."""
     try:
-        return document_service.add_tag_to_document(document_tag_create)
+        return await document_service.add_tag_to_document(document_tag_create)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -309,11 +355,11 @@ async def remove_tag_from_document(
     document_id: str,
     tag_id: str,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Remove a tag from a document."""
     try:
-        document_service.remove_tag_from_document(document_id, tag_id)
+        await document_service.remove_tag_from_document(document_id, tag_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -326,11 +372,11 @@ async def remove_tag_from_document(
 async def get_document_tags(
     document_id: str,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Get all tags for a specific document."""
     try:
-        return document_service.get_document_tags(document_id)
+        return await document_service.get_document_tags(document_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -344,11 +390,11 @@ async def update_document_tags(
     document_id: str,
     document_tag_update: DocumentTagUpdateRequest,
     current_user: User = Depends(get_current_user),
-    document_service: DocumentService = Depends(get_document_service),
+    document_service: AsyncDocumentService = Depends(get_async_document_service),
 ):
     """Update all tags for a document in one operation."""
     try:
-        return document_service.replace_document_tags(
+        return await document_service.replace_document_tags(
             document_id=document_id, tag_items=document_tag_update.tag_ids
         )
 
@@ -6,7 +6,7 @@ from datetime import datetime
 from ..storage.schemas import FileResponse
 from ..schemas.graph import KnowledgeGraph
 from ..user.schemas import UserInfoSchema
-from ..models.enum import DocumentActionEnum
+from ..models.enum import CountStrategyEnum, DocumentActionEnum
 
 
 # Tag schemas
@@ -64,12 +64,21 @@ class DocumentAudit(BaseModel):
     old_values: Optional[dict] = None
     new_values: Optional[dict] = None
     action_type: DocumentActionEnum
+    version: Optional[int] = None
+    patch: Optional[List[dict]] = None
     timestamp: datetime
 
     class Config:
         from_attributes = True
 
 
+class DocumentAuditStateResponse(BaseModel):
+    audit_id: UUID
+    version: int
+    timestamp: datetime
+    state: dict
+
+
 class DocumentCreateRequest(BaseModel):
     user_id: Optional[UUID] = Field(
         None, description="ID of the user who owns the document"
@@ -101,6 +110,7 @@ class DocumentResponse(BaseModel):
     summary: Optional[str]
     is_vectorized: bool
     is_graph_extracted: bool
+    vectorize_error: Optional[str] = None
     knowledge_graph: Optional[KnowledgeGraph]
     tags: Optional[List[TagResponse]] = None
 
@@ -114,6 +124,26 @@ class PaginatedDocumentResponse(BaseModel):
     page: int
     per_page: int
     total_pages: int
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page"
+    )
+    count_strategy: CountStrategyEnum = Field(
+        CountStrategyEnum.COUNTER, description="How `total` was computed"
+    )
 
     class Config:
         from_attributes = True
+
+
+class BulkUploadResult(BaseModel):
+    index: int = Field(..., description="Position of the file in the request")
+    filename: str = Field(..., description="Original file name")
+    success: bool
+    document: Optional[DocumentResponse] = None
+    error: Optional[str] = None
+
+
+class BulkUploadResponse(BaseModel):
+    results: List[BulkUploadResult]
+    succeeded: int
+    failed: int
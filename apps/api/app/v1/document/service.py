@@ -1,6 +1,7 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy.exc import IntegrityError
-from ..models.document import Document, Tag, DocumentTag
+from sqlalchemy import func, insert, inspect, select, tuple_
+from sqlalchemy.orm import Session, defer, joinedload, selectinload
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from ..models.document import Document, Tag, DocumentTag, document_title_sort_key
 from ..models.file import File
 from ..models.user import User
 from ..models.collection import Collection
@@ -17,17 +18,70 @@ from .schemas import (
 )
 from ..models.document import DocumentAudit
 from ..storage.service import StorageService
-from ..models.enum import DocumentActionEnum
+from ..models.enum import (
+    CountStrategyEnum,
+    DocumentActionEnum,
+    DocumentIncludeEnum,
+)
 from ..storage.schemas import FileResponse
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Iterable, Optional, List, Tuple
 from uuid import UUID
 import uuid
 import re
+import json
 from ..user.schemas import UserInfoSchema
 from ..schemas.graph import KnowledgeGraph
 import math
+from ...utils.async_service import AsyncService
 from ...utils.color import generateRandomColor
+from ...utils.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+)
+from ...utils.replica import replica_read
+from ..audit.history import DEFAULT_AUDIT_PAGE_SIZE, audit_page
+from ..audit.writer import audit_writer
+from ...config import get_settings
+from ...utils.json_patch import apply_patch, make_patch
+from ...utils.serialization import json_dumps
+
+# Kept out of old/new values; changes to these are recorded by the patch only
+_UNSUMMARIZED_FIELDS = {"knowledge_graph"}
+# Bookkeeping columns that are not part of the audited state; the pipeline
+# flags are set by workers without an audit of their own
+_UNAUDITED_COLUMNS = {
+    "audit_version",
+    "is_vectorized",
+    "is_graph_extracted",
+    "vectorize_error",
+}
+
+
+def audit_state(values: dict) -> dict:
+    """A document's column values in the JSON form audits store and diff."""
+    return json.loads(
+        json_dumps(
+            {
+                key: value
+                for key, value in values.items()
+                if key not in _UNAUDITED_COLUMNS
+            }
+        )
+    )
+
+
+def document_state(document: Document) -> dict:
+    """`audit_state` of a loaded document."""
+    return audit_state(
+        {
+            column.name: getattr(document, column.name)
+            for column in Document.__table__.columns
+        }
+    )
+
 
 _UUID_PATTERN = re.compile(
     r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
@@ -58,13 +112,18 @@ class DocumentService:
         return StorageService(self.db)._file_to_response(file)
 
     def _document_to_response(self, document: Document) -> DocumentResponse:
-        """Convert a Document model instance to a DocumentResponse schema."""
+        """Convert a Document model instance to a DocumentResponse schema.
+
+        Columns deferred by a listing query are returned as None rather than
+        loaded one row at a time.
+        """
 
+        unloaded = inspect(document).unloaded
         user_info = self._user_to_user_info(document.user) if document.user else None
         file_response = self._file_to_file_response(document.file)
 
         kg = None
-        if getattr(document, "knowledge_graph", None):
+        if "knowledge_graph" not in unloaded and document.knowledge_graph:
             if isinstance(document.knowledge_graph, dict):
                 if (
                     "nodes" in document.knowledge_graph
@@ -105,13 +164,36 @@ class DocumentService:
             file=file_response,
             title=document.title,
             description=document.description,
-            summary=document.summary,
+            summary=None if "summary" in unloaded else document.summary,
             is_vectorized=document.is_vectorized,
             is_graph_extracted=document.is_graph_extracted,
+            vectorize_error=document.vectorize_error,
             knowledge_graph=kg,
             tags=tags,
         )
 
+    @staticmethod
+    def _listing_options(include: Optional[Iterable[DocumentIncludeEnum]] = None):
+        """Loader options for queries returning many documents.
+
+        Many-to-one relations are joined, but tags are fetched with one
+        SELECT ... IN per page instead of multiplying the joined rows.
+        Collection is not loaded because the response does not use it.
+        Heavy columns stay deferred unless named in `include`, and touching
+        them raises instead of lazily loading per row.
+        """
+        include = set(include or ())
+        options = [
+            joinedload(Document.user),
+            joinedload(Document.file).joinedload(File.uploader),
+            selectinload(Document.document_tags).joinedload(DocumentTag.tag),
+        ]
+        if DocumentIncludeEnum.KNOWLEDGE_GRAPH not in include:
+            options.append(defer(Document.knowledge_graph, raiseload=True))
+        if DocumentIncludeEnum.SUMMARY not in include:
+            options.append(defer(Document.summary, raiseload=True))
+        return options
+
     def create_document(
         self, document_create: DocumentCreateRequest
     ) -> DocumentResponse:
@@ -123,23 +205,9 @@ class DocumentService:
         if not file_exists:
             raise ValueError(f"File with id {document_create.file_id} not found")
 
-        if document_create.user_id:
-            user_exists = (
-                self.db.query(User).filter(User.id == document_create.user_id).first()
-            )
-            if not user_exists:
-                raise ValueError(f"User with id {document_create.user_id} not found")
-
-        if hasattr(document_create, "collection_id") and document_create.collection_id:
-            collection_exists = (
-                self.db.query(Collection)
-                .filter(Collection.id == document_create.collection_id)
-                .first()
-            )
-            if not collection_exists:
-                raise ValueError(
-                    f"Collection with id {document_create.collection_id} not found"
-                )
+        self.validate_owner_and_collection(
+            document_create.user_id, document_create.collection_id
+        )
 
         try:
             doc_data = document_create.model_dump(exclude_unset=True)
@@ -147,14 +215,10 @@ class DocumentService:
             self.db.add(document)
             self.db.flush()
 
-            self.audit.create_audit(
-                document_id=str(document.id),
-                action=DocumentActionEnum.CREATE,
-                user_id=str(document_create.user_id)
-                if document_create.user_id
-                else None,
-                old_values=None,
-                new_values=doc_data,
+            self.audit.record(
+                document,
+                DocumentActionEnum.CREATE,
+                user_id=document_create.user_id,
             )
 
             self.db.commit()
@@ -177,32 +241,155 @@ class DocumentService:
             self.db.rollback()
             raise ValueError(f"Database integrity error: {str(e)}")
 
+    def validate_owner_and_collection(
+        self, user_id: Optional[UUID], collection_id: Optional[UUID]
+    ) -> None:
+        """Ensure the referenced user and collection exist, if given."""
+        if user_id:
+            user_exists = self.db.query(User.id).filter(User.id == user_id).first()
+            if not user_exists:
+                raise ValueError(f"User with id {user_id} not found")
+
+        if collection_id:
+            collection_exists = (
+                self.db.query(Collection.id)
+                .filter(Collection.id == collection_id)
+                .first()
+            )
+            if not collection_exists:
+                raise ValueError(f"Collection with id {collection_id} not found")
+
+    def bulk_create_documents(
+        self,
+        user_id: Optional[UUID],
+        collection_id: Optional[UUID],
+        file_values: List[dict],
+    ) -> List[DocumentResponse]:
+        """Create one File, Document and audit row per entry in a single transaction.
+
+        Each table receives one multi-row INSERT. The caller is expected to have
+        already run `validate_owner_and_collection`; responses are returned in
+        the same order as `file_values`.
+        """
+        if not file_values:
+            return []
+
+        file_rows = []
+        document_rows = []
+        audit_rows = []
+        document_ids = []
+        for values in file_values:
+            file_id = uuid.uuid4()
+            document_id = uuid.uuid4()
+            document_ids.append(document_id)
+            doc_data = {
+                "user_id": user_id,
+                "collection_id": collection_id,
+                "file_id": file_id,
+                "title": None,
+                "description": None,
+                "summary": None,
+            }
+            file_rows.append({"id": file_id, **values})
+            document_row = {
+                "id": document_id,
+                **doc_data,
+                "is_vectorized": False,
+                "is_graph_extracted": False,
+                "knowledge_graph": None,
+                "audit_version": 1,
+            }
+            document_rows.append(document_row)
+            audit_rows.append(
+                self.audit.build_audit_values(
+                    document_id=document_id,
+                    action=DocumentActionEnum.CREATE,
+                    version=1,
+                    user_id=user_id,
+                    new_state=audit_state(document_row),
+                )
+            )
+
+        try:
+            self.db.execute(insert(File).values(file_rows))
+            self.db.execute(insert(Document).values(document_rows))
+            self.audit.bulk_create_audits(audit_rows)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+        return self.get_documents_by_ids(document_ids)
+
+    def get_documents_by_ids(self, document_ids: List[UUID]) -> List[DocumentResponse]:
+        """Retrieve several documents in one query, preserving the given order."""
+        documents = (
+            self.db.query(Document)
+            .options(*self._listing_options(include=DocumentIncludeEnum))
+            .filter(Document.id.in_(document_ids))
+            .all()
+        )
+        by_id = {document.id: document for document in documents}
+
+        return [
+            self._document_to_response(by_id[document_id])
+            for document_id in document_ids
+            if document_id in by_id
+        ]
+
+    @replica_read
+    def get_document_audits(
+        self,
+        document_id: str,
+        limit: int = DEFAULT_AUDIT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[DocumentAudit], Optional[str]]:
+        """Retrieve a page of an existing document's audits, newest first.
+
+        Raises:
+            InvalidCursorError: If `cursor` is malformed.
+            ValueError: If the document does not exist.
+        """
+        document_exists = (
+            self.db.query(Document.id).filter(Document.id == document_id).first()
+        )
+        if not document_exists:
+            raise ValueError(f"Document with id {document_id} not found")
+
+        return self.audit.get_audits_for_document(document_id, limit, cursor)
+
+    @replica_read
+    def get_document_state_at(
+        self, document_id: str, audit_id: str
+    ) -> Tuple[DocumentAudit, dict]:
+        """Rebuild a document's state as recorded by one of its audits.
+
+        Raises:
+            ValueError: If the audit does not exist or its history is incomplete.
+        """
+        return self.audit.get_state_at(document_id, audit_id)
+
     def delete_document(self, document_id: str, user_id: Optional[str] = None) -> None:
         """Delete a document by ID, audit the deletion, and commit the transaction."""
 
-        document = self.db.query(Document).filter(Document.id == document_id).first()
+        document = (
+            self.db.query(Document)
+            .filter(Document.id == document_id)
+            .with_for_update()
+            .first()
+        )
         if not document:
             raise ValueError(f"Document with id {document_id} not found")
 
-        # Prepare old values for audit
-        old_values = {
-            c.name: getattr(document, c.name) for c in document.__table__.columns
-        }
-
         # Audit the deletion BEFORE removing the document
-        self.audit.create_audit(
-            document_id=str(document_id),
-            action=DocumentActionEnum.DELETE,
-            user_id=str(user_id) if user_id else None,
-            old_values=old_values,
-            new_values=None,
-        )
+        self.audit.record(document, DocumentActionEnum.DELETE, user_id=user_id)
 
         # Now remove the document
         self.db.delete(document)
 
         self.db.commit()
 
+    @replica_read
     def get_document(self, document_id: str) -> DocumentResponse:
         """Retrieve a document by ID and return response schema with user display and file info."""
         document = (
@@ -221,16 +408,15 @@ class DocumentService:
 
         return self._document_to_response(document)
 
-    def get_documents_by_collection(self, collection_id: str) -> List[DocumentResponse]:
+    def get_documents_by_collection(
+        self,
+        collection_id: str,
+        include: Optional[Iterable[DocumentIncludeEnum]] = None,
+    ) -> List[DocumentResponse]:
         """Retrieve all documents for a specific collection."""
         documents = (
             self.db.query(Document)
-            .options(
-                joinedload(Document.user),
-                joinedload(Document.file),
-                joinedload(Document.collection),
-                joinedload(Document.document_tags).joinedload(DocumentTag.tag),
-            )
+            .options(*self._listing_options(include))
             .filter(Document.collection_id == collection_id)
             .all()
         )
@@ -241,45 +427,73 @@ class DocumentService:
 
         return result
 
+    @replica_read
     def get_documents_by_collection_paginated(
-        self, collection_id: str, page: int = 1, per_page: int = 10
+        self,
+        collection_id: str,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.COUNTER,
+        include: Optional[Iterable[DocumentIncludeEnum]] = None,
     ) -> PaginatedDocumentResponse:
-        """Retrieve documents for a specific collection with pagination support."""
+        """Retrieve documents for a specific collection with pagination support.
+
+        Documents are ordered by (title, id). With a `cursor` from a previous
+        response the page is found by seeking past that key on
+        ix_document_collection_title_id, so any page costs the same as the
+        first; `page` then only labels the response. Without a cursor, `page`
+        falls back to OFFSET for older clients. `count_strategy` picks how
+        `total` is computed, see `count_collection_documents`. `summary` and
+        `knowledge_graph` are only returned when listed in `include`.
+
+        Raises:
+            InvalidCursorError: If `cursor` is malformed.
+            ValueError: If the collection does not exist.
+        """
 
         # Validate page and per_page parameters
         page = max(1, page)
         per_page = max(1, min(per_page, 100))  # Limit max per_page to 100
-        offset = (page - 1) * per_page
 
         # Verify collection exists
-        collection_exists = (
+        collection = (
             self.db.query(Collection).filter(Collection.id == collection_id).first()
         )
-        if not collection_exists:
+        if not collection:
             raise ValueError(f"Collection with id {collection_id} not found")
 
         # Get total count for pagination metadata
-        total_count = (
+        if count_strategy == CountStrategyEnum.COUNTER:
+            total_count = collection.document_count
+        else:
+            total_count = self.count_collection_documents(collection_id, count_strategy)
+
+        query = (
             self.db.query(Document)
+            .options(*self._listing_options(include))
             .filter(Document.collection_id == collection_id)
-            .count()
         )
+        if cursor:
+            after_title, after_id = decode_cursor(cursor, 2)
+            try:
+                after_id = UUID(after_id)
+            except ValueError:
+                raise InvalidCursorError("Invalid pagination cursor")
+            query = query.filter(
+                tuple_(document_title_sort_key, Document.id) > (after_title, after_id)
+            )
+        else:
+            query = query.offset((page - 1) * per_page)
 
-        # Get paginated documents
+        # Fetch one extra row to know whether another page follows
         documents = (
-            self.db.query(Document)
-            .options(
-                joinedload(Document.user),
-                joinedload(Document.file),
-                joinedload(Document.collection),
-                joinedload(Document.document_tags).joinedload(DocumentTag.tag),
-            )
-            .filter(Document.collection_id == collection_id)
-            .order_by(Document.title.asc())  # Default ordering by title
-            .limit(per_page)
-            .offset(offset)
+            query.order_by(document_title_sort_key.asc(), Document.id.asc())
+            .limit(per_page + 1)
             .all()
         )
+        has_more = len(documents) > per_page
+        documents = documents[:per_page]
 
         # Convert to response schemas
         document_responses = []
@@ -289,14 +503,46 @@ class DocumentService:
         # Calculate total pages
         total_pages = math.ceil(total_count / per_page) if total_count > 0 else 0
 
+        next_cursor = None
+        if has_more:
+            last = documents[-1]
+            next_cursor = encode_cursor(last.title or "", last.id)
+
         return PaginatedDocumentResponse(
             documents=document_responses,
             total=total_count,
             page=page,
             per_page=per_page,
             total_pages=total_pages,
+            next_cursor=next_cursor,
+            count_strategy=count_strategy,
         )
 
+    def count_collection_documents(
+        self,
+        collection_id: str,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.COUNTER,
+    ) -> int:
+        """Count the documents in a collection.
+
+        EXACT runs count(*), ESTIMATED uses the planner's row estimate, and
+        COUNTER reads `Collection.document_count`, which triggers on the
+        document table keep in step with every insert, delete and move.
+        """
+        if count_strategy == CountStrategyEnum.COUNTER:
+            count = self.db.execute(
+                select(Collection.document_count).where(Collection.id == collection_id)
+            ).scalar()
+            return count or 0
+
+        statement = select(Document.id).where(Document.collection_id == collection_id)
+        if count_strategy == CountStrategyEnum.ESTIMATED:
+            return estimate_count(self.db, statement)
+
+        return self.db.execute(
+            select(func.count()).select_from(statement.subquery())
+        ).scalar_one()
+
     def update_document(
         self,
         document_id: str,
@@ -304,14 +550,17 @@ class DocumentService:
         user_id: Optional[str] = None,
     ) -> DocumentResponse:
         """Update document details (title, description, summary)."""
-        document = self.db.query(Document).filter(Document.id == document_id).first()
+        document = (
+            self.db.query(Document)
+            .filter(Document.id == document_id)
+            .with_for_update()
+            .first()
+        )
         if not document:
             raise ValueError(f"Document with id {document_id} not found")
 
-        # Prepare old values for audit
-        old_values = {
-            c.name: getattr(document, c.name) for c in document.__table__.columns
-        }
+        # Prepare old state for audit
+        old_state = document_state(document)
 
         # Update the document fields
         if document_update.title is not None:
@@ -321,18 +570,9 @@ class DocumentService:
         if document_update.summary is not None:
             document.summary = document_update.summary
 
-        # Prepare new values for audit
-        new_values = {
-            c.name: getattr(document, c.name) for c in document.__table__.columns
-        }
-
         # Audit the update
-        self.audit.create_audit(
-            document_id=str(document_id),
-            action=DocumentActionEnum.UPDATE,
-            user_id=str(user_id) if user_id else None,
-            old_values=old_values,
-            new_values=new_values,
+        self.audit.record(
+            document, DocumentActionEnum.UPDATE, user_id=user_id, old_state=old_state
         )
 
         self.db.commit()
@@ -346,7 +586,12 @@ class DocumentService:
         user_id: Optional[str] = None,
     ) -> DocumentResponse:
         """Update the collection assignment for a document."""
-        document = self.db.query(Document).filter(Document.id == document_id).first()
+        document = (
+            self.db.query(Document)
+            .filter(Document.id == document_id)
+            .with_for_update()
+            .first()
+        )
         if not document:
             raise ValueError(f"Document with id {document_id} not found")
 
@@ -358,26 +603,15 @@ class DocumentService:
             if not collection_exists:
                 raise ValueError(f"Collection with id {collection_id} not found")
 
-        # Prepare old values for audit
-        old_values = {
-            c.name: getattr(document, c.name) for c in document.__table__.columns
-        }
+        # Prepare old state for audit
+        old_state = document_state(document)
 
         # Update the collection
         document.collection_id = collection_id
 
-        # Prepare new values for audit
-        new_values = {
-            c.name: getattr(document, c.name) for c in document.__table__.columns
-        }
-
         # Audit the update
-        self.audit.create_audit(
-            document_id=str(document_id),
-            action=DocumentActionEnum.UPDATE,
-            user_id=str(user_id) if user_id else None,
-            old_values=old_values,
-            new_values=new_values,
+        self.audit.record(
+            document, DocumentActionEnum.UPDATE, user_id=user_id, old_state=old_state
         )
 
         self.db.commit()
@@ -396,16 +630,13 @@ class DocumentService:
         """Move a document to a different collection."""
         return self.update_document_collection(document_id, collection_id, user_id)
 
-    def get_documents_without_collection(self) -> List[DocumentResponse]:
+    def get_documents_without_collection(
+        self, include: Optional[Iterable[DocumentIncludeEnum]] = None
+    ) -> List[DocumentResponse]:
         """Retrieve all documents that are not assigned to any collection."""
         documents = (
             self.db.query(Document)
-            .options(
-                joinedload(Document.user),
-                joinedload(Document.file),
-                joinedload(Document.collection),
-                joinedload(Document.document_tags).joinedload(DocumentTag.tag),
-            )
+            .options(*self._listing_options(include))
             .filter(Document.collection_id.is_(None))
             .all()
         )
@@ -753,55 +984,222 @@ class DocumentService:
 
 
 class DocumentAuditService:
-    @staticmethod
-    def _stringify_uuids(obj):
-        """Recursively convert UUIDs in dicts/lists to strings for JSON serialization."""
-
-        if isinstance(obj, dict):
-            return {k: DocumentAuditService._stringify_uuids(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [DocumentAuditService._stringify_uuids(i) for i in obj]
-        elif isinstance(obj, UUID):
-            return str(obj)
-        else:
-            return obj
-
     """Service for handling document audits."""
 
     def __init__(self, db: Session):
         self.db = db
 
+    def record(
+        self,
+        document: Document,
+        action: DocumentActionEnum,
+        user_id=None,
+        old_state: Optional[dict] = None,
+    ) -> DocumentAudit:
+        """Audit `action` on `document` as its next version.
+
+        For UPDATE, `old_state` is `document_state(document)` taken before
+        the change. The caller should hold the document's row lock so that
+        versions are not handed out twice.
+        """
+
+        document.audit_version = (document.audit_version or 0) + 1
+        state = document_state(document)
+        return self.create_audit(
+            document_id=document.id,
+            action=action,
+            version=document.audit_version,
+            user_id=user_id,
+            old_state=state if action == DocumentActionEnum.DELETE else old_state,
+            new_state=None if action == DocumentActionEnum.DELETE else state,
+        )
+
     def create_audit(
         self,
-        document_id: str,
+        document_id,
         action: DocumentActionEnum,
-        user_id: Optional[str] = None,
-        old_values: Optional[dict] = None,
-        new_values: Optional[dict] = None,
+        version: int,
+        user_id=None,
+        old_state: Optional[dict] = None,
+        new_state: Optional[dict] = None,
     ) -> DocumentAudit:
-        """Create a new audit record for a document action."""
+        """Create a new audit record for a document action.
 
-        audit = DocumentAudit(
-            id=uuid.uuid4(),
-            document_id=UUID(document_id)
-            if isinstance(document_id, str)
-            else document_id,
-            user_id=UUID(user_id) if user_id and isinstance(user_id, str) else None,
-            old_values=self._stringify_uuids(old_values) if old_values else None,
-            new_values=self._stringify_uuids(new_values) if new_values else None,
-            action_type=action,
-            timestamp=datetime.now(timezone.utc),
+        With the audit writer enabled the row is queued until the session
+        commits and the returned audit is not added to the session.
+        """
+
+        values = self.build_audit_values(
+            document_id=document_id,
+            action=action,
+            version=version,
+            user_id=user_id,
+            old_state=old_state,
+            new_state=new_state,
         )
-        self.db.add(audit)
+        audit = DocumentAudit(**values)
+        if not audit_writer.add(self.db, DocumentAudit.__table__, [values]):
+            self.db.add(audit)
         # Don't commit here - let the calling service handle the transaction
         return audit
 
-    def get_audits_for_document(self, document_id: str) -> List[DocumentAudit]:
-        """Retrieve all audit records for a given document."""
+    def build_audit_values(
+        self,
+        document_id,
+        action: DocumentActionEnum,
+        version: int,
+        user_id=None,
+        old_state: Optional[dict] = None,
+        new_state: Optional[dict] = None,
+    ) -> dict:
+        """Column values for an audit row; accepts ids as strings or UUIDs.
+
+        States are `audit_state` dicts from before and after the action.
+        The row keeps a patch between them, the full new state when it
+        starts the history or falls on the snapshot interval, and the
+        changed fields other than the knowledge graph as old/new values.
+        Version 1 always starts the history, including for documents created
+        before versioning that had no audits to seed a snapshot on.
+        """
+
+        patch = None
+        if old_state is not None and new_state is not None:
+            patch = make_patch(old_state, new_state)
+
+        snapshot = None
+        interval = get_settings().AUDIT_SNAPSHOT_INTERVAL
+        if new_state is not None and (
+            old_state is None
+            or version == 1
+            or interval <= 1
+            or version % interval == 0
+        ):
+            snapshot = new_state
+
+        changed = [
+            key
+            for key in (new_state or old_state or {})
+            if key not in _UNSUMMARIZED_FIELDS
+            and (
+                old_state is None
+                or new_state is None
+                or old_state.get(key) != new_state.get(key)
+            )
+        ]
+
+        return {
+            "id": uuid.uuid4(),
+            "document_id": UUID(document_id)
+            if isinstance(document_id, str)
+            else document_id,
+            "user_id": UUID(user_id)
+            if user_id and isinstance(user_id, str)
+            else user_id,
+            "old_values": {key: old_state[key] for key in changed}
+            if old_state
+            else None,
+            "new_values": {key: new_state[key] for key in changed}
+            if new_state
+            else None,
+            "action_type": action,
+            "version": version,
+            "patch": patch,
+            "snapshot": snapshot,
+            "timestamp": datetime.now(timezone.utc),
+        }
+
+    def bulk_create_audits(self, audit_values: List[dict]) -> None:
+        """Insert many audit rows with a single multi-row INSERT."""
+
+        if audit_values and not audit_writer.add(
+            self.db, DocumentAudit.__table__, audit_values
+        ):
+            self.db.execute(insert(DocumentAudit).values(audit_values))
+
+    def get_audits_for_document(
+        self,
+        document_id: str,
+        limit: int = DEFAULT_AUDIT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[DocumentAudit], Optional[str]]:
+        """Retrieve a page of audit records for a document and the next cursor."""
+
+        return audit_page(
+            self.db.query(DocumentAudit).filter(
+                DocumentAudit.document_id == document_id
+            ),
+            DocumentAudit.timestamp,
+            DocumentAudit.id,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    def get_state_at(
+        self, document_id: str, audit_id: str
+    ) -> Tuple[DocumentAudit, dict]:
+        """Return an audit and the document state as of that audit.
+
+        The state is the nearest snapshot at or before the audit with every
+        later patch up to the audit applied, without unaudited columns. A
+        DELETE audit yields the state the document was deleted in.
 
-        return (
+        Raises:
+            ValueError: If the audit does not exist or its history is incomplete.
+        """
+
+        audit = (
             self.db.query(DocumentAudit)
-            .filter(DocumentAudit.document_id == document_id)
-            .order_by(DocumentAudit.timestamp.desc())
+            .filter(
+                DocumentAudit.document_id == document_id,
+                DocumentAudit.id == audit_id,
+            )
+            .first()
+        )
+        if not audit:
+            raise ValueError(f"Audit with id {audit_id} not found")
+
+        version = audit.version
+        if version is None:
+            raise ValueError(f"No snapshot precedes audit {audit_id}")
+
+        base = (
+            self.db.query(DocumentAudit.version, DocumentAudit.snapshot)
+            .filter(
+                DocumentAudit.document_id == document_id,
+                DocumentAudit.version <= version,
+                DocumentAudit.snapshot.isnot(None),
+            )
+            .order_by(DocumentAudit.version.desc())
+            .first()
+        )
+        if base is None:
+            raise ValueError(f"No snapshot precedes audit {audit_id}")
+
+        steps = (
+            self.db.query(DocumentAudit.version, DocumentAudit.patch)
+            .filter(
+                DocumentAudit.document_id == document_id,
+                DocumentAudit.version > base.version,
+                DocumentAudit.version <= version,
+            )
+            .order_by(DocumentAudit.version)
             .all()
         )
+        if [step.version for step in steps] != list(
+            range(base.version + 1, version + 1)
+        ):
+            raise ValueError(f"Audit history before audit {audit_id} is incomplete")
+
+        ops = [op for step in steps for op in step.patch or []]
+        state = apply_patch(base.snapshot, ops)
+        # Older snapshots and patches still carry columns since dropped from
+        # audits; strip them after patching, as those patches may touch them
+        return audit, {
+            key: value for key, value in state.items() if key not in _UNAUDITED_COLUMNS
+        }
+
+
+class AsyncDocumentService(AsyncService[DocumentService]):
+    """DocumentService on an AsyncSession."""
+
+    service_class = DocumentService
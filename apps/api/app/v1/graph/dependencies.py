@@ -0,0 +1,11 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from .service import AsyncGraphService
+from ...db import get_async_db
+
+
+def get_async_graph_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncGraphService:
+    """Get async graph service instance."""
+    return AsyncGraphService(db)
@@ -0,0 +1,195 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Literal, Optional
+
+from .schemas import (
+    CollectionGraphPage,
+    GraphCentrality,
+    GraphCommunities,
+    GraphNodeMatch,
+    GraphSample,
+)
+from .service import (
+    AsyncGraphService,
+    CentralityMetric,
+    MAX_NEIGHBOURHOOD_DEPTH,
+    MAX_PATH_DEPTH,
+)
+from .dependencies import get_async_graph_service
+from ..collection.dependencies import has_permission
+from ..models.enum import CollectionPermissionEnum
+from ..models.user import User
+from ..schemas.graph import KnowledgeGraph
+from ..user.dependencies import get_current_user
+from ...utils.pagination import InvalidCursorError
+
+
+router = APIRouter(tags=["graph"])
+
+
+@router.get(
+    "/collections/{collection_id}/graph",
+    response_model=CollectionGraphPage,
+    status_code=status.HTTP_200_OK,
+)
+async def get_collection_graph(
+    collection_id: str,
+    limit: int = Query(1000, ge=1, le=5000, description="Nodes per page"),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` of the previous page"
+    ),
+    _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
+    current_user: User = Depends(get_current_user),
+    graph_service: AsyncGraphService = Depends(get_async_graph_service),
+) -> CollectionGraphPage:
+    """Get a page of the collection's knowledge graph, merged across documents by label."""
+
+    try:
+        return await graph_service.get_collection_graph(
+            collection_id=collection_id, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get(
+    "/collections/{collection_id}/graph/centrality",
+    response_model=GraphCentrality,
+    status_code=status.HTTP_200_OK,
+)
+async def get_graph_centrality(
+    collection_id: str,
+    metric: CentralityMetric = Query("pagerank", description="Score to rank by"),
+    limit: int = Query(100, ge=1, le=5000),
+    _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
+    current_user: User = Depends(get_current_user),
+    graph_service: AsyncGraphService = Depends(get_async_graph_service),
+) -> GraphCentrality:
+    """Get the most central nodes of the collection's knowledge graph."""
+
+    try:
+        return await graph_service.get_centrality(
+            collection_id=collection_id, metric=metric, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get(
+    "/collections/{collection_id}/graph/communities",
+    response_model=GraphCommunities,
+    status_code=status.HTTP_200_OK,
+)
+async def get_graph_communities(
+    collection_id: str,
+    limit: int = Query(50, ge=1, le=1000),
+    _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
+    current_user: User = Depends(get_current_user),
+    graph_service: AsyncGraphService = Depends(get_async_graph_service),
+) -> GraphCommunities:
+    """Get the largest communities of the collection's knowledge graph."""
+
+    try:
+        return await graph_service.get_communities(
+            collection_id=collection_id, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get(
+    "/collections/{collection_id}/graph/sample",
+    response_model=GraphSample,
+    status_code=status.HTTP_200_OK,
+)
+async def sample_collection_graph(
+    collection_id: str,
+    top: int = Query(200, ge=1, le=2000, description="Nodes to keep"),
+    metric: CentralityMetric = Query("pagerank", description="Score to rank by"),
+    _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
+    current_user: User = Depends(get_current_user),
+    graph_service: AsyncGraphService = Depends(get_async_graph_service),
+) -> GraphSample:
+    """Get the collection's most important nodes and the edges among them, ready to render."""
+
+    try:
+        return await graph_service.sample_collection_graph(
+            collection_id=collection_id, top=top, metric=metric
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get(
+    "/collections/{collection_id}/graph/nodes",
+    response_model=List[GraphNodeMatch],
+    status_code=status.HTTP_200_OK,
+)
+async def find_graph_nodes(
+    collection_id: str,
+    label: str = Query(..., min_length=1, description="Node label to look up"),
+    match: Literal["exact", "contains"] = Query(
+        "exact", description="'exact' ignores case; 'contains' matches substrings"
+    ),
+    limit: int = Query(50, ge=1, le=500),
+    _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
+    current_user: User = Depends(get_current_user),
+    graph_service: AsyncGraphService = Depends(get_async_graph_service),
+) -> List[GraphNodeMatch]:
+    """Find the documents of a collection whose knowledge graph has a node with this label."""
+
+    return await graph_service.find_nodes(
+        collection_id=collection_id, label=label, match=match, limit=limit
+    )
+
+
+@router.get(
+    "/documents/{document_id}/graph/neighbourhood",
+    response_model=KnowledgeGraph,
+    status_code=status.HTTP_200_OK,
+)
+async def get_graph_neighbourhood(
+    document_id: str,
+    node_id: str = Query(..., description="Node to start from"),
+    depth: int = Query(1, ge=1, le=MAX_NEIGHBOURHOOD_DEPTH),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum nodes returned"),
+    current_user: User = Depends(get_current_user),
+    graph_service: AsyncGraphService = Depends(get_async_graph_service),
+) -> KnowledgeGraph:
+    """Get the part of a document's knowledge graph within `depth` hops of a node."""
+
+    try:
+        return await graph_service.get_neighbourhood(
+            document_id=document_id, node_id=node_id, depth=depth, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get(
+    "/documents/{document_id}/graph/path",
+    response_model=KnowledgeGraph,
+    status_code=status.HTTP_200_OK,
+)
+async def get_graph_path(
+    document_id: str,
+    source: str = Query(..., description="Node the path starts at"),
+    target: str = Query(..., description="Node the path ends at"),
+    max_depth: int = Query(6, ge=1, le=MAX_PATH_DEPTH),
+    current_user: User = Depends(get_current_user),
+    graph_service: AsyncGraphService = Depends(get_async_graph_service),
+) -> KnowledgeGraph:
+    """Get a shortest path between two nodes of a document's knowledge graph."""
+
+    try:
+        path = await graph_service.find_shortest_path(
+            document_id=document_id, source=source, target=target, max_depth=max_depth
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No path from {source} to {target} within {max_depth} hops",
+        )
+    return path
@@ -0,0 +1,67 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+
+from ..schemas.graph import EdgeSchema, NodeSchema
+
+
+class GraphNodeMatch(BaseModel):
+    document_id: UUID
+    document_title: Optional[str] = None
+    node_id: str
+    label: str
+
+
+class CollectionGraphNode(NodeSchema):
+    document_count: int = Field(..., description="Documents with this node")
+
+
+class CollectionGraphEdge(EdgeSchema):
+    document_count: int = Field(..., description="Documents with this edge")
+
+
+class CollectionGraphPage(BaseModel):
+    nodes: List[CollectionGraphNode]
+    edges: List[CollectionGraphEdge] = Field(
+        ..., description="Edges whose source is one of this page's nodes"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page"
+    )
+
+
+class GraphNodeScore(NodeSchema):
+    degree: int = Field(..., description="Edges touching this node")
+    pagerank: float = Field(..., description="PageRank, summing to 1 over the graph")
+    community: int = Field(..., description="Community id; 0 is the largest")
+
+
+class GraphCentrality(BaseModel):
+    graph_version: int
+    metric: str
+    total_nodes: int
+    nodes: List[GraphNodeScore] = Field(..., description="Highest scoring first")
+
+
+class GraphCommunity(BaseModel):
+    id: int
+    size: int
+    top_labels: List[str] = Field(
+        ..., description="Labels of its top nodes by PageRank"
+    )
+
+
+class GraphCommunities(BaseModel):
+    graph_version: int
+    total_communities: int
+    communities: List[GraphCommunity] = Field(..., description="Largest first")
+
+
+class GraphSample(BaseModel):
+    graph_version: int
+    total_nodes: int
+    total_edges: int
+    nodes: List[GraphNodeScore]
+    edges: List[CollectionGraphEdge] = Field(
+        ..., description="Edges between the sampled nodes"
+    )
@@ -0,0 +1,499 @@
+"""Knowledge graph queries that run in SQL over kg_node and kg_edge."""
+
+from typing import List, Literal, Optional
+
+import numpy as np
+from sqlalchemy import func, or_, select, text, tuple_
+from sqlalchemy.orm import Session
+
+from ...config import get_settings
+from ...utils.async_service import AsyncService
+from ...utils.cache import TTLCache
+from ...utils.pagination import decode_cursor, encode_cursor
+from ...utils.replica import replica_read
+from ..models.collection import Collection
+from ..models.document import Document
+from ..models.graph import (
+    CollectionGraphEdge,
+    CollectionGraphNode,
+    KnowledgeGraphEdge,
+    KnowledgeGraphNode,
+)
+from ..schemas.graph import KnowledgeGraph
+from .analytics import GraphAnalytics, analyze_graph
+from .schemas import (
+    CollectionGraphPage,
+    GraphCentrality,
+    GraphCommunities,
+    GraphCommunity,
+    GraphNodeMatch,
+    GraphNodeScore,
+    GraphSample,
+)
+
+MAX_NEIGHBOURHOOD_DEPTH = 5
+MAX_PATH_DEPTH = 10
+COMMUNITY_TOP_LABELS = 5
+
+CentralityMetric = Literal["pagerank", "degree"]
+
+# (collection_id, graph_version) -> analytics of that version of its graph
+analytics_cache: TTLCache[tuple[str, int], GraphAnalytics] = TTLCache(
+    "graph.analytics",
+    max_size=get_settings().GRAPH_ANALYTICS_CACHE_MAX_SIZE,
+    ttl_seconds=get_settings().GRAPH_ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+# Nodes adjacent to `{nodes}` in either direction, within one document
+_ADJACENT = """
+    SELECT edge.target_node_id AS node_id
+    FROM kg_edge AS edge
+    WHERE edge.document_id = CAST(:document_id AS uuid) AND edge.source_node_id = {nodes}
+    UNION ALL
+    SELECT edge.source_node_id
+    FROM kg_edge AS edge
+    WHERE edge.document_id = CAST(:document_id AS uuid) AND edge.target_node_id = {nodes}
+"""
+
+# Breadth-first search from :source, one row per level. Each level is
+# aggregated into an array and nodes already visited are dropped, so the
+# work grows with the nodes reached rather than the number of paths. The
+# search stops after :max_depth levels or once :target (if set) is reached.
+_BFS = f"""
+    bfs(depth, frontier, visited) AS (
+        SELECT 0, ARRAY[CAST(:source AS text)], ARRAY[CAST(:source AS text)]
+        UNION ALL
+        SELECT bfs.depth + 1, step.frontier, array_cat(bfs.visited, step.frontier)
+        FROM bfs
+        CROSS JOIN LATERAL (
+            SELECT array_agg(DISTINCT adjacent.node_id) AS frontier
+            FROM ({_ADJACENT.format(nodes="ANY(bfs.frontier)")}) AS adjacent
+            WHERE adjacent.node_id <> ALL(bfs.visited)
+        ) AS step
+        WHERE bfs.depth < :max_depth
+            AND step.frontier IS NOT NULL
+            AND (
+                CAST(:target AS text) IS NULL
+                OR CAST(:target AS text) <> ALL(bfs.visited)
+            )
+    )
+"""
+
+_NEIGHBOURHOOD = text(
+    f"""
+    WITH RECURSIVE {_BFS}
+    SELECT node.node_id, node.label, bfs.depth
+    FROM bfs
+    CROSS JOIN unnest(bfs.frontier) AS reached(node_id)
+    JOIN kg_node AS node
+        ON node.document_id = CAST(:document_id AS uuid) AND node.node_id = reached.node_id
+    ORDER BY bfs.depth, node.node_id
+    LIMIT :limit
+    """
+)
+
+# Walks back from :target one level at a time to any neighbour on the
+# previous BFS level, which yields one of the shortest paths
+_SHORTEST_PATH = text(
+    f"""
+    WITH RECURSIVE {_BFS},
+    walk(depth, node_id, nodes) AS (
+        SELECT bfs.depth, CAST(:target AS text), ARRAY[CAST(:target AS text)]
+        FROM bfs
+        WHERE CAST(:target AS text) = ANY(bfs.frontier)
+        UNION ALL
+        SELECT walk.depth - 1, step.node_id, array_prepend(step.node_id, walk.nodes)
+        FROM walk
+        CROSS JOIN LATERAL (
+            SELECT adjacent.node_id
+            FROM ({_ADJACENT.format(nodes="walk.node_id")}) AS adjacent
+            JOIN bfs
+                ON bfs.depth = walk.depth - 1
+                AND adjacent.node_id = ANY(bfs.frontier)
+            LIMIT 1
+        ) AS step
+        WHERE walk.depth > 0
+    )
+    SELECT nodes FROM walk WHERE depth = 0
+    """
+)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class GraphService:
+    """Service for querying the normalized knowledge graph tables."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @replica_read
+    def find_nodes(
+        self,
+        collection_id: str,
+        label: str,
+        match: Literal["exact", "contains"] = "exact",
+        limit: int = 50,
+    ) -> List[GraphNodeMatch]:
+        """Find nodes by label across a collection's documents.
+
+        `exact` compares case-insensitively through ix_kg_node_label_lower;
+        `contains` is a substring match served by the trigram index.
+        """
+        if match == "exact":
+            condition = func.lower(KnowledgeGraphNode.label) == label.lower()
+        else:
+            condition = KnowledgeGraphNode.label.ilike(
+                f"%{_escape_like(label)}%", escape="\\"
+            )
+
+        rows = self.db.execute(
+            select(
+                KnowledgeGraphNode.document_id,
+                Document.title,
+                KnowledgeGraphNode.node_id,
+                KnowledgeGraphNode.label,
+            )
+            .join(Document, Document.id == KnowledgeGraphNode.document_id)
+            .where(Document.collection_id == collection_id, condition)
+            .order_by(KnowledgeGraphNode.label, KnowledgeGraphNode.document_id)
+            .limit(limit)
+        ).all()
+        return [
+            GraphNodeMatch(
+                document_id=row.document_id,
+                document_title=row.title,
+                node_id=row.node_id,
+                label=row.label,
+            )
+            for row in rows
+        ]
+
+    @replica_read
+    def get_neighbourhood(
+        self, document_id: str, node_id: str, depth: int = 1, limit: int = 500
+    ) -> KnowledgeGraph:
+        """Nodes within `depth` hops of a node, nearest first, and the edges among them.
+
+        Raises:
+            ValueError: If the document's graph has no such node.
+        """
+        self._require_node(document_id, node_id)
+        rows = self.db.execute(
+            _NEIGHBOURHOOD,
+            {
+                "document_id": document_id,
+                "source": node_id,
+                "target": None,
+                "max_depth": min(depth, MAX_NEIGHBOURHOOD_DEPTH),
+                "limit": limit,
+            },
+        ).all()
+
+        node_ids = [row.node_id for row in rows]
+        edges = self.db.execute(
+            select(KnowledgeGraphEdge).where(
+                KnowledgeGraphEdge.document_id == document_id,
+                KnowledgeGraphEdge.source_node_id.in_(node_ids),
+                KnowledgeGraphEdge.target_node_id.in_(node_ids),
+            )
+        ).scalars()
+        return KnowledgeGraph(
+            nodes=[{"id": row.node_id, "data": {"label": row.label}} for row in rows],
+            edges=[self._edge_to_schema(edge) for edge in edges],
+        )
+
+    @replica_read
+    def find_shortest_path(
+        self, document_id: str, source: str, target: str, max_depth: int = 6
+    ) -> Optional[KnowledgeGraph]:
+        """One shortest path between two nodes, ignoring edge direction.
+
+        Returns the path's nodes in order and one edge per hop, or None
+        when the nodes are not connected within `max_depth` hops.
+
+        Raises:
+            ValueError: If the document's graph lacks either node.
+        """
+        self._require_node(document_id, source)
+        self._require_node(document_id, target)
+        path = self.db.execute(
+            _SHORTEST_PATH,
+            {
+                "document_id": document_id,
+                "source": source,
+                "target": target,
+                "max_depth": min(max_depth, MAX_PATH_DEPTH),
+            },
+        ).scalar()
+        if path is None:
+            return None
+
+        labels = {
+            row.node_id: row.label
+            for row in self.db.execute(
+                select(KnowledgeGraphNode.node_id, KnowledgeGraphNode.label).where(
+                    KnowledgeGraphNode.document_id == document_id,
+                    KnowledgeGraphNode.node_id.in_(path),
+                )
+            )
+        }
+        hops = list(zip(path, path[1:]))
+        edges_by_hop = {}
+        if hops:
+            pair = tuple_(
+                KnowledgeGraphEdge.source_node_id, KnowledgeGraphEdge.target_node_id
+            )
+            candidates = self.db.execute(
+                select(KnowledgeGraphEdge)
+                .where(
+                    KnowledgeGraphEdge.document_id == document_id,
+                    or_(
+                        pair.in_(hops),
+                        pair.in_([(end, start) for start, end in hops]),
+                    ),
+                )
+                .order_by(KnowledgeGraphEdge.edge_id)
+            ).scalars()
+            for edge in candidates:
+                ends = frozenset((edge.source_node_id, edge.target_node_id))
+                edges_by_hop.setdefault(ends, edge)
+
+        return KnowledgeGraph(
+            nodes=[
+                {"id": node, "data": {"label": labels.get(node, node)}} for node in path
+            ],
+            edges=[
+                self._edge_to_schema(edges_by_hop[frozenset(hop)])
+                for hop in hops
+                if frozenset(hop) in edges_by_hop
+            ],
+        )
+
+    @replica_read
+    def get_collection_graph(
+        self, collection_id: str, limit: int = 1000, cursor: Optional[str] = None
+    ) -> CollectionGraphPage:
+        """A page of a collection's merged graph, ordered by node key.
+
+        Each page carries its nodes and the edges leaving them, so every
+        edge is sent exactly once across pages; its target may arrive on a
+        later page.
+
+        Raises:
+            InvalidCursorError: If `cursor` is malformed.
+        """
+        query = select(CollectionGraphNode).where(
+            CollectionGraphNode.collection_id == collection_id
+        )
+        if cursor:
+            (after_key,) = decode_cursor(cursor, 1)
+            query = query.where(CollectionGraphNode.key > after_key)
+        nodes = (
+            self.db.execute(query.order_by(CollectionGraphNode.key).limit(limit + 1))
+            .scalars()
+            .all()
+        )
+
+        next_cursor = None
+        if len(nodes) > limit:
+            nodes = nodes[:limit]
+            next_cursor = encode_cursor(nodes[-1].key)
+
+        edges = self.db.execute(
+            select(CollectionGraphEdge)
+            .where(
+                CollectionGraphEdge.collection_id == collection_id,
+                CollectionGraphEdge.source_key.in_([node.key for node in nodes]),
+            )
+            .order_by(
+                CollectionGraphEdge.source_key,
+                CollectionGraphEdge.target_key,
+                CollectionGraphEdge.label,
+            )
+        ).scalars()
+
+        return CollectionGraphPage(
+            nodes=[
+                {
+                    "id": node.key,
+                    "data": {"label": node.label},
+                    "document_count": node.document_count,
+                }
+                for node in nodes
+            ],
+            edges=[
+                {
+                    "id": f"{edge.source_key}|{edge.label}|{edge.target_key}",
+                    "data": {"label": edge.label},
+                    "source": edge.source_key,
+                    "target": edge.target_key,
+                    "document_count": edge.document_count,
+                }
+                for edge in edges
+            ],
+            next_cursor=next_cursor,
+        )
+
+    @replica_read
+    def get_centrality(
+        self,
+        collection_id: str,
+        metric: CentralityMetric = "pagerank",
+        limit: int = 100,
+    ) -> GraphCentrality:
+        """The `limit` most central nodes of a collection's merged graph.
+
+        Raises:
+            ValueError: If the collection does not exist.
+        """
+        version, analytics = self._get_analytics(collection_id)
+        return GraphCentrality(
+            graph_version=version,
+            metric=metric,
+            total_nodes=len(analytics.node_ids),
+            nodes=self._node_scores(analytics, analytics.top_nodes(metric, limit)),
+        )
+
+    @replica_read
+    def get_communities(self, collection_id: str, limit: int = 50) -> GraphCommunities:
+        """The `limit` largest communities of a collection's merged graph.
+
+        Raises:
+            ValueError: If the collection does not exist.
+        """
+        version, analytics = self._get_analytics(collection_id)
+        sizes = np.bincount(analytics.community)
+        # Nodes by community, then PageRank descending within each
+        order = np.lexsort((-analytics.pagerank, analytics.community))
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        communities = []
+        for community in range(min(limit, len(sizes))):
+            top = order[starts[community] : starts[community] + COMMUNITY_TOP_LABELS]
+            communities.append(
+                GraphCommunity(
+                    id=community,
+                    size=int(sizes[community]),
+                    top_labels=[analytics.labels[node] for node in top],
+                )
+            )
+        return GraphCommunities(
+            graph_version=version,
+            total_communities=len(sizes),
+            communities=communities,
+        )
+
+    @replica_read
+    def sample_collection_graph(
+        self, collection_id: str, top: int = 200, metric: CentralityMetric = "pagerank"
+    ) -> GraphSample:
+        """The `top` most central nodes of a collection's graph and the edges among them.
+
+        Small enough to render where the full merged graph is not.
+
+        Raises:
+            ValueError: If the collection does not exist.
+        """
+        version, analytics = self._get_analytics(collection_id)
+        nodes = analytics.top_nodes(metric, top)
+        edges = analytics.edges_within(nodes)
+        return GraphSample(
+            graph_version=version,
+            total_nodes=len(analytics.node_ids),
+            total_edges=len(analytics.edge_labels),
+            nodes=self._node_scores(analytics, nodes),
+            edges=[self._sampled_edge(analytics, edge) for edge in edges],
+        )
+
+    def _get_analytics(self, collection_id: str) -> tuple[int, GraphAnalytics]:
+        """Analytics of a collection's merged graph, cached per graph version.
+
+        The version is read before the graph, so a change committed in
+        between can only cache a newer graph under an older version, which
+        the next version then replaces.
+        """
+        version = self.db.execute(
+            select(Collection.graph_version).where(Collection.id == collection_id)
+        ).scalar()
+        if version is None:
+            raise ValueError(f"Collection {collection_id} not found")
+
+        key = (str(collection_id), version)
+        analytics = analytics_cache.get(key)
+        if analytics is None:
+            nodes = self.db.execute(
+                select(CollectionGraphNode.key, CollectionGraphNode.label)
+                .where(CollectionGraphNode.collection_id == collection_id)
+                .order_by(CollectionGraphNode.key)
+            ).all()
+            edges = self.db.execute(
+                select(
+                    CollectionGraphEdge.source_key,
+                    CollectionGraphEdge.target_key,
+                    CollectionGraphEdge.label,
+                    CollectionGraphEdge.document_count,
+                ).where(CollectionGraphEdge.collection_id == collection_id)
+            ).all()
+            analytics = analyze_graph(
+                [node.key for node in nodes],
+                [node.label for node in nodes],
+                [tuple(edge) for edge in edges],
+            )
+            analytics_cache.set(key, analytics)
+        return version, analytics
+
+    @staticmethod
+    def _node_scores(
+        analytics: GraphAnalytics, nodes: np.ndarray
+    ) -> List[GraphNodeScore]:
+        return [
+            GraphNodeScore(
+                id=analytics.node_ids[node],
+                data={"label": analytics.labels[node]},
+                degree=int(analytics.degree[node]),
+                pagerank=float(analytics.pagerank[node]),
+                community=int(analytics.community[node]),
+            )
+            for node in nodes
+        ]
+
+    @staticmethod
+    def _sampled_edge(analytics: GraphAnalytics, edge: int) -> dict:
+        source = analytics.node_ids[analytics.sources[edge]]
+        target = analytics.node_ids[analytics.targets[edge]]
+        label = analytics.edge_labels[edge]
+        return {
+            "id": f"{source}|{label}|{target}",
+            "data": {"label": label},
+            "source": source,
+            "target": target,
+            "document_count": int(analytics.weights[edge]),
+        }
+
+    def _require_node(self, document_id: str, node_id: str) -> None:
+        exists = self.db.execute(
+            select(KnowledgeGraphNode.id).where(
+                KnowledgeGraphNode.document_id == document_id,
+                KnowledgeGraphNode.node_id == node_id,
+            )
+        ).first()
+        if not exists:
+            raise ValueError(f"Node {node_id} not found in document {document_id}")
+
+    @staticmethod
+    def _edge_to_schema(edge: KnowledgeGraphEdge) -> dict:
+        return {
+            "id": edge.edge_id,
+            "data": {"label": edge.label},
+            "source": edge.source_node_id,
+            "target": edge.target_node_id,
+        }
+
+
+class AsyncGraphService(AsyncService[GraphService]):
+    """GraphService on an AsyncSession."""
+
+    service_class = GraphService
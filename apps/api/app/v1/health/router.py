@@ -1,9 +1,16 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
+from ...utils.metrics import metrics
+
 router = APIRouter()
 
 
 @router.get("/health", tags=["Health"])
 def health_check():
     return JSONResponse(content={"status": "ok"}, status_code=200)
+
+
+@router.get("/health/metrics", tags=["Health"])
+def metrics_snapshot():
+    return JSONResponse(content=metrics.snapshot(), status_code=200)
@@ -3,8 +3,14 @@
 from .base import Base
 from .user import User, Account, Session
 from .collection import Collection, CollectionAudit
-from .file import File
+from .file import File, FileBlob
 from .document import Document, DocumentAudit
+from .graph import (
+    CollectionGraphEdge,
+    CollectionGraphNode,
+    KnowledgeGraphEdge,
+    KnowledgeGraphNode,
+)
 from .enum import CollectionActionEnum, DocumentActionEnum, FileResouceEnum
 from . import knowledge_graph
 
@@ -18,8 +24,13 @@ __all__ = [
     "CollectionAudit",
     "CollectionActionEnum",
     "File",
+    "FileBlob",
     "Document",
     "DocumentAudit",
+    "KnowledgeGraphNode",
+    "KnowledgeGraphEdge",
+    "CollectionGraphNode",
+    "CollectionGraphEdge",
     "DocumentActionEnum",
     "knowledge_graph",
     "FileResouceEnum",
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import TIMESTAMP, ForeignKey, Text, Enum
+from sqlalchemy import TIMESTAMP, ForeignKey, Index, Text, Enum, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -23,6 +23,18 @@ class Collection(Base):
     title: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Maintained by the document_count triggers on the document table
+    document_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Bumped with every permission change; keys cached permission decisions
+    permission_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Bumped whenever the merged collection graph changes; keys cached analytics
+    graph_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     documents: Mapped[list["Document"]] = relationship(
         "Document", back_populates="collection", cascade="all, delete-orphan"
@@ -49,8 +61,12 @@ class CollectionAudit(Base):
     performed_by: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True), ForeignKey("user.id", ondelete="SET NULL"), nullable=True
     )
+    # Part of the key because the table is range-partitioned by month on it
     performed_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+        TIMESTAMP,
+        primary_key=True,
+        nullable=False,
+        server_default=func.current_timestamp(),
     )
     action: Mapped[CollectionActionEnum] = mapped_column(
         Enum(CollectionActionEnum, name="collection_action_enum"), nullable=False
@@ -59,6 +75,16 @@ class CollectionAudit(Base):
     collection: Mapped["Collection"] = relationship("Collection", backref="audits")
     user: Mapped["User"] = relationship("User", backref="audits_performed")
 
+    __table_args__ = (
+        Index(
+            "ix_collection_audit_collection_performed_at",
+            "collection_id",
+            "performed_at",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (performed_at)"},
+    )
+
 
 class CollectionPermission(Base):
     __tablename__ = "collection_permission"
@@ -101,8 +127,12 @@ class CollectionPermissionAudit(Base):
         ForeignKey("user.id", ondelete="SET NULL"),
         nullable=True,
     )
+    # Part of the key because the table is range-partitioned by month on it
     performed_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+        TIMESTAMP,
+        primary_key=True,
+        nullable=False,
+        server_default=func.current_timestamp(),
     )
     old_permission: Mapped[Optional[CollectionPermissionEnum]] = mapped_column(
         Enum(CollectionPermissionEnum, name="collection_permission_enum"),
@@ -118,6 +148,16 @@ class CollectionPermissionAudit(Base):
     )
     user: Mapped["User"] = relationship("User", backref="collection_permission_audits")
 
+    __table_args__ = (
+        Index(
+            "ix_collection_permission_audit_permission_performed_at",
+            "collection_permission_id",
+            "performed_at",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (performed_at)"},
+    )
+
 
 class CollectionAiPreference(Base):
     __tablename__ = "collection_ai_preference"
@@ -8,11 +8,15 @@ from sqlalchemy import (
     JSON,
     event,
     Enum,
+    Index,
     Integer,
+    Computed,
+    inspect,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column, text
+import re
 import uuid
 from .base import Base
 from .knowledge_graph import validate_knowledge_graph
@@ -20,6 +24,7 @@ from .enum import DocumentActionEnum
 from .user import User
 from .file import File
 from pgvector.sqlalchemy import Vector
+from ...config import get_settings
 
 if TYPE_CHECKING:
     from .collection import Collection
@@ -35,6 +40,7 @@ class Document(Base):
         UUID(as_uuid=True),
         ForeignKey("collection.id", ondelete="CASCADE"),
         nullable=True,
+        index=True,
     )
     user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True), ForeignKey("user.id", ondelete="SET NULL"), nullable=True
@@ -49,7 +55,14 @@ class Document(Base):
     is_graph_extracted: Mapped[bool] = mapped_column(
         Boolean, nullable=False, default=False
     )
+    # Why the chunking stage gave up on the document for good, e.g. a content
+    # type without an extractor; clear it to have the document retried
+    vectorize_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     knowledge_graph: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Version of the latest audit row; see DocumentAudit.version
+    audit_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     user: Mapped[Optional["User"]] = relationship("User", back_populates="documents")
     collection: Mapped[Optional["Collection"]] = relationship(
@@ -66,6 +79,17 @@ class Document(Base):
         "DocumentTag", back_populates="document", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Documents the chunking worker polls for
+        Index(
+            "ix_document_pending_vectorize",
+            "id",
+            postgresql_where=literal_column(
+                "NOT is_vectorized AND vectorize_error IS NULL"
+            ),
+        ),
+    )
+
     def validate_knowledge_graph_data(
         self, knowledge_graph_data: Optional[dict]
     ) -> None:
@@ -78,6 +102,19 @@ class Document(Base):
         self.knowledge_graph = knowledge_graph_data
 
 
+# Sort key for document listings. Titles are nullable, so NULL sorts as '' and
+# the id breaks ties, which gives a total order usable for keyset pagination.
+# The literal must stay inline for the planner to match the index expression.
+document_title_sort_key = func.coalesce(Document.title, literal_column("''"))
+
+Index(
+    "ix_document_collection_title_id",
+    Document.collection_id,
+    document_title_sort_key,
+    Document.id,
+)
+
+
 class Tag(Base):
     __tablename__ = "tags"
 
@@ -121,8 +158,40 @@ class DocumentTag(Base):
     tag: Mapped["Tag"] = relationship("Tag", back_populates="document_tags")
 
 
+def stemmed_chunk_text_indexes() -> list[Index]:
+    """GIN indexes on chunk text stemmed with each of TEXT_SEARCH_LANGUAGES."""
+    indexes = []
+    for language in get_settings().TEXT_SEARCH_LANGUAGES:
+        if not re.fullmatch(r"[a-z_]+", language):
+            raise ValueError(f"Invalid text search language: {language!r}")
+        indexes.append(
+            Index(
+                f"ix_chunk_text_{language}",
+                text(f"to_tsvector('{language}'::regconfig, chunk_text)"),
+                postgresql_using="gin",
+            )
+        )
+    return indexes
+
+
 class Chunk(Base):
     __tablename__ = "chunk"
+    __table_args__ = (
+        # Cosine-distance ANN index; filtering by collection joins through
+        # ix_chunk_document_id and ix_document_collection_id
+        Index(
+            "ix_chunk_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={
+                "m": get_settings().HNSW_M,
+                "ef_construction": get_settings().HNSW_EF_CONSTRUCTION,
+            },
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        Index("ix_chunk_search_vector", "search_vector", postgresql_using="gin"),
+        *stemmed_chunk_text_indexes(),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -131,8 +200,16 @@ class Chunk(Base):
         UUID(as_uuid=True),
         ForeignKey("document.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     chunk_text: Mapped[str] = mapped_column(Text, nullable=False)
+    # 'simple' keeps identifiers such as part numbers and error codes verbatim
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', chunk_text)", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
     embedding: Mapped[Optional[list[float]]] = mapped_column(Vector(256), nullable=True)
     page_number: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     start_char: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -152,12 +229,18 @@ class Chunk(Base):
 
 
 @event.listens_for(Document, "before_insert")
-@event.listens_for(Document, "before_update")
-def validate_knowledge_graph_on_save(mapper, connection, target):
+def validate_knowledge_graph_on_insert(mapper, connection, target):
     """Validate knowledge graph before saving to database."""
     validate_knowledge_graph(target.knowledge_graph)
 
 
+@event.listens_for(Document, "before_update")
+def validate_knowledge_graph_on_update(mapper, connection, target):
+    """Validate knowledge graph before saving, if it was changed."""
+    if inspect(target).attrs.knowledge_graph.history.has_changes():
+        validate_knowledge_graph(target.knowledge_graph)
+
+
 class DocumentAudit(Base):
     __tablename__ = "document_audit"
 
@@ -177,11 +260,31 @@ class DocumentAudit(Base):
     action_type: Mapped[DocumentActionEnum] = mapped_column(
         Enum(DocumentActionEnum, name="document_action_enum"), nullable=False
     )
+    # Audits of a document are numbered from 1. Each stores a JSON Patch from
+    # the previous version's state to its own, and every few versions the full
+    # state as well, so any version is rebuilt from the nearest snapshot.
+    version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    patch: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    snapshot: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Part of the key because the table is range-partitioned by month on it
     timestamp: Mapped[datetime] = mapped_column(
-        TIMESTAMP, nullable=False, server_default=func.current_timestamp()
+        TIMESTAMP,
+        primary_key=True,
+        nullable=False,
+        server_default=func.current_timestamp(),
     )
 
     document: Mapped["Document"] = relationship("Document", back_populates="audits")
     user: Mapped[Optional["User"]] = relationship(
         "User", back_populates="document_audits"
     )
+
+    __table_args__ = (
+        Index(
+            "ix_document_audit_document_timestamp",
+            "document_id",
+            "timestamp",
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
@@ -29,3 +29,14 @@ class DepthOfExplanationEnum(str, Enum):
     SHORT = "SHORT"
     MEDIUM = "MEDIUM"
     DETAIL = "DETAIL"
+
+
+class CountStrategyEnum(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    COUNTER = "counter"
+
+
+class DocumentIncludeEnum(str, Enum):
+    SUMMARY = "summary"
+    KNOWLEDGE_GRAPH = "knowledge_graph"
@@ -1,24 +1,62 @@
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING
 from .base import Base
-from sqlalchemy import Column, Text, TIMESTAMP, Integer, ForeignKey
+from sqlalchemy import BigInteger, Text, TIMESTAMP, Integer, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 import uuid
 
+if TYPE_CHECKING:
+    from .document import Document
+    from .user import User
+
 
 class File(Base):
     __tablename__ = "files"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    upload_by = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    upload_by: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True), ForeignKey("user.id", ondelete="SET NULL"), nullable=True
     )
-    upload_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
-    name = Column(Text, nullable=False)
-    size = Column(Integer, nullable=False)  # bytes
-    type = Column(Text, nullable=False)
-    url = Column(Text, nullable=False)  # file path in db, return as file preview
-    resource = Column(Text, nullable=False)
+    upload_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.now()
+    )
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)  # bytes
+    type: Mapped[str] = mapped_column(Text, nullable=False)
+    # file path in db, return as file preview
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    resource: Mapped[str] = mapped_column(Text, nullable=False)
+    # sha256 of the content, NULL for files uploaded before deduplication
+    digest: Mapped[Optional[str]] = mapped_column(
+        Text, ForeignKey("file_blob.digest"), nullable=True, index=True
+    )
+
+    uploader: Mapped[Optional["User"]] = relationship(
+        "User", back_populates="files_uploaded"
+    )
+    documents: Mapped[list["Document"]] = relationship(
+        "Document", back_populates="file"
+    )
+    blob: Mapped[Optional["FileBlob"]] = relationship(
+        "FileBlob", back_populates="files"
+    )
+
+
+class FileBlob(Base):
+    """A unique piece of content in the bucket, shared by every File with its digest."""
+
+    __tablename__ = "file_blob"
+
+    digest: Mapped[str] = mapped_column(Text, primary_key=True)  # sha256 hex digest
+    url: Mapped[str] = mapped_column(Text, nullable=False)  # object path in the bucket
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)  # bytes
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP, nullable=False, server_default=func.now()
+    )
 
-    uploader = relationship("User", back_populates="files_uploaded")
-    documents = relationship("Document", back_populates="file")
+    files: Mapped[list["File"]] = relationship("File", back_populates="blob")
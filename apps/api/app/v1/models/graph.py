@@ -0,0 +1,334 @@
+"""Normalized copy of each document's knowledge graph, and collection graphs.
+
+`Document.knowledge_graph` stays the source of truth; kg_node/kg_edge are
+rewritten in the same flush whenever it changes, so label lookups and
+traversals can run in SQL against indexes.
+
+Each collection's graph merges its documents' nodes by normalized label.
+It is kept as per-collection counts of the documents contributing each
+node and edge, adjusted by one document's contribution whenever that
+document's graph or collection changes, so it never has to be rebuilt.
+"""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import (
+    Computed,
+    Connection,
+    ForeignKey,
+    Index,
+    Integer,
+    Text,
+    UniqueConstraint,
+    delete,
+    event,
+    func,
+    inspect,
+    insert,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, Session, mapped_column, object_session
+
+from ...config import get_settings
+from .base import Base
+from .document import Document
+
+
+class KnowledgeGraphNode(Base):
+    __tablename__ = "kg_node"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("document.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # The node's id within its document's graph
+    node_id: Mapped[str] = mapped_column(Text, nullable=False)
+    label: Mapped[str] = mapped_column(Text, nullable=False)
+    # Nodes with the same key are merged in collection graphs
+    label_key: Mapped[str] = mapped_column(
+        Text,
+        Computed(
+            r"lower(btrim(regexp_replace(label, '[ \t\n\r\f\v]+', ' ', 'g')))",
+            persisted=True,
+        ),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("document_id", "node_id", name="uq_kg_node_document_node"),
+        Index("ix_kg_node_label_lower", func.lower(label)),
+        # Substring label search; needs the pg_trgm extension
+        *(
+            [
+                Index(
+                    "ix_kg_node_label_trgm",
+                    "label",
+                    postgresql_using="gin",
+                    postgresql_ops={"label": "gin_trgm_ops"},
+                )
+            ]
+            if get_settings().KG_LABEL_TRIGRAM_INDEX
+            else []
+        ),
+    )
+
+
+class KnowledgeGraphEdge(Base):
+    __tablename__ = "kg_edge"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("document.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    edge_id: Mapped[str] = mapped_column(Text, nullable=False)
+    source_node_id: Mapped[str] = mapped_column(Text, nullable=False)
+    target_node_id: Mapped[str] = mapped_column(Text, nullable=False)
+    label: Mapped[str] = mapped_column(Text, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("document_id", "edge_id", name="uq_kg_edge_document_edge"),
+        # Traversals follow edges in both directions
+        Index("ix_kg_edge_document_source", "document_id", "source_node_id"),
+        Index("ix_kg_edge_document_target", "document_id", "target_node_id"),
+    )
+
+
+class CollectionGraphNode(Base):
+    __tablename__ = "collection_graph_node"
+
+    collection_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("collection.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    # Label as first seen; documents merged in later keep it
+    label: Mapped[str] = mapped_column(Text, nullable=False)
+    document_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class CollectionGraphEdge(Base):
+    __tablename__ = "collection_graph_edge"
+
+    collection_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("collection.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    source_key: Mapped[str] = mapped_column(Text, primary_key=True)
+    target_key: Mapped[str] = mapped_column(Text, primary_key=True)
+    label: Mapped[str] = mapped_column(Text, primary_key=True)
+    document_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+# One document's distinct node keys and edges, added to a collection's counts
+# with :delta. Rows are upserted in key order so concurrent updates to one
+# collection lock them in the same order.
+_ADD_NODE_CONTRIBUTION = text(
+    """
+    INSERT INTO collection_graph_node (collection_id, key, label, document_count)
+    SELECT CAST(:collection_id AS uuid), node.label_key, min(node.label), :delta
+    FROM kg_node AS node
+    WHERE node.document_id = CAST(:document_id AS uuid)
+    GROUP BY node.label_key
+    ORDER BY node.label_key
+    ON CONFLICT (collection_id, key) DO UPDATE
+    SET document_count =
+        collection_graph_node.document_count + excluded.document_count
+    """
+)
+_ADD_EDGE_CONTRIBUTION = text(
+    """
+    INSERT INTO collection_graph_edge
+        (collection_id, source_key, target_key, label, document_count)
+    SELECT DISTINCT CAST(:collection_id AS uuid), source.label_key,
+        target.label_key, edge.label, :delta
+    FROM kg_edge AS edge
+    JOIN kg_node AS source
+        ON source.document_id = edge.document_id
+        AND source.node_id = edge.source_node_id
+    JOIN kg_node AS target
+        ON target.document_id = edge.document_id
+        AND target.node_id = edge.target_node_id
+    WHERE edge.document_id = CAST(:document_id AS uuid)
+    ORDER BY 2, 3, 4
+    ON CONFLICT (collection_id, source_key, target_key, label) DO UPDATE
+    SET document_count =
+        collection_graph_edge.document_count + excluded.document_count
+    """
+)
+_DROP_UNUSED_NODES = text(
+    """
+    DELETE FROM collection_graph_node
+    WHERE collection_id = CAST(:collection_id AS uuid)
+        AND document_count <= 0
+        AND key IN (
+            SELECT label_key FROM kg_node
+            WHERE document_id = CAST(:document_id AS uuid)
+        )
+    """
+)
+_DROP_UNUSED_EDGES = text(
+    """
+    DELETE FROM collection_graph_edge
+    WHERE collection_id = CAST(:collection_id AS uuid)
+        AND document_count <= 0
+        AND source_key IN (
+            SELECT label_key FROM kg_node
+            WHERE document_id = CAST(:document_id AS uuid)
+        )
+    """
+)
+_BUMP_GRAPH_VERSION = text(
+    """
+    UPDATE collection SET graph_version = graph_version + 1
+    WHERE id = CAST(:collection_id AS uuid)
+    """
+)
+
+# session.info key: ids of collections whose graph changed in the transaction
+_CHANGED_COLLECTIONS = "graph_changed_collections"
+
+
+def apply_collection_contribution(
+    connection: Connection, document_id: uuid.UUID, collection_id: uuid.UUID, delta: int
+) -> None:
+    """Add (delta=1) or remove (delta=-1) a document's graph in a collection graph.
+
+    The contribution is read from the document's current kg_node/kg_edge rows.
+    """
+    params = {
+        "document_id": str(document_id),
+        "collection_id": str(collection_id),
+        "delta": delta,
+    }
+    connection.execute(_ADD_NODE_CONTRIBUTION, params)
+    connection.execute(_ADD_EDGE_CONTRIBUTION, params)
+    if delta < 0:
+        connection.execute(_DROP_UNUSED_EDGES, params)
+        connection.execute(_DROP_UNUSED_NODES, params)
+
+
+def sync_graph_tables(
+    connection: Connection,
+    document_id: uuid.UUID,
+    knowledge_graph: Optional[dict],
+) -> None:
+    """Replace a document's rows in kg_node/kg_edge with `knowledge_graph`."""
+    connection.execute(
+        delete(KnowledgeGraphEdge).where(KnowledgeGraphEdge.document_id == document_id)
+    )
+    connection.execute(
+        delete(KnowledgeGraphNode).where(KnowledgeGraphNode.document_id == document_id)
+    )
+    if not knowledge_graph:
+        return
+
+    nodes = [
+        {
+            "document_id": document_id,
+            "node_id": node["id"],
+            "label": node["data"]["label"],
+        }
+        for node in knowledge_graph["nodes"]
+    ]
+    edges = [
+        {
+            "document_id": document_id,
+            "edge_id": edge["id"],
+            "source_node_id": edge["source"],
+            "target_node_id": edge["target"],
+            "label": edge["data"]["label"],
+        }
+        for edge in knowledge_graph["edges"]
+    ]
+    if nodes:
+        connection.execute(insert(KnowledgeGraphNode), nodes)
+    if edges:
+        connection.execute(insert(KnowledgeGraphEdge), edges)
+
+
+def _mark_graph_changed(document: Document, collection_id: uuid.UUID) -> None:
+    # Called from flush events, where the document is always in a session
+    session = object_session(document)
+    if session is not None:
+        session.info.setdefault(_CHANGED_COLLECTIONS, set()).add(
+            str(uuid.UUID(str(collection_id)))
+        )
+
+
+# Registered after the validation listeners in .document, so only
+# validated graphs are copied
+@event.listens_for(Document, "after_insert")
+def sync_graph_tables_on_insert(mapper, connection, target):
+    if target.knowledge_graph:
+        sync_graph_tables(connection, target.id, target.knowledge_graph)
+        if target.collection_id:
+            apply_collection_contribution(
+                connection, target.id, target.collection_id, 1
+            )
+            _mark_graph_changed(target, target.collection_id)
+
+
+@event.listens_for(Document, "after_update")
+def sync_graph_tables_on_update(mapper, connection, target):
+    attrs = inspect(target).attrs
+    graph_changed = attrs.knowledge_graph.history.has_changes()
+    collection_history = attrs.collection_id.history
+    if not (graph_changed or collection_history.has_changes()):
+        return
+
+    old_collection_id = (
+        collection_history.deleted[0]
+        if collection_history.deleted
+        else target.collection_id
+    )
+    if old_collection_id:
+        apply_collection_contribution(connection, target.id, old_collection_id, -1)
+        _mark_graph_changed(target, old_collection_id)
+    if graph_changed:
+        sync_graph_tables(connection, target.id, target.knowledge_graph)
+    if target.collection_id:
+        apply_collection_contribution(connection, target.id, target.collection_id, 1)
+        _mark_graph_changed(target, target.collection_id)
+
+
+@event.listens_for(Document, "before_delete")
+def remove_from_collection_graph(mapper, connection, target):
+    # The document's kg rows go with it through the foreign key cascade
+    if target.collection_id:
+        apply_collection_contribution(connection, target.id, target.collection_id, -1)
+        _mark_graph_changed(target, target.collection_id)
+
+
+@event.listens_for(Session, "before_commit")
+def bump_graph_versions(session: Session) -> None:
+    """Bump graph_version of the collections whose graph changed, once each.
+
+    This runs last in the transaction and locks the collection rows in id
+    order, so graph writes hold those locks only until the commit and
+    transactions touching the same collections cannot deadlock on them.
+    """
+    session.flush()
+    changed = session.info.pop(_CHANGED_COLLECTIONS, None)
+    if changed:
+        session.execute(
+            _BUMP_GRAPH_VERSION,
+            [{"collection_id": collection_id} for collection_id in sorted(changed)],
+        )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_graph_changes(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_CHANGED_COLLECTIONS, None)
@@ -1,8 +1,8 @@
 """Knowledge Graph schema and validation utilities."""
 
 from typing import Optional
-import jsonschema
-from jsonschema import ValidationError
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
 
 
 # JSON Schema for knowledge graph validation
@@ -52,22 +52,89 @@ KNOWLEDGE_GRAPH_SCHEMA = {
 }
 
 
+# Checked once here rather than on every validation
+Draft202012Validator.check_schema(KNOWLEDGE_GRAPH_SCHEMA)
+KNOWLEDGE_GRAPH_VALIDATOR = Draft202012Validator(KNOWLEDGE_GRAPH_SCHEMA)
+
+_GRAPH_KEYS = {"nodes", "edges"}
+_NODE_KEYS = {"id", "data"}
+_EDGE_KEYS = {"id", "data", "source", "target"}
+_DATA_KEYS = {"label"}
+
+
+def _has_shape(item, keys: set) -> bool:
+    """Whether `item` is a node or edge object as the schema defines it."""
+    if not isinstance(item, dict) or item.keys() != keys:
+        return False
+    data = item["data"]
+    return (
+        isinstance(item["id"], str)
+        and isinstance(data, dict)
+        and data.keys() == _DATA_KEYS
+        and isinstance(data["label"], str)
+    )
+
+
+def _schema_error(knowledge_graph_data) -> str:
+    error = best_match(KNOWLEDGE_GRAPH_VALIDATOR.iter_errors(knowledge_graph_data))
+    return error.message if error else "does not match the schema"
+
+
+def find_knowledge_graph_error(knowledge_graph_data: dict) -> Optional[str]:
+    """Describe the first problem with a knowledge graph, or return None.
+
+    One pass checks the schema by hand and that node ids and edge ids are
+    unique and every edge connects existing nodes. Only when the shape is
+    wrong does the compiled JSON Schema validator run, to word the error.
+    """
+    if not (
+        isinstance(knowledge_graph_data, dict)
+        and knowledge_graph_data.keys() == _GRAPH_KEYS
+        and isinstance(knowledge_graph_data["nodes"], list)
+        and isinstance(knowledge_graph_data["edges"], list)
+    ):
+        return _schema_error(knowledge_graph_data)
+
+    node_ids = set()
+    for node in knowledge_graph_data["nodes"]:
+        if not _has_shape(node, _NODE_KEYS):
+            return _schema_error(knowledge_graph_data)
+        if node["id"] in node_ids:
+            return f"duplicate node id {node['id']!r}"
+        node_ids.add(node["id"])
+
+    edge_ids = set()
+    for edge in knowledge_graph_data["edges"]:
+        if not (
+            _has_shape(edge, _EDGE_KEYS)
+            and isinstance(edge["source"], str)
+            and isinstance(edge["target"], str)
+        ):
+            return _schema_error(knowledge_graph_data)
+        if edge["id"] in edge_ids:
+            return f"duplicate edge id {edge['id']!r}"
+        edge_ids.add(edge["id"])
+        for end in (edge["source"], edge["target"]):
+            if end not in node_ids:
+                return f"edge {edge['id']!r} references unknown node {end!r}"
+
+    return None
+
+
 def validate_knowledge_graph(knowledge_graph_data: Optional[dict]) -> None:
-    """Validate knowledge graph data against the schema.
+    """Validate knowledge graph data against the schema and its node references.
 
     Args:
         knowledge_graph_data: The knowledge graph data to validate
 
     Raises:
-        ValueError: If the data doesn't match the schema
+        ValueError: If the data doesn't match the schema, repeats an id or
+            has an edge to a missing node
     """
     if knowledge_graph_data is not None:
-        try:
-            jsonschema.validate(
-                instance=knowledge_graph_data, schema=KNOWLEDGE_GRAPH_SCHEMA
-            )
-        except ValidationError as e:
-            raise ValueError(f"Invalid knowledge graph format: {e.message}")
+        error = find_knowledge_graph_error(knowledge_graph_data)
+        if error:
+            raise ValueError(f"Invalid knowledge graph format: {error}")
 
 
 def create_empty_knowledge_graph() -> dict:
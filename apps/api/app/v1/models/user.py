@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import TIMESTAMP, ForeignKey, Text
+from sqlalchemy import TIMESTAMP, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -95,6 +95,16 @@ class Session(Base):
 
     user: Mapped["User"] = relationship("User", back_populates="sessions")
 
+    __table_args__ = (
+        # Lets the sweeper find expired sessions; sessions without an expiry
+        # are never swept, so they stay out of the index
+        Index(
+            "ix_sessions_expires_at",
+            "expires_at",
+            postgresql_where=expires_at.isnot(None),
+        ),
+    )
+
 
 class UserAiPreference(Base):
     __tablename__ = "user_ai_preference"
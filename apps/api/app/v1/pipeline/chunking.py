@@ -0,0 +1,55 @@
+"""Token-bounded chunking of extracted document text."""
+
+import re
+from dataclasses import dataclass
+
+TOKEN_PATTERN = re.compile(r"\S+")
+
+# Separator placed between pages, so offsets index into one document string
+PAGE_SEPARATOR = "\f"
+
+
+@dataclass
+class TextChunk:
+    text: str
+    page_number: int
+    start_char: int
+    end_char: int
+    token_count: int
+
+
+def chunk_pages(
+    pages: list[str], max_tokens: int, overlap_tokens: int = 0
+) -> list[TextChunk]:
+    """Split pages into chunks of at most `max_tokens` whitespace tokens.
+
+    Chunks never cross a page boundary. Consecutive chunks on a page share
+    `overlap_tokens` tokens. Character offsets refer to the page texts joined
+    with `PAGE_SEPARATOR`; page numbers start at 1.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    step = max(1, max_tokens - max(0, overlap_tokens))
+
+    chunks: list[TextChunk] = []
+    page_offset = 0
+    for page_number, page in enumerate(pages, start=1):
+        tokens = list(TOKEN_PATTERN.finditer(page))
+        for start in range(0, len(tokens), step):
+            window = tokens[start : start + max_tokens]
+            start_char = window[0].start()
+            end_char = window[-1].end()
+            chunks.append(
+                TextChunk(
+                    text=page[start_char:end_char],
+                    page_number=page_number,
+                    start_char=page_offset + start_char,
+                    end_char=page_offset + end_char,
+                    token_count=len(window),
+                )
+            )
+            if start + max_tokens >= len(tokens):
+                break
+        page_offset += len(page) + len(PAGE_SEPARATOR)
+
+    return chunks
@@ -0,0 +1,92 @@
+"""Pluggable text embedding models."""
+
+import hashlib
+import importlib
+import math
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from ...config import get_settings
+
+# Must match the dimension of the chunk.embedding column
+EMBEDDING_DIMENSION = 256
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class Embedder(ABC):
+    """Base class for embedding models.
+
+    Implementations turn a batch of texts into vectors of `dimension` floats.
+    """
+
+    dimension: int = EMBEDDING_DIMENSION
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> list[list[float]]: ...
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic feature-hashing embedder.
+
+    Hashes lower-cased words and word bigrams into signed buckets and
+    L2-normalises the result. It needs no model files, which makes it suitable
+    for tests and offline development.
+    """
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION):
+        self.dimension = dimension
+
+    def _features(self, text: str) -> list[str]:
+        words = _WORD_PATTERN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimension
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm == 0:
+            return vector
+        return [value / norm for value in vector]
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed_one(text) for text in texts]
+
+
+EMBEDDERS: dict[str, type[Embedder]] = {
+    "hashing": HashingEmbedder,
+}
+
+
+@lru_cache
+def get_embedder(name: str = "") -> Embedder:
+    """Get the configured embedder instance.
+
+    `name` is a key of `EMBEDDERS` or a `module.path:ClassName` reference to an
+    `Embedder` subclass; it defaults to the `EMBEDDING_MODEL` setting.
+    """
+    name = name or get_settings().EMBEDDING_MODEL
+    if name in EMBEDDERS:
+        embedder = EMBEDDERS[name]()
+    else:
+        module_name, _, class_name = name.partition(":")
+        if not class_name:
+            raise ValueError(f"Unknown embedding model '{name}'")
+        embedder_class = getattr(importlib.import_module(module_name), class_name)
+        if not (
+            isinstance(embedder_class, type) and issubclass(embedder_class, Embedder)
+        ):
+            raise ValueError(f"Embedding model '{name}' is not an Embedder subclass")
+        embedder = embedder_class()
+
+    if embedder.dimension != EMBEDDING_DIMENSION:
+        raise ValueError(
+            f"Embedding model '{name}' produces {embedder.dimension} dimensions, "
+            f"expected {EMBEDDING_DIMENSION}"
+        )
+    return embedder
@@ -0,0 +1,61 @@
+"""Text extraction from stored document objects."""
+
+import io
+from collections.abc import Callable
+from typing import Optional
+
+from pypdf import PdfReader
+
+
+class UnsupportedContentError(ValueError):
+    """Raised when no extractor can turn a file into text."""
+
+
+def _extract_plain_text(data: bytes) -> list[str]:
+    return [data.decode("utf-8", errors="replace")]
+
+
+def _extract_pdf(data: bytes) -> list[str]:
+    reader = PdfReader(io.BytesIO(data))
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+# Content type -> extractor returning one string per page
+EXTRACTORS: dict[str, Callable[[bytes], list[str]]] = {
+    "application/pdf": _extract_pdf,
+    "application/json": _extract_plain_text,
+    "application/xml": _extract_plain_text,
+}
+
+
+def register_extractor(
+    content_type: str, extractor: Callable[[bytes], list[str]]
+) -> None:
+    """Register an extractor for an additional content type."""
+    EXTRACTORS[content_type] = extractor
+
+
+def get_extractor(content_type: Optional[str]) -> Callable[[bytes], list[str]]:
+    """The extractor for a content type, checked before fetching any content.
+
+    Raises:
+        UnsupportedContentError: If the content type has no extractor
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    extractor = EXTRACTORS.get(content_type)
+    if extractor is None and content_type.startswith("text/"):
+        extractor = _extract_plain_text
+    if extractor is None:
+        raise UnsupportedContentError(
+            f"No text extractor for content type '{content_type}'"
+        )
+    return extractor
+
+
+def extract_pages(data: bytes, content_type: Optional[str]) -> list[str]:
+    """Extract the text of a file, one entry per page.
+
+    Raises:
+        UnsupportedContentError: If the content type has no extractor
+    """
+    return get_extractor(content_type)(data)
@@ -0,0 +1,171 @@
+"""Pluggable knowledge graph extraction from chunk text."""
+
+import importlib
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import combinations
+
+from ...config import get_settings
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+_WORD_PATTERN = re.compile(r"\w[\w'-]*")
+# ASCII only, so that it matches the regexp_replace of kg_node.label_key
+# exactly whatever the database locale
+_WHITESPACE = re.compile(r"[ \t\n\r\f\v]+")
+
+# Capitalised only because they start a sentence or heading
+_LEADING_STOPWORDS = frozenset(
+    "a an and as at but by for from he her his i if in it its of on or our she "
+    "so that the their there these they this those to we what when where which "
+    "while who with you".split()
+)
+
+
+@dataclass(frozen=True)
+class ExtractedGraph:
+    """Entities and relations found in one chunk, identified by label."""
+
+    entities: list[str] = field(default_factory=list)
+    # (source label, relation label, target label)
+    relations: list[tuple[str, str, str]] = field(default_factory=list)
+
+
+class GraphExtractor(ABC):
+    """Base class for graph extractors.
+
+    Implementations turn a batch of chunk texts into one `ExtractedGraph`
+    per text.
+    """
+
+    @abstractmethod
+    def extract(self, texts: list[str]) -> list[ExtractedGraph]: ...
+
+
+class CooccurrenceExtractor(GraphExtractor):
+    """Deterministic rule-based extractor.
+
+    Entities are runs of capitalised words ("Ada Lovelace", "NASA"), and two
+    entities in the same sentence are related by `co_occurs_with`. It needs
+    no model files, which makes it suitable for tests and offline
+    development.
+    """
+
+    relation = "co_occurs_with"
+
+    def __init__(self, max_entities_per_sentence: int = 12):
+        self.max_entities_per_sentence = max_entities_per_sentence
+
+    def _sentence_entities(self, sentence: str) -> list[str]:
+        entities: list[str] = []
+        run: list[str] = []
+        end = 0
+        for match in _WORD_PATTERN.finditer(sentence):
+            word = match.group()
+            adjacent = run and not sentence[end : match.start()].strip()
+            if word[0].isupper() and (adjacent or not run):
+                run.append(word)
+            else:
+                entities.append(" ".join(run))
+                run = [word] if word[0].isupper() else []
+            end = match.end()
+        entities.append(" ".join(run))
+
+        found = []
+        for entity in entities:
+            words = entity.split()
+            while words and words[0].lower() in _LEADING_STOPWORDS:
+                words.pop(0)
+            if words and len(" ".join(words)) > 1 and " ".join(words) not in found:
+                found.append(" ".join(words))
+        return found[: self.max_entities_per_sentence]
+
+    def _extract_one(self, text: str) -> ExtractedGraph:
+        entities: list[str] = []
+        relations: list[tuple[str, str, str]] = []
+        for sentence in _SENTENCE_END.split(text):
+            found = self._sentence_entities(sentence)
+            entities.extend(found)
+            # Co-occurrence has no direction; order pairs so each is seen once
+            relations.extend(
+                (source, self.relation, target)
+                for source, target in combinations(sorted(found, key=str.lower), 2)
+            )
+        return ExtractedGraph(entities=entities, relations=relations)
+
+    def extract(self, texts: list[str]) -> list[ExtractedGraph]:
+        return [self._extract_one(text) for text in texts]
+
+
+GRAPH_EXTRACTORS: dict[str, type[GraphExtractor]] = {
+    "cooccurrence": CooccurrenceExtractor,
+}
+
+
+@lru_cache
+def get_graph_extractor(name: str = "") -> GraphExtractor:
+    """Get the configured graph extractor instance.
+
+    `name` is a key of `GRAPH_EXTRACTORS` or a `module.path:ClassName`
+    reference to a `GraphExtractor` subclass; it defaults to the
+    `GRAPH_EXTRACTOR` setting.
+    """
+    name = name or get_settings().GRAPH_EXTRACTOR
+    if name in GRAPH_EXTRACTORS:
+        return GRAPH_EXTRACTORS[name]()
+
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown graph extractor '{name}'")
+    extractor_class = getattr(importlib.import_module(module_name), class_name)
+    if not (
+        isinstance(extractor_class, type)
+        and issubclass(extractor_class, GraphExtractor)
+    ):
+        raise ValueError(f"Graph extractor '{name}' is not a GraphExtractor subclass")
+    return extractor_class()
+
+
+def _entity_key(label: str) -> str:
+    # kg_node.label_key: whitespace runs collapsed and trimmed, then lower-cased
+    return _WHITESPACE.sub(" ", label).strip(" ").lower()
+
+
+def build_knowledge_graph(extracted: list[ExtractedGraph]) -> dict:
+    """Merge per-chunk extractions into one document graph.
+
+    Entities with the same normalised label become one node, labelled as
+    first seen; repeated relations and relations of a node to itself are
+    dropped. Ids are assigned in order of first appearance, so the same
+    input always gives the same graph.
+    """
+    node_ids: dict[str, str] = {}
+    nodes = []
+
+    def node_id(label: str) -> str:
+        key = _entity_key(label)
+        if key not in node_ids:
+            node_ids[key] = f"n{len(nodes)}"
+            nodes.append({"id": node_ids[key], "data": {"label": label.strip()}})
+        return node_ids[key]
+
+    seen_edges = set()
+    edges = []
+    for graph in extracted:
+        for entity in graph.entities:
+            node_id(entity)
+        for source_label, relation, target_label in graph.relations:
+            source, target = node_id(source_label), node_id(target_label)
+            if source == target or (source, relation, target) in seen_edges:
+                continue
+            seen_edges.add((source, relation, target))
+            edges.append(
+                {
+                    "id": f"e{len(edges)}",
+                    "data": {"label": relation},
+                    "source": source,
+                    "target": target,
+                }
+            )
+    return {"nodes": nodes, "edges": edges}
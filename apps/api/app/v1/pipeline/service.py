@@ -0,0 +1,268 @@
+import logging
+import time
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, joinedload
+
+from ...config import get_settings
+from ..document.service import DocumentAuditService, document_state
+from ..models.document import Chunk, Document
+from ..models.enum import DocumentActionEnum
+from ..storage.service import StorageService
+from .chunking import chunk_pages
+from .embedding import Embedder, get_embedder
+from .extraction import UnsupportedContentError, get_extractor
+from .graph_extraction import (
+    ExtractedGraph,
+    GraphExtractor,
+    build_knowledge_graph,
+    get_graph_extractor,
+)
+
+# First key of the advisory locks taken while a document is chunked or has
+# its graph extracted
+CHUNKING_LOCK_NAMESPACE = 1
+GRAPH_EXTRACTION_LOCK_NAMESPACE = 2
+
+
+def _try_lock(db: Session, namespace: int, document_id: UUID) -> bool:
+    """Take a transaction-scoped advisory lock so each document has one worker.
+
+    An advisory lock does not block user edits of the document row the way
+    SELECT ... FOR UPDATE would while a long extraction is running.
+    """
+    return bool(
+        db.execute(
+            select(
+                func.pg_try_advisory_xact_lock(
+                    namespace, func.hashtext(str(document_id))
+                )
+            )
+        ).scalar()
+    )
+
+
+class ChunkingService:
+    """Service that turns stored documents into embedded chunks."""
+
+    def __init__(self, db: Session, embedder: Optional[Embedder] = None):
+        self.db = db
+        self.settings = get_settings()
+        self.embedder = embedder or get_embedder()
+        self.storage = StorageService(db)
+
+    def pending_document_ids(self, limit: int) -> list[UUID]:
+        """Ids of documents that still need chunks and have not been given up on."""
+        rows = self.db.execute(
+            select(Document.id)
+            .where(
+                Document.is_vectorized.is_(False), Document.vectorize_error.is_(None)
+            )
+            .order_by(Document.id)
+            .limit(limit)
+        ).all()
+        return [row.id for row in rows]
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        batch_size = max(1, self.settings.EMBEDDING_BATCH_SIZE)
+        embeddings: list[list[float]] = []
+        for start in range(0, len(texts), batch_size):
+            embeddings.extend(self.embedder.embed(texts[start : start + batch_size]))
+        return embeddings
+
+    def process_document(self, document_id: UUID) -> Optional[int]:
+        """Chunk, embed and store one document, then mark it vectorized.
+
+        Returns the number of chunks written, or None when the document was
+        already done or is being processed by another worker.
+
+        A document whose text cannot be extracted gets a `vectorize_error`
+        and leaves the pending set until the error is cleared. That covers a
+        content type with no extractor, which is checked before downloading,
+        and a file the extractor fails on. Other failures, such as storage
+        errors, raise and leave the document pending.
+        """
+        started = time.perf_counter()
+        if not _try_lock(self.db, CHUNKING_LOCK_NAMESPACE, document_id):
+            self.db.rollback()
+            return None
+
+        document = (
+            self.db.query(Document)
+            .options(joinedload(Document.file))
+            .filter(
+                Document.id == document_id,
+                Document.is_vectorized.is_(False),
+                Document.vectorize_error.is_(None),
+            )
+            .first()
+        )
+        if not document:
+            self.db.rollback()
+            return None
+
+        try:
+            extractor = get_extractor(document.file.type)
+        except UnsupportedContentError as e:
+            logging.warning(f"Not vectorizing document {document_id}: {e}")
+            document.vectorize_error = str(e)
+            self.db.commit()
+            return 0
+
+        data = self.storage.read_object(document.file.url)
+        try:
+            pages = extractor(data)
+        except Exception as e:
+            # The same bytes would fail again, so do not retry
+            logging.exception(f"Text extraction failed for document {document_id}")
+            document.vectorize_error = f"Text extraction failed: {e}"
+            self.db.commit()
+            return 0
+
+        chunks = chunk_pages(
+            pages,
+            max_tokens=self.settings.CHUNK_MAX_TOKENS,
+            overlap_tokens=self.settings.CHUNK_OVERLAP_TOKENS,
+        )
+        embeddings = self._embed([chunk.text for chunk in chunks])
+
+        # Replace chunks left by an interrupted earlier run
+        self.db.execute(delete(Chunk).where(Chunk.document_id == document_id))
+        if chunks:
+            self.db.execute(
+                insert(Chunk),
+                [
+                    {
+                        "document_id": document_id,
+                        "chunk_text": chunk.text,
+                        "embedding": embedding,
+                        "page_number": chunk.page_number,
+                        "start_char": chunk.start_char,
+                        "end_char": chunk.end_char,
+                        "token_count": chunk.token_count,
+                    }
+                    for chunk, embedding in zip(chunks, embeddings)
+                ],
+            )
+        document.is_vectorized = True
+        self.db.commit()
+
+        elapsed = time.perf_counter() - started
+        logging.info(
+            f"Vectorized document {document_id}: {len(chunks)} chunks in "
+            f"{elapsed:.2f}s ({len(chunks) / elapsed if elapsed else 0:.1f} chunks/s)"
+        )
+        return len(chunks)
+
+
+class GraphExtractionService:
+    """Service that builds documents' knowledge graphs from their chunks."""
+
+    def __init__(self, db: Session, extractor: Optional[GraphExtractor] = None):
+        self.db = db
+        self.settings = get_settings()
+        self.extractor = extractor or get_graph_extractor()
+
+    def pending_document_ids(self, limit: int) -> list[UUID]:
+        """Ids of chunked documents that still need a knowledge graph."""
+        rows = self.db.execute(
+            select(Document.id)
+            .where(
+                Document.is_vectorized.is_(True),
+                Document.is_graph_extracted.is_(False),
+            )
+            .order_by(Document.id)
+            .limit(limit)
+        ).all()
+        return [row.id for row in rows]
+
+    def process_document(self, document_id: UUID) -> Optional[int]:
+        """Extract, store and audit one document's graph; see process_documents."""
+        return self.process_documents([document_id])[document_id]
+
+    def process_documents(self, document_ids: list[UUID]) -> dict[UUID, Optional[int]]:
+        """Extract, store and audit several documents' graphs, then mark them extracted.
+
+        Chunks of all the documents are passed to the extractor together, in
+        batches of GRAPH_EXTRACTION_BATCH_SIZE, so small documents still fill
+        a batch; the results are split back per document. The graphs and
+        flags are committed together, so a crashed run leaves the documents
+        pending and finished documents are never redone. Maps each id to its
+        number of entities, or None when the document was already done or is
+        being processed by another worker.
+        """
+        started = time.perf_counter()
+        results: dict[UUID, Optional[int]] = dict.fromkeys(document_ids)
+        locked = [
+            document_id
+            for document_id in document_ids
+            if _try_lock(self.db, GRAPH_EXTRACTION_LOCK_NAMESPACE, document_id)
+        ]
+        pending = (
+            self.db.execute(
+                select(Document.id)
+                .where(
+                    Document.id.in_(locked),
+                    Document.is_vectorized.is_(True),
+                    Document.is_graph_extracted.is_(False),
+                )
+                .order_by(Document.id)
+            )
+            .scalars()
+            .all()
+            if locked
+            else []
+        )
+        if not pending:
+            self.db.rollback()
+            return results
+
+        rows = self.db.execute(
+            select(Chunk.document_id, Chunk.chunk_text)
+            .where(Chunk.document_id.in_(pending))
+            .order_by(Chunk.document_id, Chunk.page_number, Chunk.start_char, Chunk.id)
+        ).all()
+        texts = [row.chunk_text for row in rows]
+        batch_size = max(1, self.settings.GRAPH_EXTRACTION_BATCH_SIZE)
+        extracted = []
+        for start in range(0, len(texts), batch_size):
+            extracted.extend(self.extractor.extract(texts[start : start + batch_size]))
+
+        per_document: dict[UUID, list[ExtractedGraph]] = {
+            document_id: [] for document_id in pending
+        }
+        for row, chunk_extraction in zip(rows, extracted):
+            per_document[row.document_id].append(chunk_extraction)
+
+        # Lock the rows only now, for the write, so user edits are not held
+        # up during extraction
+        documents = (
+            self.db.query(Document)
+            .filter(Document.id.in_(pending))
+            .order_by(Document.id)
+            .with_for_update()
+            .all()
+        )
+        audit = DocumentAuditService(self.db)
+        relations = 0
+        for document in documents:
+            graph = build_knowledge_graph(per_document[document.id])
+            old_state = document_state(document)
+            document.set_knowledge_graph(graph)
+            document.is_graph_extracted = True
+            audit.record(document, DocumentActionEnum.UPDATE, old_state=old_state)
+            results[document.id] = len(graph["nodes"])
+            relations += len(graph["edges"])
+        self.db.commit()
+
+        elapsed = time.perf_counter() - started
+        entities = sum(count or 0 for count in results.values())
+        logging.info(
+            f"Extracted graphs for {len(documents)} documents: {len(texts)} chunks, "
+            f"{entities} entities, {relations} relations in {elapsed:.2f}s "
+            f"({len(texts) / elapsed if elapsed else 0:.1f} chunks/s, "
+            f"{entities / elapsed if elapsed else 0:.1f} entities/s)"
+        )
+        return results
@@ -0,0 +1,144 @@
+"""Process-parallel runner for the document ingestion pipeline."""
+
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from ...config import get_settings
+from ...db import SessionLocal, engine
+from .service import ChunkingService, GraphExtractionService
+
+
+def _pending_chunks(db: Session, limit: int) -> list[UUID]:
+    return ChunkingService(db).pending_document_ids(limit)
+
+
+def _process_chunks(db: Session, document_ids: list[UUID]) -> list[Optional[int]]:
+    service = ChunkingService(db)
+    return [service.process_document(document_id) for document_id in document_ids]
+
+
+def _pending_graphs(db: Session, limit: int) -> list[UUID]:
+    return GraphExtractionService(db).pending_document_ids(limit)
+
+
+def _process_graphs(db: Session, document_ids: list[UUID]) -> list[Optional[int]]:
+    results = GraphExtractionService(db).process_documents(document_ids)
+    return [results[document_id] for document_id in document_ids]
+
+
+# Stage name -> (list pending document ids, process a group of documents,
+# whether a round is split into one group per process rather than one
+# group per document)
+STAGES: dict[
+    str,
+    tuple[
+        Callable[[Session, int], list[UUID]],
+        Callable[[Session, list[UUID]], list[Optional[int]]],
+        bool,
+    ],
+] = {
+    "chunks": (_pending_chunks, _process_chunks, False),
+    # Graph extraction batches chunks across the documents of a group
+    "graph": (_pending_graphs, _process_graphs, True),
+}
+
+
+def _init_process() -> None:
+    # Connections inherited from the parent must not be shared with it
+    engine.dispose(close=False)
+
+
+# Returned by _run_group for a document whose processing raised
+_FAILED = -1
+
+
+def _run_group(stage: str, document_ids: list[UUID]) -> list[Optional[int]]:
+    """Process a group of documents; if it fails, retry them one at a time."""
+    _, process, _ = STAGES[stage]
+    with SessionLocal() as db:
+        try:
+            return process(db, document_ids)
+        except Exception:
+            db.rollback()
+            if len(document_ids) == 1:
+                logging.exception(
+                    f"Stage '{stage}' failed for document {document_ids[0]}"
+                )
+                return [_FAILED]
+            logging.exception(
+                f"Stage '{stage}' failed for {len(document_ids)} documents, "
+                "retrying them one at a time"
+            )
+    return [
+        result
+        for document_id in document_ids
+        for result in _run_group(stage, [document_id])
+    ]
+
+
+def run_worker(
+    stage: str = "chunks",
+    processes: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    once: bool = False,
+) -> None:
+    """Poll for pending documents and process them across worker processes.
+
+    With `once`, return as soon as no pending documents are left.
+    """
+    settings = get_settings()
+    processes = max(1, processes or settings.WORKER_PROCESSES)
+    batch_size = max(1, batch_size or processes * 4)
+    pending, _, batched = STAGES[stage]
+
+    # Documents that failed in this run are not retried until restart
+    failed: set[UUID] = set()
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_process) as pool:
+        while True:
+            with SessionLocal() as db:
+                candidates = pending(db, batch_size + len(failed))
+            document_ids = [id for id in candidates if id not in failed][:batch_size]
+
+            if not document_ids:
+                if once:
+                    return
+                time.sleep(settings.WORKER_POLL_INTERVAL_SECONDS)
+                continue
+
+            if batched:
+                size = -(-len(document_ids) // processes)
+                groups = [
+                    document_ids[start : start + size]
+                    for start in range(0, len(document_ids), size)
+                ]
+            else:
+                groups = [[document_id] for document_id in document_ids]
+
+            started = time.perf_counter()
+            results = [
+                result
+                for group_results in pool.map(_run_group, [stage] * len(groups), groups)
+                for result in group_results
+            ]
+            done = 0
+            for document_id, result in zip(document_ids, results):
+                if result == _FAILED:
+                    failed.add(document_id)
+                elif result is not None:
+                    done += 1
+            logging.info(
+                f"Stage '{stage}': processed {done}/{len(document_ids)} "
+                f"documents in {time.perf_counter() - started:.2f}s"
+            )
+            if not done:
+                if once:
+                    # Everything left is failing or locked by another worker
+                    return
+                time.sleep(settings.WORKER_POLL_INTERVAL_SECONDS)
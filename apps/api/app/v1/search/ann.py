@@ -0,0 +1,85 @@
+"""pgvector ANN index management and per-query search tuning."""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+from ...config import get_settings
+
+ANN_INDEX_NAME = "ix_chunk_embedding_hnsw"
+ANN_INDEX_TYPES = ("hnsw", "ivfflat")
+MAX_EF_SEARCH = 1000
+
+
+def clamp_ef_search(ef_search: Optional[int]) -> int:
+    """Resolve a requested ef_search to the configured default within pgvector limits."""
+    if ef_search is None:
+        ef_search = get_settings().HNSW_EF_SEARCH
+    return max(1, min(ef_search, MAX_EF_SEARCH))
+
+
+def apply_search_params(db: Session, ef_search: Optional[int] = None) -> None:
+    """Set ANN search parameters for the current transaction only.
+
+    A larger `ef_search` trades latency for recall. Iterative scans let
+    pgvector keep walking the graph when a WHERE clause (such as a collection
+    filter) removes candidates, so filtered queries still return k rows.
+    """
+    settings = get_settings()
+    params = {
+        "ef_search": str(clamp_ef_search(ef_search)),
+        "probes": str(max(1, settings.IVFFLAT_PROBES)),
+    }
+    statement = (
+        "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+        "set_config('ivfflat.probes', :probes, true)"
+    )
+    if settings.HNSW_ITERATIVE_SCAN != "off":
+        params["iterative_scan"] = settings.HNSW_ITERATIVE_SCAN
+        statement += (
+            ", set_config('hnsw.iterative_scan', :iterative_scan, true)"
+            ", set_config('ivfflat.iterative_scan', 'relaxed_order', true)"
+        )
+    db.execute(text(statement), params)
+
+
+def rebuild_ann_index(
+    engine: Engine,
+    index_type: str = "hnsw",
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    lists: Optional[int] = None,
+) -> None:
+    """Rebuild the chunk embedding index with new build parameters.
+
+    The replacement is built concurrently next to the old index and swapped
+    in, so searches keep using an index throughout. `lists` only applies to
+    IVFFlat, `m` and `ef_construction` only to HNSW.
+    """
+    if index_type not in ANN_INDEX_TYPES:
+        raise ValueError(f"Unsupported ANN index type '{index_type}'")
+
+    settings = get_settings()
+    if index_type == "hnsw":
+        options = (
+            f"m = {int(m or settings.HNSW_M)}, "
+            f"ef_construction = {int(ef_construction or settings.HNSW_EF_CONSTRUCTION)}"
+        )
+    else:
+        options = f"lists = {int(lists or settings.IVFFLAT_LISTS)}"
+
+    new_name = f"{ANN_INDEX_NAME}_new"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name}"))
+        conn.execute(
+            text(
+                f"CREATE INDEX CONCURRENTLY {new_name} ON chunk "
+                f"USING {index_type} (embedding vector_cosine_ops) WITH ({options})"
+            )
+        )
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {ANN_INDEX_NAME}"))
+        conn.execute(text(f"ALTER INDEX {new_name} RENAME TO {ANN_INDEX_NAME}"))
+
+    logging.info(f"Rebuilt {ANN_INDEX_NAME} as {index_type} with {options}")
@@ -0,0 +1,11 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from .service import AsyncSearchService
+from ...db import get_async_db
+
+
+def get_async_search_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncSearchService:
+    """Get async search service instance."""
+    return AsyncSearchService(db)
@@ -0,0 +1,120 @@
+"""Full-text search over chunks, configured from a user's AI preferences."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from sqlalchemy import cast, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.sql.elements import ColumnElement
+
+from ...config import get_settings
+from ..models.document import Chunk
+from ..models.user import UserAiPreference
+
+DEFAULT_TEXT_SEARCH_CONFIG = "simple"
+
+# Languages offered by the web client (and their short codes) mapped to the
+# PostgreSQL text-search configurations that ship with the server. Languages
+# without a stemmer, such as Thai or Chinese, fall back to 'simple'.
+LANGUAGE_CONFIGS = {
+    "english": "english",
+    "en": "english",
+    "spanish": "spanish",
+    "es": "spanish",
+    "french": "french",
+    "fr": "french",
+    "german": "german",
+    "de": "german",
+    "italian": "italian",
+    "it": "italian",
+    "portuguese": "portuguese",
+    "pt": "portuguese",
+    "russian": "russian",
+    "ru": "russian",
+    "arabic": "arabic",
+    "ar": "arabic",
+    "hindi": "hindi",
+    "hi": "hindi",
+    "indonesian": "indonesian",
+    "id": "indonesian",
+}
+
+
+@dataclass(frozen=True)
+class TextSearchConfig:
+    """Text-search configuration and extra stopwords for one user."""
+
+    regconfig: str = DEFAULT_TEXT_SEARCH_CONFIG
+    stopwords: frozenset[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def from_preference(
+        cls, preference: Optional[UserAiPreference]
+    ) -> "TextSearchConfig":
+        """Build a configuration from the stored `language_preference` and `stopwords`.
+
+        The first preferred language with a PostgreSQL configuration wins.
+        """
+        if preference is None:
+            return cls()
+
+        languages = (preference.language_preference or {}).get("LANGUAGE") or []
+        regconfig = next(
+            (
+                LANGUAGE_CONFIGS[language.strip().lower()]
+                for language in languages
+                if language.strip().lower() in LANGUAGE_CONFIGS
+            ),
+            DEFAULT_TEXT_SEARCH_CONFIG,
+        )
+        stopwords = (preference.stopwords or {}).get("STOP") or []
+        return cls(
+            regconfig=regconfig,
+            stopwords=frozenset(
+                word.strip().lower() for word in stopwords if word.strip()
+            ),
+        )
+
+
+def remove_stopwords(query: str, stopwords: Iterable[str]) -> str:
+    """Drop whole-word (or whole-phrase) stopword occurrences from `query`."""
+    words = sorted(stopwords, key=len, reverse=True)
+    if not words:
+        return query.strip()
+
+    pattern = re.compile(
+        r"(?<!\w)(?:" + "|".join(re.escape(word) for word in words) + r")(?!\w)",
+        re.IGNORECASE,
+    )
+    return " ".join(pattern.sub(" ", query).split())
+
+
+def build_text_match(
+    query: str, config: TextSearchConfig
+) -> tuple[ColumnElement, ColumnElement]:
+    """Build the condition and rank that match chunks against `query`.
+
+    `chunk.search_vector` uses the 'simple' configuration so identifiers
+    match verbatim. When the user's configuration is one of
+    TEXT_SEARCH_LANGUAGES, chunk text stemmed with that configuration is
+    matched against the stemmed query too, through its expression index,
+    and the two ranks are added.
+    """
+    simple_query = func.websearch_to_tsquery(
+        cast(DEFAULT_TEXT_SEARCH_CONFIG, REGCONFIG), query
+    )
+    condition = Chunk.search_vector.bool_op("@@")(simple_query)
+    rank = func.ts_rank_cd(Chunk.search_vector, simple_query)
+
+    if config.regconfig in get_settings().TEXT_SEARCH_LANGUAGES:
+        # The configuration is inlined so the expression matches the index
+        stemmed_vector = func.to_tsvector(
+            literal_column(f"'{config.regconfig}'::regconfig"), Chunk.chunk_text
+        )
+        stemmed_query = func.websearch_to_tsquery(
+            cast(config.regconfig, REGCONFIG), query
+        )
+        condition = or_(condition, stemmed_vector.bool_op("@@")(stemmed_query))
+        rank = rank + func.ts_rank_cd(stemmed_vector, stemmed_query)
+    return condition, rank
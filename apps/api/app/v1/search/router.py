@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Query, status
+from typing import List, Literal, Optional
+
+from .schemas import ChunkSearchResult
+from .service import AsyncSearchService
+from .dependencies import get_async_search_service
+from ..collection.dependencies import has_permission
+from ..models.enum import CollectionPermissionEnum
+from ..models.user import User
+from ..user.dependencies import get_current_user
+
+
+router = APIRouter(prefix="/collections", tags=["search"])
+
+
+@router.get(
+    "/{collection_id}/search",
+    response_model=List[ChunkSearchResult],
+    status_code=status.HTTP_200_OK,
+)
+async def search_collection(
+    collection_id: str,
+    q: str = Query(..., min_length=1, description="Search query"),
+    k: int = Query(10, ge=1, le=100, description="Number of chunks to return"),
+    mode: Literal["vector", "hybrid"] = Query(
+        "vector", description="'hybrid' fuses vector and full-text rankings"
+    ),
+    ef_search: Optional[int] = Query(
+        None, ge=1, le=1000, description="HNSW search depth; higher is more accurate"
+    ),
+    _: None = Depends(has_permission(CollectionPermissionEnum.READ)),
+    current_user: User = Depends(get_current_user),
+    search_service: AsyncSearchService = Depends(get_async_search_service),
+) -> List[ChunkSearchResult]:
+    """Semantic or hybrid search over the chunks of a collection's documents."""
+
+    if mode == "hybrid":
+        return await search_service.hybrid_search(
+            collection_id=collection_id,
+            query=q,
+            k=k,
+            text_config=await search_service.get_text_search_config(
+                str(current_user.id)
+            ),
+            ef_search=ef_search,
+        )
+
+    return await search_service.search_chunks(
+        collection_id=collection_id, query=q, k=k, ef_search=ef_search
+    )
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from uuid import UUID
+
+
+class ChunkSearchResult(BaseModel):
+    chunk_id: UUID
+    document_id: UUID
+    document_title: Optional[str] = None
+    chunk_text: str
+    page_number: Optional[int] = None
+    start_char: Optional[int] = None
+    end_char: Optional[int] = None
+    score: float = Field(
+        ...,
+        description="Cosine similarity in vector mode, fused reciprocal rank score in hybrid mode",
+    )
@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Row, Select, select
+from sqlalchemy.orm import Session
+
+from ...utils.async_service import AsyncService
+from ..models.document import Chunk, Document
+from ..models.user import UserAiPreference
+from ..pipeline.embedding import Embedder, get_embedder
+from .ann import apply_search_params
+from .lexical import TextSearchConfig, build_text_match, remove_stopwords
+from .schemas import ChunkSearchResult
+
+# Rank constant from the original reciprocal rank fusion paper
+RRF_K = 60
+# Each ranking fetches this many candidates per requested result before fusion
+HYBRID_CANDIDATE_FACTOR = 4
+MAX_HYBRID_CANDIDATES = 200
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Row]], k: int = RRF_K
+) -> List[tuple[Row, float]]:
+    """Fuse ranked result lists by summing 1 / (k + rank) per chunk."""
+    scores: Dict[object, float] = {}
+    rows: Dict[object, Row] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            scores[row.id] = scores.get(row.id, 0.0) + 1.0 / (k + rank)
+            rows.setdefault(row.id, row)
+
+    ordered = sorted(scores, key=scores.__getitem__, reverse=True)
+    return [(rows[chunk_id], scores[chunk_id]) for chunk_id in ordered]
+
+
+class SearchService:
+    """Service for retrieving chunks relevant to a query."""
+
+    def __init__(self, db: Session, embedder: Optional[Embedder] = None):
+        self.db = db
+        self.embedder = embedder or get_embedder()
+
+    @staticmethod
+    def _select_chunks(collection_id: str, *columns) -> Select:
+        """Select only the response columns of a collection's chunks."""
+        return (
+            select(
+                Chunk.id,
+                Chunk.document_id,
+                Document.title,
+                Chunk.chunk_text,
+                Chunk.page_number,
+                Chunk.start_char,
+                Chunk.end_char,
+                *columns,
+            )
+            .join(Document, Document.id == Chunk.document_id)
+            .where(Document.collection_id == collection_id)
+        )
+
+    @staticmethod
+    def _to_result(row: Row, score: float) -> ChunkSearchResult:
+        return ChunkSearchResult(
+            chunk_id=row.id,
+            document_id=row.document_id,
+            document_title=row.title,
+            chunk_text=row.chunk_text,
+            page_number=row.page_number,
+            start_char=row.start_char,
+            end_char=row.end_char,
+            score=score,
+        )
+
+    def embed_query(self, query: str) -> List[float]:
+        return self.embedder.embed([query])[0]
+
+    def _vector_ranking(
+        self,
+        collection_id: str,
+        embedding: List[float],
+        limit: int,
+        ef_search: Optional[int] = None,
+    ) -> Sequence[Row]:
+        distance = Chunk.embedding.cosine_distance(embedding).label("distance")
+
+        apply_search_params(self.db, ef_search)
+        return self.db.execute(
+            self._select_chunks(collection_id, distance).order_by(distance).limit(limit)
+        ).all()
+
+    def _lexical_ranking(
+        self,
+        collection_id: str,
+        query: str,
+        limit: int,
+        text_config: TextSearchConfig,
+    ) -> Sequence[Row]:
+        query = remove_stopwords(query, text_config.stopwords)
+        if not query:
+            return []
+
+        condition, rank = build_text_match(query, text_config)
+        rank = rank.label("rank")
+        return self.db.execute(
+            self._select_chunks(collection_id, rank)
+            .where(condition)
+            .order_by(rank.desc(), Chunk.id)
+            .limit(limit)
+        ).all()
+
+    def get_text_search_config(self, user_id: str) -> TextSearchConfig:
+        """Text-search configuration derived from the user's AI preference."""
+        preference = (
+            self.db.query(UserAiPreference)
+            .filter(UserAiPreference.user_id == user_id)
+            .first()
+        )
+        return TextSearchConfig.from_preference(preference)
+
+    def search_chunks(
+        self,
+        collection_id: str,
+        query: str,
+        k: int = 10,
+        ef_search: Optional[int] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> List[ChunkSearchResult]:
+        """Return the `k` chunks of a collection nearest to the query embedding.
+
+        Only the columns needed for the response are selected, so no Document
+        or Chunk objects are hydrated, and ordering by cosine distance lets
+        the HNSW index drive the scan. `embedding` is the query's embedding
+        when the caller has already computed it.
+        """
+        if embedding is None:
+            embedding = self.embed_query(query)
+        rows = self._vector_ranking(collection_id, embedding, k, ef_search)
+        return [self._to_result(row, 1 - row.distance) for row in rows]
+
+    def hybrid_search(
+        self,
+        collection_id: str,
+        query: str,
+        k: int = 10,
+        text_config: Optional[TextSearchConfig] = None,
+        ef_search: Optional[int] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> List[ChunkSearchResult]:
+        """Return the top `k` chunks by reciprocal rank fusion of vector and full-text search.
+
+        Both rankings run on the request's session, one after the other, and
+        the fused score is returned as the result score.
+        """
+        text_config = text_config or TextSearchConfig()
+        candidates = min(k * HYBRID_CANDIDATE_FACTOR, MAX_HYBRID_CANDIDATES)
+        if embedding is None:
+            embedding = self.embed_query(query)
+
+        rankings = [
+            self._vector_ranking(collection_id, embedding, candidates, ef_search),
+            self._lexical_ranking(collection_id, query, candidates, text_config),
+        ]
+        fused = reciprocal_rank_fusion(rankings)[:k]
+        return [self._to_result(row, score) for row, score in fused]
+
+
+class AsyncSearchService(AsyncService[SearchService]):
+    """SearchService on an AsyncSession; queries are embedded in the threadpool."""
+
+    service_class = SearchService
+
+    async def search_chunks(
+        self,
+        collection_id: str,
+        query: str,
+        k: int = 10,
+        ef_search: Optional[int] = None,
+    ) -> List[ChunkSearchResult]:
+        embedding = await run_in_threadpool(self.sync.embed_query, query)
+        return await self.run(
+            lambda service: service.search_chunks(
+                collection_id, query, k, ef_search, embedding=embedding
+            )
+        )
+
+    async def hybrid_search(
+        self,
+        collection_id: str,
+        query: str,
+        k: int = 10,
+        text_config: Optional[TextSearchConfig] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[ChunkSearchResult]:
+        embedding = await run_in_threadpool(self.sync.embed_query, query)
+        return await self.run(
+            lambda service: service.hybrid_search(
+                collection_id, query, k, text_config, ef_search, embedding=embedding
+            )
+        )
@@ -1,8 +1,16 @@
 from fastapi import Depends
-from .service import StorageService
-from ...db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from .service import AsyncStorageService, StorageService
+from ...db import get_async_db, get_db
 
 
 def get_storage_service(db=Depends(get_db)) -> StorageService:
     """Get storage service instance."""
     return StorageService(db)
+
+
+def get_async_storage_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncStorageService:
+    """Get async storage service instance."""
+    return AsyncStorageService(db)
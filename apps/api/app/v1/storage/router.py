@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    UploadFile,
+    File,
+    Request,
+)
 from typing import List
 
-from .schemas import FileResponse
-from .service import StorageService
-from .dependencies import get_storage_service
+from .schemas import FileDigestRequest, FileResponse
+from .service import AsyncStorageService
+from .dependencies import get_async_storage_service
 from ..user.dependencies import get_current_user
 from ..models.user import User
 
@@ -20,7 +28,7 @@ async def upload_file(
     file: UploadFile = File(...),
     resource: str = File(...),
     current_user: User = Depends(get_current_user),
-    storage_service: StorageService = Depends(get_storage_service),
+    storage_service: AsyncStorageService = Depends(get_async_storage_service),
 ) -> FileResponse:
     """Upload a file to storage."""
 
@@ -36,18 +44,78 @@ async def upload_file(
     )
 
 
+@router.post(
+    "/upload/stream",
+    response_model=FileResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def upload_file_stream(
+    request: Request,
+    filename: str,
+    resource: str,
+    current_user: User = Depends(get_current_user),
+    storage_service: AsyncStorageService = Depends(get_async_storage_service),
+) -> FileResponse:
+    """Upload a raw request body to storage as it arrives.
+
+    The body is the file content itself (not multipart form data) and is piped
+    straight into a multipart object upload, so large files are neither
+    buffered to disk nor held in memory.
+    """
+
+    if not filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="No filename provided"
+        )
+
+    return await storage_service.upload_stream_to_storage(
+        request.stream(),
+        filename=filename,
+        content_type=request.headers.get("content-type"),
+        user_id=current_user.id,
+        resource=resource,
+    )
+
+
+@router.post(
+    "/files/by-digest",
+    response_model=FileResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_file_from_digest(
+    file_data: FileDigestRequest,
+    current_user: User = Depends(get_current_user),
+    storage_service: AsyncStorageService = Depends(get_async_storage_service),
+) -> FileResponse:
+    """Register a file by content digest, skipping the upload when it is already stored."""
+
+    file = await storage_service.create_file_from_digest(
+        digest=file_data.digest.lower(),
+        filename=file_data.filename,
+        content_type=file_data.content_type,
+        user_id=current_user.id,
+        resource=file_data.resource,
+    )
+    if not file:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Content not found, upload the file instead",
+        )
+    return file
+
+
 @router.get(
     "/files",
     response_model=List[FileResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_user_files(
+async def get_user_files(
     current_user: User = Depends(get_current_user),
-    storage_service: StorageService = Depends(get_storage_service),
+    storage_service: AsyncStorageService = Depends(get_async_storage_service),
 ) -> List[FileResponse]:
     """Get all files uploaded by the current user."""
 
-    return storage_service.get_user_files(current_user.id)
+    return await storage_service.get_user_files(current_user.id)
 
 
 @router.get(
@@ -55,26 +123,26 @@ def get_user_files(
     response_model=FileResponse,
     status_code=status.HTTP_200_OK,
 )
-def get_file(
+async def get_file(
     file_id: str,
     current_user: User = Depends(get_current_user),
-    storage_service: StorageService = Depends(get_storage_service),
+    storage_service: AsyncStorageService = Depends(get_async_storage_service),
 ) -> FileResponse:
     """Get a specific file by ID."""
 
-    return storage_service.get_file_by_id(file_id, current_user.id)
+    return await storage_service.get_file_by_id(file_id, current_user.id)
 
 
 @router.delete(
     "/files/{file_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_file(
+async def delete_file(
     file_id: str,
     current_user: User = Depends(get_current_user),
-    storage_service: StorageService = Depends(get_storage_service),
+    storage_service: AsyncStorageService = Depends(get_async_storage_service),
 ):
     """Delete a file by ID."""
 
-    storage_service.delete_file(file_id, current_user.id)
+    await storage_service.delete_file(file_id, current_user.id)
     return None
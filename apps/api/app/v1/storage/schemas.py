@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -15,3 +15,11 @@ class FileResponse(BaseModel):
     type: str
     resource: str
     url: str
+    digest: Optional[str] = None
+
+
+class FileDigestRequest(BaseModel):
+    digest: str = Field(..., description="sha256 hex digest of the file content")
+    filename: str
+    content_type: str
+    resource: str
@@ -1,18 +1,36 @@
+import asyncio
 import json
 import logging
 import uuid
+from collections import Counter
+from collections.abc import AsyncIterable
 from datetime import datetime, timezone
-from typing import Optional
+from typing import BinaryIO, Optional, cast
 from uuid import UUID
 from fastapi import HTTPException, status, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from minio import Minio
 from minio.error import S3Error
+from minio.helpers import MIN_PART_SIZE
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from ...config import get_settings
+from ...utils.async_service import AsyncService
+from ...utils.metrics import metrics
 from .schemas import FileResponse
-from ..models.file import File
+from .streaming import (
+    AsyncIterableReader,
+    StoredObject,
+    UploadTimer,
+    iter_upload_file,
+)
+from ..models.file import File, FileBlob
+
+# Buckets already verified by this process; skips a round-trip per upload
+_known_buckets: set[str] = set()
 
 
 class StorageService:
@@ -36,6 +54,8 @@ class StorageService:
 
     def ensure_bucket_exists(self, bucket_name: Optional[str] = None) -> None:
         bucket_name = bucket_name or self.settings.MINIO_BUCKET_NAME
+        if bucket_name in _known_buckets:
+            return
         try:
             if not self.client.bucket_exists(bucket_name):
                 self.client.make_bucket(bucket_name)
@@ -62,6 +82,7 @@ class StorageService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to create bucket: {e}",
             ) from e
+        _known_buckets.add(bucket_name)
 
     def _get_display_name(self, file: File) -> Optional[str]:
         """Resolve display name from uploader."""
@@ -91,30 +112,52 @@ class StorageService:
         resp.url = f"{scheme}://{self.settings.MINIO_ENDPOINT}/{file.url}"
         return resp
 
-    async def upload_file_to_storage(
+    @property
+    def part_size(self) -> int:
+        return max(self.settings.MINIO_PART_SIZE, MIN_PART_SIZE)
+
+    def _put_stream(
         self,
-        file: UploadFile,
-        user_id: UUID,
-        resource: str,
+        reader: AsyncIterableReader,
+        bucket_name: str,
+        object_name: str,
+        content_type: Optional[str],
+    ) -> None:
+        """Blocking multipart upload of an unknown-length stream."""
+        self.client.put_object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            # put_object only calls read() on its data
+            data=cast(BinaryIO, reader),
+            length=-1,
+            content_type=content_type or "application/octet-stream",
+            part_size=self.part_size,
+            num_parallel_uploads=self.settings.MINIO_PARALLEL_UPLOADS,
+        )
+
+    async def stream_to_storage(
+        self,
+        chunks: AsyncIterable[bytes],
+        content_type: Optional[str],
         object_name: Optional[str] = None,
         bucket_name: Optional[str] = None,
-    ) -> FileResponse:
+    ) -> StoredObject:
+        """Pipe an async byte stream into a MinIO object without touching the DB.
+
+        The blocking MinIO client runs in the threadpool and pulls parts from
+        the stream as they arrive, so the event loop stays free and the body
+        is never spooled to disk.
+        """
         bucket_name = bucket_name or self.settings.MINIO_BUCKET_NAME
-        self.ensure_bucket_exists(bucket_name)
+        await run_in_threadpool(self.ensure_bucket_exists, bucket_name)
         object_name = object_name or f"{uuid.uuid4()}"
+        content_type = content_type or "application/octet-stream"
 
+        reader = AsyncIterableReader(chunks, asyncio.get_running_loop())
+        timer = UploadTimer(self.part_size)
         try:
-            # Get file size by seeking to the end of the file-like object
-            file.file.seek(0, 2)
-            file_size = file.file.tell()
-            file.file.seek(0)  # Rewind to the start for reading
-
-            self.client.put_object(
-                bucket_name=bucket_name,
-                object_name=object_name,
-                data=file.file,
-                length=file_size,
-                content_type=file.content_type,
+            await run_in_threadpool(
+                self._put_stream, reader, bucket_name, object_name, content_type
             )
         except Exception as e:
             raise HTTPException(
@@ -122,20 +165,197 @@ class StorageService:
                 detail=f"Failed to upload file to storage: {e}",
             ) from e
 
+        stats = timer.finish(reader.bytes_read)
+        metrics.increment("storage.upload.objects")
+        metrics.increment("storage.upload.bytes", stats.bytes)
+        metrics.increment("storage.upload.parts", stats.parts)
+        metrics.observe("storage.upload.bytes_per_second", stats.bytes_per_second)
+        logging.info(
+            f"Uploaded '{bucket_name}/{object_name}': {stats.bytes} bytes in "
+            f"{stats.parts} part(s) of {stats.part_size} bytes, "
+            f"{stats.bytes_per_second / (1024 * 1024):.2f} MiB/s"
+        )
+
+        return StoredObject(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            size=stats.bytes,
+            content_type=content_type,
+            digest=reader.digest,
+            stats=stats,
+        )
+
+    def acquire_blobs(self, stored_objects: list[StoredObject]) -> dict[str, str]:
+        """Take one blob reference per stored object in the current transaction.
+
+        Returns the canonical object url for each digest. An object whose
+        digest was already stored is a redundant copy; see `redundant_objects`.
+        """
+        if not stored_objects:
+            return {}
+
+        first_by_digest: dict[str, StoredObject] = {}
+        for stored in stored_objects:
+            first_by_digest.setdefault(stored.digest, stored)
+        ref_counts = Counter(stored.digest for stored in stored_objects)
+
+        # Sorted rows keep lock order stable across concurrent uploads
+        rows = [
+            {
+                "digest": digest,
+                "url": first_by_digest[digest].url,
+                "size": first_by_digest[digest].size,
+                "ref_count": ref_counts[digest],
+            }
+            for digest in sorted(first_by_digest)
+        ]
+        stmt = pg_insert(FileBlob).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FileBlob.digest],
+            set_={"ref_count": FileBlob.ref_count + stmt.excluded.ref_count},
+        ).returning(FileBlob.digest, FileBlob.url)
+
+        return {digest: url for digest, url in self.db.execute(stmt).all()}
+
+    @staticmethod
+    def redundant_objects(
+        stored_objects: list[StoredObject], blob_urls: dict[str, str]
+    ) -> list[StoredObject]:
+        """Uploaded objects that duplicate an existing blob and can be removed."""
+        return [
+            stored
+            for stored in stored_objects
+            if blob_urls[stored.digest] != stored.url
+        ]
+
+    def _release_blob(self, digest: str) -> Optional[str]:
+        """Drop one reference to a blob; return its url if it is now unused."""
+        remaining = self.db.execute(
+            update(FileBlob)
+            .where(FileBlob.digest == digest)
+            .values(ref_count=FileBlob.ref_count - 1)
+            .returning(FileBlob.ref_count, FileBlob.url)
+        ).first()
+        if remaining is None or remaining.ref_count > 0:
+            return None
+
+        self.db.execute(delete(FileBlob).where(FileBlob.digest == digest))
+        return remaining.url
+
+    def build_file_values(
+        self,
+        stored: StoredObject,
+        filename: str,
+        user_id: UUID,
+        resource: str,
+        blob_urls: Optional[dict[str, str]] = None,
+    ) -> dict:
+        """Column values for a File row describing a stored object.
+
+        When `blob_urls` from `acquire_blobs` is given, the row points at the
+        shared blob instead of the uploaded copy.
+        """
+        url = blob_urls[stored.digest] if blob_urls else stored.url
+        return {
+            "upload_by": user_id,
+            "upload_at": datetime.now(timezone.utc),
+            "name": filename,
+            "size": stored.size,
+            "type": stored.content_type,
+            "url": url,
+            "resource": resource,
+            "digest": stored.digest if blob_urls else None,
+        }
+
+    def _record_file(
+        self,
+        stored: StoredObject,
+        filename: str,
+        user_id: UUID,
+        resource: str,
+    ) -> tuple[FileResponse, list[StoredObject]]:
+        """Insert the File row for a stored object without touching MinIO.
+
+        Returns the file and the uploaded objects left redundant by it.
+        """
+        try:
+            blob_urls = self.acquire_blobs([stored])
+            new_file = File(
+                **self.build_file_values(
+                    stored, filename, user_id, resource, blob_urls=blob_urls
+                )
+            )
+            self.db.add(new_file)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {e}",
+            ) from e
+
+        self.db.refresh(new_file)
+        return (
+            self._file_to_response(new_file),
+            self.redundant_objects([stored], blob_urls),
+        )
+
+    def create_file_from_digest(
+        self,
+        digest: str,
+        filename: str,
+        content_type: str,
+        user_id: UUID,
+        resource: str,
+    ) -> Optional[FileResponse]:
+        """Record a File for content the user has uploaded before, without a transfer.
+
+        Only blobs already referenced by one of the user's own files qualify, so
+        knowing a digest alone does not grant access to someone else's content.
+        Returns None when the content has to be uploaded.
+        """
+        owned = (
+            self.db.query(File.id)
+            .filter(File.digest == digest, File.upload_by == user_id)
+            .first()
+        )
+        if not owned:
+            return None
+
+        blob = self.db.execute(
+            update(FileBlob)
+            .where(FileBlob.digest == digest, FileBlob.ref_count > 0)
+            .values(ref_count=FileBlob.ref_count + 1)
+            .returning(FileBlob.url, FileBlob.size)
+        ).first()
+        if not blob:
+            self.db.rollback()
+            return None
+
         new_file = File(
             upload_by=user_id,
             upload_at=datetime.now(timezone.utc),
-            name=file.filename,
-            size=file_size,
-            type=file.content_type,
-            url=f"{bucket_name}/{object_name}",
+            name=filename,
+            size=blob.size,
+            type=content_type,
+            url=blob.url,
             resource=resource,
+            digest=digest,
         )
         self.db.add(new_file)
         self.db.commit()
         self.db.refresh(new_file)
+        metrics.increment("storage.upload.deduplicated")
         return self._file_to_response(new_file)
 
+    def remove_stored_objects(self, stored_objects: list[StoredObject]) -> None:
+        """Best-effort removal of uploaded objects that no File row points at."""
+        for stored in stored_objects:
+            try:
+                self.client.remove_object(stored.bucket_name, stored.object_name)
+            except S3Error as e:
+                logging.warning(f"Failed to remove orphaned object '{stored.url}': {e}")
+
     def get_user_files(self, user_id: UUID) -> list[FileResponse]:
         try:
             files = self.db.query(File).filter(File.upload_by == user_id).all()
@@ -172,6 +392,16 @@ class StorageService:
             ) from e
 
     def delete_file(self, file_id: str, user_id: UUID) -> None:
+        unused_url = self._delete_file_record(file_id, user_id)
+        if unused_url:
+            self._remove_object_by_url(unused_url)
+
+    def _delete_file_record(self, file_id: str, user_id: UUID) -> Optional[str]:
+        """Delete a user's file row and return the url of an object nothing references any more.
+
+        The row is committed away before the object is removed, so a failed
+        removal leaves an orphaned object rather than a row pointing nowhere.
+        """
         try:
             file_uuid = UUID(file_id)
         except ValueError:
@@ -190,21 +420,100 @@ class StorageService:
                     status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
                 )
 
-            try:
-                bucket_name, object_name = file.url.split("/", 1)
-                self.client.remove_object(bucket_name, object_name)
-            except S3Error as e:
-                self.db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to delete file from storage: {e}",
-                ) from e
+            if file.digest:
+                self.db.delete(file)
+                self.db.flush()
+                unused_url = self._release_blob(file.digest)
+            else:
+                unused_url = file.url
+                self.db.delete(file)
 
-            self.db.delete(file)
             self.db.commit()
+            return unused_url
         except SQLAlchemyError as e:
             self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error: {e}",
             ) from e
+
+    def read_object(self, url: str) -> bytes:
+        """Read a whole object given its `bucket/object` url."""
+        bucket_name, object_name = url.split("/", 1)
+        response = self.client.get_object(bucket_name, object_name)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    def _remove_object_by_url(self, url: str) -> None:
+        """Remove an object whose last reference is gone; failures leave an orphan."""
+        try:
+            bucket_name, object_name = url.split("/", 1)
+            self.client.remove_object(bucket_name, object_name)
+        except S3Error as e:
+            logging.warning(f"Failed to remove unreferenced object '{url}': {e}")
+
+
+class AsyncStorageService(AsyncService[StorageService]):
+    """StorageService on an AsyncSession; MinIO calls run in the threadpool."""
+
+    service_class = StorageService
+
+    async def upload_stream_to_storage(
+        self,
+        chunks: AsyncIterable[bytes],
+        filename: str,
+        content_type: Optional[str],
+        user_id: UUID,
+        resource: str,
+        object_name: Optional[str] = None,
+        bucket_name: Optional[str] = None,
+    ) -> FileResponse:
+        stored = await self.sync.stream_to_storage(
+            chunks,
+            content_type=content_type,
+            object_name=object_name,
+            bucket_name=bucket_name,
+        )
+        try:
+            file, redundant = await self.run(
+                lambda service: service._record_file(
+                    stored, filename, user_id, resource
+                )
+            )
+        except HTTPException:
+            await run_in_threadpool(self.sync.remove_stored_objects, [stored])
+            raise
+
+        await run_in_threadpool(self.sync.remove_stored_objects, redundant)
+        return file
+
+    async def upload_file_to_storage(
+        self,
+        file: UploadFile,
+        user_id: UUID,
+        resource: str,
+        object_name: Optional[str] = None,
+        bucket_name: Optional[str] = None,
+    ) -> FileResponse:
+        return await self.upload_stream_to_storage(
+            iter_upload_file(file),
+            filename=file.filename or "unknown",
+            content_type=file.content_type,
+            user_id=user_id,
+            resource=resource,
+            object_name=object_name,
+            bucket_name=bucket_name,
+        )
+
+    async def delete_file(self, file_id: str, user_id: UUID) -> None:
+        unused_url = await self.run(
+            lambda service: service._delete_file_record(file_id, user_id)
+        )
+        if unused_url:
+            await run_in_threadpool(self.sync._remove_object_by_url, unused_url)
+
+    async def read_object(self, url: str) -> bytes:
+        return await run_in_threadpool(self.sync.read_object, url)
@@ -0,0 +1,132 @@
+"""Helpers for streaming request bodies into MinIO multipart uploads."""
+
+import asyncio
+import hashlib
+import math
+import time
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import UploadFile
+
+# Size of each read from an UploadFile when re-streaming it to storage
+UPLOAD_READ_SIZE = 1024 * 1024
+
+
+@dataclass
+class UploadStats:
+    """Throughput figures for a single object upload."""
+
+    bytes: int = 0
+    parts: int = 0
+    part_size: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return float(self.bytes)
+        return self.bytes / self.elapsed_seconds
+
+
+@dataclass
+class StoredObject:
+    """An object written to the bucket, before any database row exists."""
+
+    bucket_name: str
+    object_name: str
+    size: int
+    digest: str  # sha256 hex digest of the content
+    content_type: Optional[str] = None
+    stats: UploadStats = field(default_factory=UploadStats)
+
+    @property
+    def url(self) -> str:
+        return f"{self.bucket_name}/{self.object_name}"
+
+
+class AsyncIterableReader:
+    """Blocking, file-like view over an async byte stream.
+
+    The MinIO client runs in a worker thread and calls `read()`; each call
+    pulls chunks from the async iterator on the event loop until `size` bytes
+    are buffered. Nothing is read ahead of the part currently being filled,
+    so memory stays bounded by the part size and no temp file is needed.
+    The content is hashed as it passes through.
+    """
+
+    def __init__(
+        self, chunks: AsyncIterable[bytes], loop: asyncio.AbstractEventLoop
+    ) -> None:
+        self._chunks: AsyncIterator[bytes] = chunks.__aiter__()
+        self._loop = loop
+        self._buffer = bytearray()
+        self._eof = False
+        self._hasher = hashlib.sha256()
+        self.bytes_read = 0
+
+    @property
+    def digest(self) -> str:
+        """sha256 hex digest of everything read so far."""
+        return self._hasher.hexdigest()
+
+    async def _next_chunk(self) -> Optional[bytes]:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def _fill(self, size: int) -> None:
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            chunk = asyncio.run_coroutine_threadsafe(
+                self._next_chunk(), self._loop
+            ).result()
+            if chunk is None:
+                self._eof = True
+            elif chunk:
+                self._buffer += chunk
+
+    def read(self, size: int = -1) -> bytes:
+        self._fill(size)
+        if size < 0 or size >= len(self._buffer):
+            data = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        self.bytes_read += len(data)
+        self._hasher.update(data)
+        return data
+
+
+async def iter_upload_file(
+    file: UploadFile, read_size: int = UPLOAD_READ_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield an UploadFile's content in fixed-size reads."""
+    await file.seek(0)
+    while chunk := await file.read(read_size):
+        yield chunk
+
+
+def count_parts(size: int, part_size: int) -> int:
+    """Number of parts MinIO uses for an object of `size` bytes."""
+    if size <= part_size:
+        return 1
+    return math.ceil(size / part_size)
+
+
+class UploadTimer:
+    """Measure an upload and turn it into UploadStats."""
+
+    def __init__(self, part_size: int) -> None:
+        self.part_size = part_size
+        self._started = time.perf_counter()
+
+    def finish(self, size: int) -> UploadStats:
+        return UploadStats(
+            bytes=size,
+            parts=count_parts(size, self.part_size),
+            part_size=self.part_size,
+            elapsed_seconds=time.perf_counter() - self._started,
+        )
@@ -1,10 +1,11 @@
 from fastapi import Depends, Request, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .service import UserService
+from .service import AsyncUserService, UserService
 from ..models.user import User
 
-from ...db import get_db
+from ...db import get_async_db, get_db
 from ...config import get_settings
 
 
@@ -15,11 +16,23 @@ def get_user_service(db: Session = Depends(get_db)) -> UserService:
     return UserService(db, settings.SECRET_KEY)
 
 
-def get_current_user(
+def get_async_user_service(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncUserService:
+    """Get async user service instance."""
+
+    return AsyncUserService(db)
+
+
+async def get_current_user(
     request: Request,
-    user_service: UserService = Depends(get_user_service),
+    user_service: AsyncUserService = Depends(get_async_user_service),
 ) -> User:
-    """Get current user from session cookie."""
+    """Get current user from session cookie.
+
+    The user is a detached copy, so commits made later in the request do
+    not expire it.
+    """
     session_id = request.cookies.get("session_id")
 
     if not session_id:
@@ -28,4 +41,4 @@ def get_current_user(
             detail="Not authenticated",
         )
 
-    return user_service.get_current_user(session_id)
+    return await user_service.get_current_user(session_id)
@@ -13,8 +13,8 @@ from .schemas import (
     LanguagePreferenceModel,
     StopwordsModel,
 )
-from .service import UserService
-from .dependencies import get_user_service, get_current_user
+from .service import AsyncUserService
+from .dependencies import get_async_user_service, get_current_user
 from ..models.user import User
 from ...utils.response import CommonResponse
 
@@ -26,13 +26,13 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
     response_model=CommonResponse[UserRegisterResponse],
     status_code=status.HTTP_201_CREATED,
 )
-def register(
+async def register(
     user_data: UserRegisterRequest,
-    user_service: UserService = Depends(get_user_service),
+    user_service: AsyncUserService = Depends(get_async_user_service),
 ) -> CommonResponse[UserRegisterResponse]:
     """Register a new user with enhanced cookie session."""
 
-    user = user_service.create_user(
+    user = await user_service.create_user(
         username=user_data.username,
         email=user_data.email,
         password=user_data.password,
@@ -53,14 +53,14 @@ def register(
     response_model=CommonResponse[UserLoginResponse],
     status_code=status.HTTP_200_OK,
 )
-def login(
+async def login(
     login_data: UserLoginRequest,
     response: Response,
-    user_service: UserService = Depends(get_user_service),
+    user_service: AsyncUserService = Depends(get_async_user_service),
 ) -> CommonResponse[UserLoginResponse]:
     """Login a user to system"""
 
-    user, session_id = user_service.authenticate_user(
+    user, session_id = await user_service.authenticate_user(
         email=login_data.email,
         password=login_data.password,
         remember_me=login_data.remember_me or False,
@@ -94,16 +94,16 @@ def login(
     response_model=CommonResponse[dict],
     status_code=status.HTTP_200_OK,
 )
-def logout(
+async def logout(
     request: Request,
     response: Response,
-    user_service: UserService = Depends(get_user_service),
+    user_service: AsyncUserService = Depends(get_async_user_service),
 ) -> CommonResponse[dict]:
     """Logout current user"""
 
     session_id = request.cookies.get("session_id")
     if session_id:
-        user_service.logout_user(session_id)
+        await user_service.logout_user(session_id)
 
     # Clear the session cookie
     response.delete_cookie(key="session_id")
@@ -119,7 +119,7 @@ def logout(
     response_model=CommonResponse[UserLoginResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_current_user_info(
+async def get_current_user_info(
     current_user: User = Depends(get_current_user),
 ) -> CommonResponse[UserLoginResponse]:
     """Get current user information"""
@@ -139,9 +139,9 @@ def get_current_user_info(
     response_model=CommonResponse[AuthStatusResponse],
     status_code=status.HTTP_200_OK,
 )
-def check_auth_status(
+async def check_auth_status(
     request: Request,
-    user_service: UserService = Depends(get_user_service),
+    user_service: AsyncUserService = Depends(get_async_user_service),
 ) -> CommonResponse[AuthStatusResponse]:
     """Check if user is currently logged in based on session cookie."""
 
@@ -155,7 +155,7 @@ def check_auth_status(
 
     try:
         # Try to get current user to validate session
-        user_service.get_current_user(session_id)
+        await user_service.get_current_user(session_id)
         return CommonResponse[AuthStatusResponse](
             message="User is authenticated",
             detail=AuthStatusResponse(logged_in=True),
@@ -172,14 +172,14 @@ def check_auth_status(
     response_model=CommonResponse[UserEditResponse],
     status_code=status.HTTP_200_OK,
 )
-def edit_user(
+async def edit_user(
     user_data: UserEditRequest,
     current_user: User = Depends(get_current_user),
-    user_service: UserService = Depends(get_user_service),
+    user_service: AsyncUserService = Depends(get_async_user_service),
 ) -> CommonResponse[UserEditResponse]:
     """Edit current user information."""
 
-    updated_user = user_service.edit_user(
+    updated_user = await user_service.edit_user(
         user_id=str(current_user.id),
         display=user_data.display,
     )
@@ -197,13 +197,13 @@ def edit_user(
     response_model=CommonResponse[UserAiPreferenceResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_user_ai_preferences(
+async def get_user_ai_preferences(
     current_user: User = Depends(get_current_user),
-    user_service: UserService = Depends(get_user_service),
+    user_service: AsyncUserService = Depends(get_async_user_service),
 ) -> CommonResponse[UserAiPreferenceResponse]:
     """Get current user AI preferences."""
 
-    preference = user_service.get_user_ai_preference(str(current_user.id))
+    preference = await user_service.get_user_ai_preference(str(current_user.id))
 
     if not preference:
         raise HTTPException(
@@ -238,19 +238,19 @@ def get_user_ai_preferences(
     response_model=CommonResponse[UserAiPreferenceResponse],
     status_code=status.HTTP_200_OK,
 )
-def update_user_ai_preferences(
+async def update_user_ai_preferences(
     preference_data: UserAiPreferenceRequest,
     current_user: User = Depends(get_current_user),
-    user_service: UserService = Depends(get_user_service),
+    user_service: AsyncUserService = Depends(get_async_user_service),
 ) -> CommonResponse[UserAiPreferenceResponse]:
     """Update current user AI preferences. Creates if doesn't exist."""
 
     # Try to get existing preference
-    preference = user_service.get_user_ai_preference(str(current_user.id))
+    preference = await user_service.get_user_ai_preference(str(current_user.id))
 
     if preference:
         # Update existing preference
-        updated_preference = user_service.update_user_ai_preference(
+        updated_preference = await user_service.update_user_ai_preference(
             user_id=str(current_user.id),
             call=preference_data.call,
             skillset=preference_data.skillset,
@@ -264,7 +264,7 @@ def update_user_ai_preferences(
         )
     else:
         # Create new preference if doesn't exist
-        updated_preference = user_service.create_user_ai_preference(
+        updated_preference = await user_service.create_user_ai_preference(
             user_id=str(current_user.id),
             call=preference_data.call,
             skillset=preference_data.skillset,
@@ -2,14 +2,46 @@ from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 import bcrypt
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from fastapi import HTTPException, status
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session, joinedload
 
+from ...config import get_settings
+from ...utils.async_service import AsyncService
+from ...utils.cache import TTLCache
+from ...utils.hashing import HashingPool, HashingPoolSaturated
+
 from ..models.user import Account, User, Session as UserSession, UserAiPreference
 
 
+class CachedSession(NamedTuple):
+    """Column values of a session's user, and when the session expires."""
+
+    user: dict
+    expires_at: Optional[datetime]
+
+
+session_cache: TTLCache[str, CachedSession] = TTLCache(
+    "auth.session_cache",
+    max_size=get_settings().SESSION_CACHE_MAX_SIZE,
+    ttl_seconds=get_settings().SESSION_CACHE_TTL_SECONDS,
+)
+
+password_hasher = HashingPool(
+    "auth.password_hashing",
+    workers=get_settings().PASSWORD_HASH_WORKERS,
+    max_queue=get_settings().PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
 class UserService:
     """Authentication service for handling user auth operations."""
 
@@ -50,12 +82,11 @@ class UserService:
                 detail="Invalid session",
             )
 
-        expires_at = session.expires_at
-        if expires_at and expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        expires_at = _as_utc(session.expires_at)
 
         if expires_at and expires_at < datetime.now(timezone.utc):
             # Expired session — delete it atomically
+            session_cache.pop(session_id)
             with self.db.begin():
                 self.db.delete(session)
 
@@ -69,6 +100,7 @@ class UserService:
     def delete_session(self, session_id: str) -> None:
         """Delete a session."""
 
+        session_cache.pop(session_id)
         session = (
             self.db.query(UserSession).filter(UserSession.id == session_id).first()
         )
@@ -76,6 +108,36 @@ class UserService:
             self.db.delete(session)
             self.db.commit()
 
+    def delete_expired_sessions(self, batch_size: int) -> int:
+        """Delete up to `batch_size` expired sessions and return how many went.
+
+        Rows locked by a concurrent sweeper or request are skipped, so
+        several processes can sweep at once.
+        """
+
+        expired = (
+            select(UserSession.id)
+            .where(UserSession.expires_at < datetime.now(timezone.utc))
+            .order_by(UserSession.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        deleted = (
+            self.db.execute(
+                delete(UserSession)
+                .where(UserSession.id.in_(expired.scalar_subquery()))
+                .returning(UserSession.id)
+                .execution_options(synchronize_session=False)
+            )
+            .scalars()
+            .all()
+        )
+        self.db.commit()
+
+        for session_id in deleted:
+            session_cache.pop(str(session_id))
+        return len(deleted)
+
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt with random salt."""
         return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
@@ -84,8 +146,18 @@ class UserService:
         """Verify a password against its hash."""
         return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
 
-    def create_user(self, username: str, email: str, password: str) -> User:
-        """Create a new user with account and AI preference."""
+    def create_user(
+        self,
+        username: str,
+        email: str,
+        password: str,
+        password_hash: Optional[str] = None,
+    ) -> User:
+        """Create a new user with account and AI preference.
+
+        `password_hash` lets callers hash the password elsewhere, e.g. off the
+        event loop.
+        """
 
         existing_user = (
             self.db.query(User)
@@ -110,7 +182,9 @@ class UserService:
         self.db.flush()
 
         account = Account(
-            id=str(uuid4()), password=self.hash_password(password), user_id=user.id
+            id=str(uuid4()),
+            password=password_hash or self.hash_password(password),
+            user_id=user.id,
         )
         self.db.add(account)
 
@@ -134,6 +208,21 @@ class UserService:
     ) -> tuple[User, str]:
         """Authenticate the user and return user with session ID"""
 
+        user = self.get_user_for_login(email)
+
+        if not self.verify_password(password, user.account.password):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password",
+            )
+
+        session_id = self.create_session(user.id, remember_me)
+
+        return user, session_id
+
+    def get_user_for_login(self, email: str) -> User:
+        """Get the user with their account loaded, or raise 401."""
+
         user = (
             self.db.query(User)
             .options(joinedload(User.account))
@@ -147,18 +236,29 @@ class UserService:
                 detail="Invalid email or password",
             )
 
-        if not self.verify_password(password, user.account.password):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid email or password",
-            )
-
-        session_id = self.create_session(user.id, remember_me)
+        return user
 
-        return user, session_id
+    def get_cached_user(self, session_id: str) -> Optional[User]:
+        """Get the user of a cached, unexpired session without querying."""
+        cached = session_cache.get(session_id)
+        if cached is None:
+            return None
+        if cached.expires_at and cached.expires_at < datetime.now(timezone.utc):
+            # Let get_current_user delete the session and reject it
+            session_cache.pop(session_id)
+            return None
+        return User(**cached.user)
 
     def get_current_user(self, session_id: str) -> User:
-        """Get current user from session ID."""
+        """Get current user from session ID.
+
+        Answered from `session_cache` when possible. The returned user is a
+        detached copy of the cached columns; reload it before changing it.
+        """
+        user = self.get_cached_user(session_id)
+        if user is not None:
+            return user
+
         session = self.get_session(session_id)
 
         user = self.db.query(User).filter(User.id == session.user_id).first()
@@ -168,7 +268,14 @@ class UserService:
                 detail="User not found",
             )
 
-        return user
+        snapshot = {
+            column.key: getattr(user, column.key)
+            for column in User.__mapper__.column_attrs
+        }
+        session_cache.set(
+            session_id, CachedSession(snapshot, _as_utc(session.expires_at))
+        )
+        return User(**snapshot)
 
     def logout_user(self, session_id: str) -> None:
         """Logout user by deleting session."""
@@ -232,6 +339,7 @@ class UserService:
 
         self.db.commit()
         self.db.refresh(user)
+        session_cache.discard_where(lambda _, cached: cached.user["id"] == user.id)
 
         return user
 
@@ -309,3 +417,55 @@ class UserService:
 
         self.db.delete(preference)
         self.db.commit()
+
+
+class AsyncUserService(AsyncService[UserService]):
+    """UserService on an AsyncSession, with bcrypt work on `password_hasher`."""
+
+    def create_service(self, db: Session) -> UserService:
+        return UserService(db, get_settings().SECRET_KEY)
+
+    async def _hash(self, fn, *args):
+        try:
+            return await password_hasher.run(fn, *args)
+        except HashingPoolSaturated:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many sign-in attempts in progress. Please retry shortly.",
+                headers={"Retry-After": "1"},
+            )
+
+    async def create_user(self, username: str, email: str, password: str) -> User:
+        password_hash = await self._hash(self.sync.hash_password, password)
+        return await self.run(
+            lambda service: service.create_user(
+                username, email, password, password_hash=password_hash
+            )
+        )
+
+    async def authenticate_user(
+        self, email: str, password: str, remember_me: bool = False
+    ) -> tuple[User, str]:
+        user = await self.run(lambda service: service.get_user_for_login(email))
+
+        if not await self._hash(
+            self.sync.verify_password, password, user.account.password
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password",
+            )
+
+        session_id = await self.run(
+            lambda service: service.create_session(user.id, remember_me)
+        )
+        # The commit expired the user; reload it while I/O is still allowed
+        await self.db.refresh(user)
+        return user, session_id
+
+    async def get_current_user(self, session_id: str) -> User:
+        # Cache hits need no database access, so skip the greenlet hop
+        user = self.sync.get_cached_user(session_id)
+        if user is not None:
+            return user
+        return await self.run(lambda service: service.get_current_user(session_id))
@@ -0,0 +1,50 @@
+"""Periodic deletion of expired sessions."""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from ...config import get_settings
+from ...db import SessionLocal
+from ...utils.metrics import metrics
+from .service import UserService
+
+
+def sweep_expired_sessions(batch_size: Optional[int] = None) -> int:
+    """Delete every expired session, one committed batch at a time."""
+    settings = get_settings()
+    batch_size = max(1, batch_size or settings.SESSION_SWEEP_BATCH_SIZE)
+
+    started = time.perf_counter()
+    removed = 0
+    with SessionLocal() as db:
+        service = UserService(db, settings.SECRET_KEY)
+        while True:
+            deleted = service.delete_expired_sessions(batch_size)
+            removed += deleted
+            if deleted < batch_size:
+                break
+
+    elapsed = time.perf_counter() - started
+    metrics.increment("auth.session_sweeper.runs")
+    metrics.increment("auth.session_sweeper.rows_removed", removed)
+    metrics.observe("auth.session_sweeper.rows_removed_per_run", removed)
+    metrics.observe("auth.session_sweeper.run_seconds", elapsed)
+    logging.info(
+        f"Session sweeper: removed {removed} expired sessions in {elapsed:.2f}s"
+    )
+    return removed
+
+
+async def run_session_sweeper(interval_seconds: float) -> None:
+    """Sweep expired sessions every `interval_seconds` until cancelled."""
+    while True:
+        try:
+            await run_in_threadpool(sweep_expired_sessions)
+        except Exception:
+            metrics.increment("auth.session_sweeper.failures")
+            logging.exception("Session sweeper run failed")
+        await asyncio.sleep(interval_seconds)